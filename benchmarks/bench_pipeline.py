@@ -0,0 +1,458 @@
+import argparse
+import contextlib
+import glob
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts")
+)
+
+import pandas as pd  # noqa: E402
+from cleaning import clean_score, clean_team_name  # noqa: E402
+from team_names import default_normalizer, load_normalizer  # noqa: E402
+from manifest import group_by_year  # noqa: E402
+from match_table import MatchTable  # noqa: E402
+from fetcher import Fetcher  # noqa: E402
+from mock_server import start_server  # noqa: E402
+from parse_cache import ParseCache  # noqa: E402
+from city_index import (  # noqa: E402
+    build_reverse_team_map,
+    compile_city_index,
+    load_city_index,
+    load_city_mappings,
+)
+from process_altitude import enrich_matches, process_data  # noqa: E402
+from raw_matches import MatchWriter  # noqa: E402
+from scraper import (  # noqa: E402
+    WIKI_URL,
+    DEFAULT_PARSE_WORKERS,
+    create_parse_pool,
+    create_session,
+    fetch_html_tree,
+    fetch_pages,
+    normalize_records,
+    parse_records,
+    parse_season,
+    save_page,
+)
+from synthetic import (  # noqa: E402
+    CITY_MAP_PATH,
+    load_teams,
+    synthetic_matches,
+    write_season_pages,
+)
+from tournaments import REGISTRY, schedule  # noqa: E402
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(BENCH_DIR, "fixtures", "pages")
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+DEFAULT_SIZES = "10000,100000"
+DEFAULT_TOLERANCE = 0.20
+PARSERS = {
+    "lxml": ("lxml", "single-pass"),
+    "pyquery": ("pyquery", "single-pass"),
+    "pyquery-heuristic": ("pyquery", "heuristic"),
+}
+
+
+@contextlib.contextmanager
+def quiet():
+    """Silences the progress output of the functions under test."""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def measure(func, repeat: int, trace_memory: bool) -> tuple:
+    """
+    Result, best wall-clock time (s) over `repeat` runs and peak traced
+    memory (bytes, from one extra traced run; None when disabled).
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+
+    peak = None
+    if trace_memory:
+        tracemalloc.start()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return result, best, peak
+
+
+def page_year(path: str) -> int:
+    year_match = re.search(r"(\d{4})$", os.path.splitext(os.path.basename(path))[0])
+    return int(year_match.group(1)) if year_match else 0
+
+
+def record_fixtures(pages_dir: str, workers: int) -> bool:
+    """Downloads every season page of the registered tournaments into `pages_dir`."""
+    urls = [job.url for job in schedule(list(REGISTRY.values()), WIKI_URL)]
+    pages = fetch_pages(urls, max_workers=workers)
+    for url, content in pages.items():
+        if content is not None:
+            save_page(content, url, pages_dir)
+    recorded = sum(content is not None for content in pages.values())
+    print(f"Recorded {recorded}/{len(urls)} pages into {pages_dir}")
+    return recorded == len(urls)
+
+
+def run_benchmarks(
+    pages_dir: str,
+    sizes: list[int],
+    repeat: int,
+    trace_memory: bool,
+    latency: float,
+    workers: int,
+    parse_workers: int = 1,
+) -> dict:
+    """Times every pipeline stage; returns {stage: metrics}."""
+    stages = {}
+
+    def record(name: str, func, items: int, unit: str, silent: bool = False):
+        with quiet() if silent else contextlib.nullcontext():
+            result, seconds, peak = measure(func, repeat, trace_memory)
+        stages[name] = {
+            "seconds": seconds,
+            "items": items,
+            "unit": unit,
+            "throughput": items / seconds if seconds else None,
+            "peak_bytes": peak,
+        }
+        print(
+            f"  {name:<28} {seconds * 1000:>10.1f}ms {items / seconds:>14,.0f} {unit}/s"
+            + (f" {peak / 1024 / 1024:>9.1f}MB" if peak is not None else ""),
+            flush=True,
+        )
+        return result
+
+    paths = sorted(glob.glob(os.path.join(pages_dir, "*.html")))
+    pages = {}
+    for path in paths:
+        with open(path, "rb") as f:
+            pages[os.path.splitext(os.path.basename(path))[0]] = f.read()
+    page_bytes = sum(len(content) for content in pages.values())
+    print(
+        f"{len(pages)} pages ({page_bytes / 1024 / 1024:.1f}MB) from {pages_dir}\n"
+        f"  {'stage':<28} {'best':>12} {'throughput':>20} {'peak':>11}"
+    )
+
+    server = start_server(pages_dir, "127.0.0.1", 0, latency)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    urls = [f"http://{host}:{port}/wiki/{title}" for title in pages]
+    session = create_session(workers)
+    try:
+        record(
+            "fetch_html_tree",
+            lambda: [fetch_html_tree(url, session) for url in urls],
+            len(urls),
+            "pages",
+            silent=True,
+        )
+        record(
+            "fetch_pages",
+            # No rate limit against the local server: this times the transport.
+            lambda: fetch_pages(
+                urls,
+                session,
+                max_workers=workers,
+                per_host=workers,
+                fetcher=Fetcher(session, rate=0),
+            ),
+            len(urls),
+            "pages",
+            silent=True,
+        )
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    parsed = []
+    for name, (backend, group_parser) in PARSERS.items():
+        seasons = [
+            parse_season(content, page_year(title), backend, group_parser)
+            for title, content in pages.items()
+        ]
+        matches = [m for season in seasons if season for part in season for m in part]
+        record(
+            f"parse[{name}]",
+            lambda b=backend, g=group_parser: [
+                parse_season(content, page_year(title), b, g)
+                for title, content in pages.items()
+            ],
+            len(pages),
+            "pages",
+        )
+        parsed = parsed or matches
+
+    parse_pool = create_parse_pool(parse_workers)
+    if parse_pool is not None:
+        titles = list(pages)
+        contents = [pages[title] for title in titles]
+        years = [page_year(title) for title in titles]
+        with parse_pool:
+            # Spawning the workers is a one-off cost, keep it out of the timing.
+            list(
+                parse_pool.map(
+                    parse_records, contents[:1], years[:1], ["lxml"], ["single-pass"]
+                )
+            )
+            record(
+                f"parse[lxml x{parse_workers} processes]",
+                lambda: list(
+                    parse_pool.map(
+                        parse_records,
+                        contents,
+                        years,
+                        ["lxml"] * len(titles),
+                        ["single-pass"] * len(titles),
+                    )
+                ),
+                len(pages),
+                "pages",
+            )
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        parse_cache = ParseCache(cache_dir)
+        normalizer = default_normalizer()
+        for title, content in pages.items():
+            records = parse_records(content, page_year(title), "lxml", "single-pass")
+            if records is not None:
+                parse_cache.put(title, records)
+
+        def read_cached():
+            # A cache hit: read the records back and normalize their team names.
+            seasons = []
+            for title in pages:
+                records = parse_cache.get(title)
+                if records is not None:
+                    seasons.append([normalize_records(p, normalizer) for p in records])
+            return seasons
+
+        record("parse_cache[hit]", read_cached, len(pages), "pages")
+
+    scores = [m["score"] for m in parsed if m.get("score")] or ["2:1"]
+    teams = [m[k] for m in parsed for k in ("home_team", "away_team") if m.get(k)]
+    teams = teams or load_teams()
+    target = max(sizes[0] if sizes else 10000, 1)
+    scores *= -(-target // len(scores))
+    teams *= -(-target // len(teams))
+    record(
+        "clean_score", lambda: [clean_score(s) for s in scores], len(scores), "scores"
+    )
+    record(
+        "clean_team_name",
+        lambda: [clean_team_name(t) for t in teams],
+        len(teams),
+        "names",
+    )
+
+    city_mappings = load_city_mappings(CITY_MAP_PATH)
+    # Unseen spellings of mapped teams, resolved by the folded and fuzzy rules
+    # with a cold cache.
+    variants = [t.upper() for t in load_teams()] + [t[:-1] for t in load_teams()]
+
+    def resolve_variants():
+        normalizer = load_normalizer(city_mappings)
+        return [normalizer.resolve(t) for t in variants]
+
+    record(
+        "team_names[variants]",
+        resolve_variants,
+        len(variants),
+        "names",
+    )
+
+    team_count = sum(len(data["teams"]) for data in city_mappings.values())
+    record(
+        "build_reverse_team_map",
+        lambda: [build_reverse_team_map(city_mappings) for _ in range(100)],
+        team_count * 100,
+        "teams",
+    )
+
+    load_city_index(CITY_MAP_PATH)
+    record(
+        "city_index[compile]",
+        lambda: [compile_city_index(city_mappings, "") for _ in range(100)],
+        team_count * 100,
+        "teams",
+    )
+    record(
+        "city_index[load]",
+        lambda: [load_city_index(CITY_MAP_PATH) for _ in range(100)],
+        team_count * 100,
+        "teams",
+    )
+
+    team_lookup = build_reverse_team_map(city_mappings)
+    mapped_teams = load_teams()
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            raw_path = os.path.join(tmp, f"raw_{n}.jsonl")
+            csv_path = os.path.join(tmp, "processed", f"analysis_{n}.csv")
+            matches = synthetic_matches(n, mapped_teams)
+            with MatchWriter(raw_path) as writer:
+                for _, season in group_by_year(matches).items():
+                    writer.write_season(season)
+            record(
+                f"process_data[{n}]",
+                lambda: process_data(raw_path, CITY_MAP_PATH, csv_path),
+                n,
+                "matches",
+                silent=True,
+            )
+            record(
+                f"match_table[{n}]",
+                lambda: MatchTable().extend(matches),
+                n,
+                "matches",
+            )
+            rows = enrich_matches(matches, team_lookup, set())
+            record(
+                f"csv_write[{n}]",
+                lambda: pd.DataFrame(rows).to_csv(
+                    csv_path, index=False, encoding="utf-8-sig"
+                ),
+                len(rows),
+                "rows",
+            )
+            del matches, rows
+
+    return stages
+
+
+def compare_to_baseline(stages: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Stages slower (or using more memory) than the baseline beyond `tolerance`."""
+    regressions = []
+    print(f"\n  {'stage':<28} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, current in stages.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        change = current["seconds"] / base["seconds"] - 1
+        flag = ""
+        if change > tolerance:
+            flag = "  REGRESSION"
+            regressions.append(f"{name}: {change:+.0%} time")
+        if current["peak_bytes"] and base.get("peak_bytes"):
+            mem_change = current["peak_bytes"] / base["peak_bytes"] - 1
+            if mem_change > tolerance:
+                flag = "  REGRESSION"
+                regressions.append(f"{name}: {mem_change:+.0%} peak memory")
+        print(
+            f"  {name:<28} {base['seconds'] * 1000:>10.1f}ms "
+            f"{current['seconds'] * 1000:>10.1f}ms {change:>+7.0%}{flag}"
+        )
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Per-stage timing, throughput and memory of the whole pipeline."
+    )
+    parser.add_argument(
+        "--pages",
+        default=FIXTURES_DIR,
+        help="Recorded season pages (default: benchmarks/fixtures/pages). "
+        "Synthetic pages are generated when the directory is empty.",
+    )
+    parser.add_argument(
+        "--record",
+        action="store_true",
+        help="Download every season page from Wikipedia into --pages and exit.",
+    )
+    parser.add_argument(
+        "--sizes",
+        default=DEFAULT_SIZES,
+        help=f"Synthetic dataset sizes in matches, comma-separated (default: {DEFAULT_SIZES}).",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--no-memory", action="store_true", help="Skip the tracemalloc runs."
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="Artificial delay of the local server, in seconds.",
+    )
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument(
+        "--parse-workers",
+        type=int,
+        default=DEFAULT_PARSE_WORKERS,
+        help="Processes of the parallel parse stage; 1 skips it (default: CPUs).",
+    )
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Store this run as the new baseline instead of comparing.",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="Allowed slowdown before a stage counts as a regression (default: 0.20).",
+    )
+    parser.add_argument("--output", help="Also write the results as JSON here.")
+    args = parser.parse_args()
+
+    if args.record:
+        sys.exit(0 if record_fixtures(args.pages, args.workers) else 1)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    with tempfile.TemporaryDirectory() as synthetic_dir:
+        pages_dir = args.pages
+        if not glob.glob(os.path.join(pages_dir, "*.html")):
+            print(
+                f"[Warning] No recorded pages in {pages_dir}, using synthetic ones.",
+                file=sys.stderr,
+            )
+            write_season_pages(synthetic_dir, load_teams())
+            pages_dir = synthetic_dir
+        stages = run_benchmarks(
+            pages_dir,
+            sizes,
+            args.repeat,
+            not args.no_memory,
+            args.latency,
+            args.workers,
+            args.parse_workers,
+        )
+
+    results = {"python": sys.version.split()[0], "stages": stages}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nBaseline saved to {args.baseline}")
+        sys.exit(0)
+
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline} (create one with --save-baseline).")
+        sys.exit(0)
+
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)["stages"]
+    regressions = compare_to_baseline(stages, baseline, args.tolerance)
+    if regressions:
+        print("\n[Error] Regressions against the baseline:", file=sys.stderr)
+        for regression in regressions:
+            print(f"  - {regression}", file=sys.stderr)
+        sys.exit(1)
+    print("\nNo regressions against the baseline.")
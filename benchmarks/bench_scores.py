@@ -0,0 +1,115 @@
+import argparse
+import csv
+import glob
+import os
+import re
+import sys
+import time
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts")
+)
+
+from cleaning import clean_score, parse_score  # noqa: E402
+
+PROCESSED_GLOB = os.path.join("data", "processed", "*_analysis.csv")
+
+
+def regex_clean_score(score_text: str) -> tuple[str | None, str | None]:
+    """The multi-regex clean_score that parse_score replaced, for comparison."""
+    if score_text is None:
+        return None, None
+    score_clean = re.sub(r"\(.*\)", "", score_text).strip()
+    score_parts = score_clean.split(":", 1)
+
+    cleaned_text = re.sub(
+        r"\s*\.mw-parser-output.*?(\n|$)", "", score_text, flags=re.DOTALL
+    )
+    cleaned_text = re.sub(r"\(.*?\)", "", cleaned_text)
+    cleaned_text = cleaned_text.strip()
+
+    match = re.search(r"(\d+)\s*[:–-]\s*(\d+)", cleaned_text)
+    if match:
+        return match.group(1), match.group(2)
+    return None, None
+
+
+def load_scores(paths: list[str]) -> list[str]:
+    """Every score_raw value of the analysis CSVs, in file order."""
+    scores = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            scores.extend(row["score_raw"] for row in csv.DictReader(f))
+    return scores
+
+
+def best_time(func, scores: list[str], repeat: int, before=None) -> float:
+    """Best wall-clock time of `repeat` passes over `scores`, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        if before:
+            before()
+        start = time.perf_counter()
+        for score in scores:
+            func(score)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def as_ints(goals: tuple) -> tuple:
+    return tuple(None if g is None else int(g) for g in goals)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Times score extraction over the score_raw values of the analysis CSVs."
+    )
+    parser.add_argument(
+        "csvs", nargs="*", help=f"CSV files (default: {PROCESSED_GLOB})"
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--scale",
+        type=int,
+        default=10,
+        help="Passes over the values per run, so timings are not too short.",
+    )
+    args = parser.parse_args()
+
+    scores = load_scores(args.csvs or sorted(glob.glob(PROCESSED_GLOB)))
+    if not scores:
+        print("[Error] No score_raw values found.", file=sys.stderr)
+        sys.exit(1)
+
+    mismatches = [
+        s for s in set(scores) if as_ints(regex_clean_score(s)) != clean_score(s)
+    ]
+    for score in mismatches[:10]:
+        print(f"[Error] Different goals for {score!r}", file=sys.stderr)
+
+    workload = scores * args.scale
+    old = best_time(regex_clean_score, workload, args.repeat)
+    cold = best_time(parse_score, workload, args.repeat, parse_score.cache_clear)
+    uncached = best_time(parse_score.__wrapped__, workload, args.repeat)
+    distinct = len(set(scores))
+    with_extras = sum(
+        1
+        for s in set(scores)
+        if parse_score(s).extra_time or parse_score(s).home_penalties is not None
+    )
+
+    print(
+        f"{len(scores)} scores ({distinct} distinct, {with_extras} with extra time "
+        f"or penalties), x{args.scale} per run, best of {args.repeat}:"
+    )
+    print(f"  {'regex clean_score':<28} {old * 1000:9.1f}ms")
+    for name, seconds in (
+        ("parse_score (no cache)", uncached),
+        ("parse_score (cached)", cold),
+    ):
+        print(f"  {name:<28} {seconds * 1000:9.1f}ms  {old / seconds:6.1f}x")
+
+    if mismatches:
+        print(f"\n[Error] {len(mismatches)} scores differ from the regex version.")
+        sys.exit(1)
+    print("\nSame goals as the regex version for every score.")
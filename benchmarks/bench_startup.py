@@ -0,0 +1,122 @@
+"""
+Startup latency of each command: the time from launching the interpreter
+to the first line the command prints, and to its exit, together with the
+heavy modules (pandas, numpy, pyarrow, requests, pyquery, lxml) it imported.
+Commands run on a copy of data/mappings and data/raw in a temporary
+directory, so the repository's outputs are left untouched.
+
+    python3 benchmarks/bench_startup.py
+    python3 benchmarks/bench_startup.py --tournament sudamericana --repeat 10
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS_DIR = os.path.join(BENCH_DIR, "..", "scripts")
+DATA_DIR = os.path.join(BENCH_DIR, "..", "data")
+HEAVY_MODULES = ("pandas", "numpy", "pyarrow", "requests", "pyquery", "lxml")
+
+
+def commands(tournament: str) -> list[tuple[str, list[str]]]:
+    """(label, script arguments) of the measured commands, in run order."""
+    return [
+        ("pipeline --help", ["pipeline.py", "--help"]),
+        ("scraper --help", ["scraper.py", "--help"]),
+        ("warehouse --help", ["warehouse.py", "--help"]),
+        ("process_altitude --help", ["process_altitude.py", "--help"]),
+        (f"process_altitude {tournament}", ["process_altitude.py", tournament]),
+        (
+            f"process_altitude {tournament} --incremental",
+            ["process_altitude.py", tournament, "--incremental"],
+        ),
+        (f"generate_teams {tournament}", ["generate_teams.py", tournament]),
+        (
+            f"aggregates {tournament} --force",
+            ["aggregates.py", tournament, "--force"],
+        ),
+        (f"aggregates {tournament} (up to date)", ["aggregates.py", tournament]),
+    ]
+
+
+def time_command(argv: list[str], cwd: str) -> tuple[float, float]:
+    """Seconds from launch to the first output line and to the exit."""
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-u", *argv],
+        cwd=cwd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    )
+    process.stdout.readline()
+    first_output = time.perf_counter() - start
+    process.stdout.read()
+    if process.wait():
+        raise RuntimeError(f"{' '.join(argv)} exited with {process.returncode}")
+    return first_output, time.perf_counter() - start
+
+
+def heavy_imports(argv: list[str], cwd: str) -> list[str]:
+    """Top-level HEAVY_MODULES imported by a command (from -X importtime)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *argv],
+        cwd=cwd,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    imported = set()
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:"):
+            name = line.rsplit("|", 1)[-1].strip().split(".")[0]
+            if name in HEAVY_MODULES:
+                imported.add(name)
+    return [name for name in HEAVY_MODULES if name in imported]
+
+
+def run(tournament: str, repeat: int, data_dir: str) -> list[dict]:
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for name in ("mappings", "raw"):
+            shutil.copytree(
+                os.path.join(data_dir, name), os.path.join(workdir, "data", name)
+            )
+        for label, args in commands(tournament):
+            argv = [os.path.join(SCRIPTS_DIR, args[0]), *args[1:]]
+            times = [time_command(argv, workdir) for _ in range(repeat)]
+            first_output, total = min(times)
+            result = {
+                "command": label,
+                "first_output_ms": first_output * 1000,
+                "total_ms": total * 1000,
+                "imports": heavy_imports(argv, workdir),
+            }
+            results.append(result)
+            print(
+                f"  {label:<42} {result['first_output_ms']:>8.0f}ms "
+                f"{result['total_ms']:>8.0f}ms  {', '.join(result['imports']) or '-'}",
+                flush=True,
+            )
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Interpreter-to-first-output latency of each command."
+    )
+    parser.add_argument("--tournament", default="libertadores")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--data",
+        default=DATA_DIR,
+        help="Directory with the mappings/ and raw/ folders to use (default: data/).",
+    )
+    args = parser.parse_args()
+
+    print(f"  {'command':<42} {'first out':>10} {'total':>10}  heavy imports")
+    run(args.tournament, args.repeat, args.data)
@@ -0,0 +1,95 @@
+import argparse
+import glob
+import os
+import re
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts")
+)
+
+from scraper import parse_season  # noqa: E402
+
+FIXTURES_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "fixtures", "group_pages"
+)
+
+
+def measure(content: bytes, year: int, backend: str, repeat: int) -> tuple:
+    """Matches, best time (s) and peak traced memory (bytes) of parsing one page."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = parse_season(content, year, backend)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    parse_season(content, year, backend)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, best, peak
+
+
+def compare_backends(pages_dir: str, repeat: int) -> bool:
+    """
+    Parses every saved page with the pyquery and lxml backends, checks that
+    both return identical matches and prints parse time and allocations.
+    """
+    paths = sorted(glob.glob(os.path.join(pages_dir, "*.html")))
+    if not paths:
+        print(f"[Error] No saved pages found in {pages_dir}", file=sys.stderr)
+        return False
+
+    all_equal = True
+    totals = {"pyquery": 0.0, "lxml": 0.0}
+    print(
+        f"{'page':<32} {'pyquery':>9} {'lxml':>9} {'speedup':>8} "
+        f"{'pq peak':>9} {'lxml peak':>10}"
+    )
+
+    for path in paths:
+        name = os.path.splitext(os.path.basename(path))[0]
+        year_match = re.search(r"(\d{4})$", name)
+        year = int(year_match.group(1)) if year_match else 0
+        with open(path, "rb") as f:
+            content = f.read()
+
+        expected, pq_time, pq_peak = measure(content, year, "pyquery", repeat)
+        actual, lx_time, lx_peak = measure(content, year, "lxml", repeat)
+        equal = expected == actual
+        all_equal &= equal
+        totals["pyquery"] += pq_time
+        totals["lxml"] += lx_time
+
+        flag = "" if equal else "  MISMATCH"
+        print(
+            f"{name:<32} {pq_time * 1000:>7.1f}ms {lx_time * 1000:>7.1f}ms "
+            f"{pq_time / lx_time:>7.1f}x {pq_peak / 1024:>7.0f}KB {lx_peak / 1024:>8.0f}KB"
+            f"{flag}"
+        )
+
+    print(
+        f"{'total':<32} {totals['pyquery'] * 1000:>7.1f}ms {totals['lxml'] * 1000:>7.1f}ms "
+        f"{totals['pyquery'] / totals['lxml']:>7.1f}x"
+    )
+    print("All pages equivalent." if all_equal else "[Error] Backends disagree.")
+    return all_equal
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Equivalence, speed and memory check of the parsing backends."
+    )
+    parser.add_argument(
+        "pages_dir",
+        nargs="?",
+        default=FIXTURES_DIR,
+        help="Directory of saved season pages (scraper.py --save-pages); "
+        "default: the fixture pages.",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    sys.exit(0 if compare_backends(args.pages_dir, args.repeat) else 1)
@@ -0,0 +1,107 @@
+"""
+Equivalence check of the two group stage parsers (heuristic and
+single-pass) over saved season pages, with their timings. By default it
+runs on the fixture pages in benchmarks/fixtures/group_pages/ (synthetic
+seasons in both heading markups, plus pages exercising the row layouts,
+table placements and the fallback parser), and exits with status 1 if
+the parsers disagree on any page or a page yields no matches.
+
+    python3 benchmarks/compare_group_parsers.py
+    python3 benchmarks/compare_group_parsers.py data/pages
+"""
+
+import argparse
+import glob
+import os
+import re
+import sys
+import time
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts")
+)
+
+from scraper import (  # noqa: E402
+    parse_group_stage_matches,
+    parse_group_stage_matches_single_pass,
+    parse_html,
+)
+
+FIXTURES_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "fixtures", "group_pages"
+)
+
+
+def best_time(func, doc, year: int, repeat: int) -> float:
+    """Best wall-clock time of `repeat` runs, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(doc, year)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def compare_pages(pages_dir: str, repeat: int) -> bool:
+    """
+    Checks that both group stage parsers return identical matches for every
+    saved page in `pages_dir` and prints their timings side by side.
+    """
+    paths = sorted(glob.glob(os.path.join(pages_dir, "*.html")))
+    if not paths:
+        print(f"[Error] No saved pages found in {pages_dir}", file=sys.stderr)
+        return False
+
+    all_equal = True
+    total_old = total_new = 0.0
+    print(
+        f"{'page':<40} {'matches':>8} {'heuristic':>11} {'single-pass':>12} {'speedup':>8}"
+    )
+
+    for path in paths:
+        name = os.path.splitext(os.path.basename(path))[0]
+        year_match = re.search(r"(\d{4})$", name)
+        year = int(year_match.group(1)) if year_match else 0
+        with open(path, "rb") as f:
+            doc = parse_html(f.read())
+        if doc is None:
+            continue
+
+        expected = parse_group_stage_matches(doc, year)
+        actual = parse_group_stage_matches_single_pass(doc, year)
+        equal = bool(expected) and expected == actual
+        all_equal &= equal
+
+        old = best_time(parse_group_stage_matches, doc, year, repeat)
+        new = best_time(parse_group_stage_matches_single_pass, doc, year, repeat)
+        total_old += old
+        total_new += new
+        flag = "" if equal else "  MISMATCH" if expected else "  NO MATCHES"
+        print(
+            f"{name:<40} {len(expected):>8} {old * 1000:>9.1f}ms {new * 1000:>10.1f}ms "
+            f"{old / new:>7.1f}x{flag}"
+        )
+
+    print(
+        f"{'total':<40} {'':>8} {total_old * 1000:>9.1f}ms {total_new * 1000:>10.1f}ms "
+        f"{total_old / total_new:>7.1f}x"
+    )
+    print("All pages equivalent." if all_equal else "[Error] Parsers disagree.")
+    return all_equal
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Equivalence and timing check of the two group stage parsers."
+    )
+    parser.add_argument(
+        "pages_dir",
+        nargs="?",
+        default=FIXTURES_DIR,
+        help="Directory of saved season pages (scraper.py --save-pages); "
+        "default: the fixture pages.",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    sys.exit(0 if compare_pages(args.pages_dir, args.repeat) else 1)
@@ -0,0 +1,153 @@
+"""
+Equivalence and scaling check of the knockout parsers of lxml_backend:
+sibling-scan (each table looks for its phase heading among its preceding
+siblings) and single-pass (one document-order walk over headings and tables).
+
+On saved season pages both must find the same legs (date, teams, score,
+stadium, penalties); single-pass also resolves their phase and pairs the legs
+of each tie. On synthetic pages with thousands of fixtures the timings show
+how each parser scales with the page.
+
+    python3 benchmarks/compare_knockout_parsers.py data/pages
+    python3 benchmarks/compare_knockout_parsers.py --ties 500,2000,4000
+"""
+
+import argparse
+import glob
+import os
+import re
+import sys
+import time
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts")
+)
+
+import lxml_backend  # noqa: E402
+from synthetic import load_teams, season_page  # noqa: E402
+
+# Fields only single-pass fills in (or resolves differently).
+TIE_FIELDS = ("phase", "leg", "aggregate_home_goals", "aggregate_away_goals")
+KNOCKOUT_ROUNDS = ("Octavos de final", "Cuartos de final")
+
+
+def legs(matches: list[dict]) -> list[dict]:
+    """Matches without the fields that depend on the knockout parser."""
+    return [{k: v for k, v in m.items() if k not in TIE_FIELDS} for m in matches]
+
+
+def best_time(func, root, year: int, repeat: int) -> tuple[list[dict], float]:
+    """Result and best wall-clock time of `repeat` runs, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(root, year)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def compare_pages(pages_dir: str, repeat: int) -> bool:
+    """
+    Checks that both parsers find the same legs on every saved page in
+    `pages_dir` and prints the phases and ties found by single-pass.
+    """
+    paths = sorted(glob.glob(os.path.join(pages_dir, "*.html")))
+    if not paths:
+        print(f"[Warning] No saved pages found in {pages_dir}", file=sys.stderr)
+        return True
+
+    all_equal = True
+    print(
+        f"{'page':<32} {'legs':>5} {'ties':>5} {'phases':>7} "
+        f"{'sibling-scan':>13} {'single-pass':>12}"
+    )
+    for path in paths:
+        name = os.path.splitext(os.path.basename(path))[0]
+        year_match = re.search(r"(\d{4})$", name)
+        year = int(year_match.group(1)) if year_match else 0
+        with open(path, "rb") as f:
+            root = lxml_backend.parse_document(f.read())
+
+        expected, old = best_time(
+            lxml_backend.parse_knockout_matches, root, year, repeat
+        )
+        actual, new = best_time(
+            lxml_backend.parse_knockout_matches_single_pass, root, year, repeat
+        )
+        equal = legs(expected) == legs(actual)
+        all_equal &= equal
+        ties = sum(m["leg"] == 2 for m in actual)
+        phases = len({m["phase"] for m in actual})
+        flag = "" if equal else "  MISMATCH"
+        print(
+            f"{name:<32} {len(actual):>5} {ties:>5} {phases:>7} "
+            f"{old * 1000:>11.1f}ms {new * 1000:>10.1f}ms{flag}"
+        )
+
+    print("Same legs on every page." if all_equal else "[Error] Parsers disagree.")
+    return all_equal
+
+
+def compare_synthetic(sizes: list[int], repeat: int) -> bool:
+    """
+    Times both parsers on synthetic pages with `size` two-legged ties per
+    round, in both heading markups, and checks every tie is paired.
+    """
+    teams = load_teams()
+    all_right = True
+    print(
+        f"\n{'synthetic page':<32} {'legs':>5} {'ties':>5} "
+        f"{'sibling-scan':>13} {'single-pass':>12} {'speedup':>8}"
+    )
+    for size in sizes:
+        for modern in (False, True):
+            html = season_page(
+                2024, teams, groups=0, ties_per_round=size, modern=modern
+            )
+            root = lxml_backend.parse_document(html.encode("utf-8"))
+            expected, old = best_time(
+                lxml_backend.parse_knockout_matches, root, 2024, repeat
+            )
+            actual, new = best_time(
+                lxml_backend.parse_knockout_matches_single_pass, root, 2024, repeat
+            )
+            ties = sum(m["leg"] == 2 for m in actual)
+            right = (
+                legs(expected) == legs(actual)
+                and ties == size * len(KNOCKOUT_ROUNDS)
+                and {m["phase"] for m in actual} == set(KNOCKOUT_ROUNDS)
+            )
+            all_right &= right
+            label = f"{size} ties/round, {'current' if modern else 'pre-2024'} markup"
+            print(
+                f"{label:<32} {len(actual):>5} {ties:>5} {old * 1000:>11.1f}ms "
+                f"{new * 1000:>10.1f}ms {old / new:>7.1f}x"
+                + ("" if right else "  MISMATCH")
+            )
+    print("Every tie paired." if all_right else "[Error] Wrong legs, ties or phases.")
+    return all_right
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Equivalence and scaling check of the two knockout parsers."
+    )
+    parser.add_argument(
+        "pages_dir",
+        nargs="?",
+        default=os.path.join("data", "pages"),
+        help="Directory of saved season pages (scraper.py --save-pages).",
+    )
+    parser.add_argument(
+        "--ties",
+        default="250,1000,2000",
+        help="Comma-separated ties per round of the synthetic pages "
+        "(two rounds of two legs each).",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    sizes = [int(n) for n in args.ties.split(",") if n]
+    pages_ok = compare_pages(args.pages_dir, args.repeat)
+    synthetic_ok = compare_synthetic(sizes, args.repeat)
+    sys.exit(0 if pages_ok and synthetic_ok else 1)
@@ -0,0 +1,142 @@
+import argparse
+import contextlib
+import glob
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts")
+)
+
+from fetcher import Fetcher, RetryQueue  # noqa: E402
+from mock_server import FaultInjector, start_server  # noqa: E402
+from scraper import create_session, fetch_pages  # noqa: E402
+from synthetic import load_teams, write_season_pages  # noqa: E402
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(BENCH_DIR, "fixtures", "pages")
+
+
+def load_pages(pages_dir: str) -> dict[str, bytes]:
+    pages = {}
+    for path in sorted(glob.glob(os.path.join(pages_dir, "*.html"))):
+        with open(path, "rb") as f:
+            pages[os.path.splitext(os.path.basename(path))[0]] = f.read()
+    return pages
+
+
+def run(
+    name: str,
+    pages_dir: str,
+    pages: dict[str, bytes],
+    faults: FaultInjector,
+    fetcher_options: dict,
+    latency: float,
+    workers: int,
+    queue_path: str,
+) -> bool:
+    """Fetches every page through a faulty server; True if all arrived intact."""
+    server = start_server(pages_dir, "127.0.0.1", 0, latency, faults)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    urls = [f"http://{host}:{port}/wiki/{title}" for title in pages]
+    session = create_session(workers)
+    fetcher = Fetcher(session, queue=RetryQueue(queue_path), **fetcher_options)
+    start = time.perf_counter()
+    try:
+        # The server logs every request and the fetcher every failure.
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(
+            devnull
+        ), contextlib.redirect_stderr(devnull):
+            results = fetch_pages(
+                urls, session, max_workers=workers, per_host=workers, fetcher=fetcher
+            )
+    finally:
+        server.shutdown()
+        server.server_close()
+    seconds = time.perf_counter() - start
+
+    intact = sum(results[url] == pages[title] for url, title in zip(urls, pages))
+    print(
+        f"  {name:<12} {intact:>4}/{len(urls)} pages intact in {seconds:6.2f}s; "
+        f"server injected {faults.counts['error']} errors, {faults.counts['drop']} "
+        f"drops, {faults.counts['truncate']} truncations"
+    )
+    print(f"  {'':<12} {fetcher.summary()} {len(fetcher.queue)} left queued.")
+    return intact == len(urls)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Fetches the season pages from a local server that injects "
+        "429s and dropped connections, with and without retries."
+    )
+    parser.add_argument(
+        "--pages",
+        default=FIXTURES_DIR,
+        help="Recorded season pages (default: benchmarks/fixtures/pages). "
+        "Synthetic pages are generated when the directory is empty.",
+    )
+    parser.add_argument("--error-rate", type=float, default=0.2)
+    parser.add_argument("--drop-rate", type=float, default=0.1)
+    parser.add_argument(
+        "--error-status",
+        type=int,
+        default=429,
+        help="Status of the injected errors (default: 429).",
+    )
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--rate", type=float, default=20.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        pages_dir = args.pages
+        if not glob.glob(os.path.join(pages_dir, "*.html")):
+            pages_dir = os.path.join(tmp_dir, "pages")
+            write_season_pages(pages_dir, load_teams())
+        pages = load_pages(pages_dir)
+        print(
+            f"{len(pages)} pages from {pages_dir}, {args.error_rate:.0%} answered "
+            f"{args.error_status}, {args.drop_rate:.0%} dropped:"
+        )
+
+        def faults() -> FaultInjector:
+            return FaultInjector(
+                args.error_rate,
+                args.drop_rate,
+                args.error_status,
+                args.retry_after,
+                args.seed,
+            )
+
+        run(
+            "no retries",
+            pages_dir,
+            pages,
+            faults(),
+            {"rate": 0, "max_retries": 0},
+            args.latency,
+            args.workers,
+            os.path.join(tmp_dir, "single.json"),
+        )
+        complete = run(
+            "fetcher",
+            pages_dir,
+            pages,
+            faults(),
+            {"rate": args.rate},
+            args.latency,
+            args.workers,
+            os.path.join(tmp_dir, "retrying.json"),
+        )
+
+    if not complete:
+        print("\n[Error] Some pages were lost despite the retries.", file=sys.stderr)
+        sys.exit(1)
+    print("\nEvery page arrived intact.")
@@ -0,0 +1,172 @@
+"""
+Deterministic synthetic inputs for the benchmarks: Wikipedia-like season
+pages (same markup the parsers look for) and scaled-up raw match datasets.
+"""
+
+import json
+import os
+import random
+from tournaments import REGISTRY
+
+CITY_MAP_PATH = os.path.join("data", "mappings", "city_mappings.json")
+
+
+def load_teams(city_map_path: str = CITY_MAP_PATH) -> list[str]:
+    """All team names of the mapping file, in file order."""
+    with open(city_map_path, "r", encoding="utf-8") as f:
+        city_mappings = json.load(f)
+    return [team for data in city_mappings.values() for team in data["teams"]]
+
+
+def heading(level: int, text: str, modern: bool) -> str:
+    """A section heading in current (mw-heading) or pre-2024 (mw-headline) markup."""
+    anchor = text.replace(" ", "_")
+    if modern:
+        return (
+            f'<div class="mw-heading mw-heading{level}"><h{level} id="{anchor}">'
+            f'{text}</h{level}><span class="mw-editsection">[editar]</span></div>'
+        )
+    return (
+        f'<h{level}><span class="mw-headline" id="{anchor}">{text}</span>'
+        f'<span class="mw-editsection">[editar]</span></h{level}>'
+    )
+
+
+def team_cell(team: str) -> str:
+    return (
+        '<td><span class="flagicon"><img src="flag.png" width="23"></span>&nbsp;'
+        f'<a href="/wiki/{team.replace(" ", "_")}">{team}</a></td>'
+    )
+
+
+def season_page(
+    year: int,
+    teams: list[str],
+    groups: int = 8,
+    ties_per_round: int = 8,
+    knockout_rounds: tuple[str, ...] = ("Octavos de final", "Cuartos de final"),
+    modern: bool = True,
+    seed: int = 0,
+) -> str:
+    """
+    Builds a season page with a calendar table, `groups` round-robin groups of
+    four teams and `ties_per_round` two-legged ties per knockout round.
+    """
+    rng = random.Random(f"{seed}-{year}")
+    out = [
+        '<!DOCTYPE html>\n<html lang="es"><head><meta charset="UTF-8">'
+        f"<title>Copa {year}</title></head><body>"
+        '<div class="mw-content-ltr mw-parser-output" lang="es">'
+    ]
+    out.append(heading(2, "Calendario", modern))
+    out.append(
+        '<table class="wikitable"><tr><th>Fase</th><th>Ronda</th><th>Ida</th>'
+        "<th>Vuelta</th></tr><tr><td>Preliminar</td><td>Fase 1</td>"
+        "<td>6–8 de febrero</td><td>13–15 de febrero</td></tr></table>"
+    )
+
+    out.append(heading(2, "Fase de grupos", modern))
+    for g in range(groups):
+        out.append(heading(3, f"Grupo {chr(65 + g % 26)}{g // 26 or ''}", modern))
+        group_teams = rng.sample(teams, 4)
+        standings = "".join(
+            f"<tr><td>{i + 1}</td>{team_cell(t)}<td>{rng.randint(0, 18)}</td></tr>"
+            for i, t in enumerate(group_teams)
+        )
+        out.append(
+            '<table class="wikitable"><tr><th>Pos</th><th>Equipo</th><th>Pts</th></tr>'
+            f"{standings}</table>"
+        )
+        rows = [
+            "<tr><th>Fecha</th><th>Estadio</th><th>Local</th><th>Resultado</th>"
+            "<th>Visitante</th></tr>"
+        ]
+        for home in group_teams:
+            for away in group_teams:
+                if home != away:
+                    rows.append(
+                        f"<tr><td>{rng.randint(1, 28)} de abril</td>"
+                        f"<td>Estadio {home}</td>{team_cell(home)}"
+                        f"<td>{rng.randint(0, 4)}:{rng.randint(0, 4)}</td>"
+                        f"{team_cell(away)}</tr>"
+                    )
+        out.append(
+            '<div class="wikitable-wrapper"><table class="wikitable">'
+            + "".join(rows)
+            + "</table></div>"
+        )
+
+    for phase in knockout_rounds:
+        out.append(heading(3, phase, modern))
+        for tie in range(ties_per_round):
+            home, away = rng.sample(teams, 2)
+            for leg, (first, second) in enumerate(((home, away), (away, home))):
+                score = (
+                    f"{rng.randint(0, 3)}:{rng.randint(0, 3)} "
+                    f"({rng.randint(0, 1)}:{rng.randint(0, 1)})"
+                )
+                if leg == 1 and tie % 3 == 0:
+                    score += (
+                        "<br><style>.mw-parser-output .sinnegrita{font-weight:normal}"
+                        "</style>(4:3 p.)"
+                    )
+                out.append(
+                    '<table class="collapsible vevent plainlist" style="width:100%">'
+                    f"<tr><td>{13 + leg * 7} de agosto, 19:00 (UTC-3)</td>"
+                    f"<td>{first}</td><td>{score}</td><td>{second}</td>"
+                    f"<td>Estadio {first}, Ciudad</td></tr>"
+                    '<tr><td colspan="5">Árbitro: Fulano</td></tr></table>'
+                )
+
+    out.append("</div></body></html>")
+    return "\n".join(out)
+
+
+def write_season_pages(pages_dir: str, teams: list[str], seed: int = 0) -> list[str]:
+    """
+    Writes one synthetic page per registered tournament and season (see
+    tournaments.py); returns their titles.
+    """
+    os.makedirs(pages_dir, exist_ok=True)
+    titles = []
+    for tournament in REGISTRY.values():
+        for year in tournament.years:
+            title = tournament.page.format(year=year)
+            html = season_page(year, teams, modern=year >= 2020, seed=seed)
+            with open(
+                os.path.join(pages_dir, f"{title}.html"), "w", encoding="utf-8"
+            ) as f:
+                f.write(html)
+            titles.append(title)
+    return titles
+
+
+def synthetic_matches(
+    n: int, teams: list[str], missing_ratio: float = 0.01, seed: int = 0
+) -> list[dict]:
+    """
+    `n` raw matches shaped like scraper output, spread over 1960-2024, with
+    about `missing_ratio` of them involving a team absent from the mappings.
+    """
+    rng = random.Random(seed)
+    phases = ["Grupo A", "Grupo B", "Grupo C", "Fase de Grupos", "Fase Final"]
+    matches = []
+    for i in range(n):
+        home, away = rng.sample(teams, 2)
+        if rng.random() < missing_ratio:
+            away = f"Club Desconocido {i % 97}"
+        home_goals, away_goals = rng.randint(0, 5), rng.randint(0, 5)
+        matches.append(
+            {
+                "year": rng.randint(1960, 2024),
+                "phase": rng.choice(phases),
+                "date": f"{rng.randint(1, 28)} de abril",
+                "home_team": home,
+                "away_team": away,
+                "score": f"{home_goals}:{away_goals}",
+                "home_goals": str(home_goals),
+                "away_goals": str(away_goals),
+                "stadium": f"Estadio {home}",
+            }
+        )
+    return matches
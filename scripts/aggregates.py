@@ -0,0 +1,224 @@
+"""
+Altitude-effect summary tables computed from an analysis CSV: home results
+per altitude-difference band, and home/away results per team and per city
+(win/draw/loss rates, mean goal difference and sample counts).
+
+The tables are materialized as CSVs in data/processed/aggregates/ together
+with a manifest holding the hash of their inputs (the analysis CSV and
+city_mappings.json); they are only recomputed when that hash changes.
+pandas is only imported to compute them, so checking that the tables are
+up to date is cheap.
+"""
+
+import argparse
+import os
+import sys
+import metrics
+from manifest import load_manifest, manifest_path, save_manifest, sha256_bytes
+from tournaments import REGISTRY, get_tournament
+
+AGGREGATES_DIR = os.path.join("data", "processed", "aggregates")
+AGGREGATES_VERSION = 1
+BAND_METERS = 500
+TABLES = ("altitude_band", "team", "city")
+RATE_DECIMALS = 4
+INPUT_COLUMNS = [
+    "home_team",
+    "home_city",
+    "home_altitude_meters",
+    "away_team",
+    "away_city",
+    "away_altitude_meters",
+    "altitude_difference",
+    "home_goals",
+    "away_goals",
+]
+
+
+def table_path(output_dir: str, tournament: str, table: str) -> str:
+    return os.path.join(output_dir, f"{tournament}_{table}.csv")
+
+
+def input_hash(csv_path: str, city_map_path: str, band: int) -> str:
+    """Hash of everything the tables depend on: inputs, band size and version."""
+    parts = [f"{AGGREGATES_VERSION}:{band}".encode()]
+    for path in (csv_path, city_map_path):
+        with open(path, "rb") as f:
+            parts.append(sha256_bytes(f.read()).encode())
+    return sha256_bytes(b"\n".join(parts))
+
+
+def outcome_frame(df):
+    """
+    The matches of an analysis DataFrame with a numeric score, with 0/1
+    columns for the home result (home_win, draw, home_loss) and the home
+    goal difference.
+    """
+    import pandas as pd
+
+    frame = df[INPUT_COLUMNS].copy()
+    for column in ("home_team", "home_city", "away_team", "away_city"):
+        frame[column] = frame[column].astype(str)
+    for column in INPUT_COLUMNS:
+        if column.endswith(("_meters", "_difference", "_goals")):
+            frame[column] = pd.to_numeric(frame[column], errors="coerce")
+    frame = frame.dropna(subset=["home_goals", "away_goals"])
+    goal_difference = frame["home_goals"] - frame["away_goals"]
+    frame["goal_difference"] = goal_difference
+    frame["home_win"] = (goal_difference > 0).astype("int64")
+    frame["draw"] = (goal_difference == 0).astype("int64")
+    frame["home_loss"] = (goal_difference < 0).astype("int64")
+    return frame
+
+
+def result_stats(grouped, prefix: str = "", away: bool = False):
+    """
+    DataFrame with the sample count, win/draw/loss rates and mean goal
+    difference of grouped outcome rows, from the home side's point of view
+    or the away side's.
+    """
+    import pandas as pd
+
+    sums = grouped[["home_win", "draw", "home_loss"]].sum()
+    count = grouped.size()
+    wins, losses = ("home_loss", "home_win") if away else ("home_win", "home_loss")
+    sign = -1 if away else 1
+    return pd.DataFrame(
+        {
+            f"{prefix}matches": count,
+            f"{prefix}win_rate": (sums[wins] / count).round(RATE_DECIMALS),
+            f"{prefix}draw_rate": (sums["draw"] / count).round(RATE_DECIMALS),
+            f"{prefix}loss_rate": (sums[losses] / count).round(RATE_DECIMALS),
+            f"{prefix}goal_difference": (
+                sign * grouped["goal_difference"].mean()
+            ).round(RATE_DECIMALS),
+        }
+    )
+
+
+def side_table(frame, key: str, name: str):
+    """Home and away results per value of home_<key> / away_<key>."""
+    home = result_stats(frame.groupby(f"home_{key}"), "home_")
+    away = result_stats(frame.groupby(f"away_{key}"), "away_", away=True)
+    table = home.join(away, how="outer")
+    for column in ("home_matches", "away_matches"):
+        table[column] = table[column].fillna(0).astype("int64")
+    table.index.name = name
+    return table.reset_index()
+
+
+def compute_aggregates(df, band: int = BAND_METERS) -> dict:
+    """The summary tables (TABLES) of an analysis DataFrame, as DataFrames."""
+    import pandas as pd
+
+    frame = outcome_frame(df)
+    frame["band"] = (frame["altitude_difference"] // band * band).astype("Int64")
+    bands = result_stats(frame.groupby("band"), "home_")
+    bands.insert(0, "band_max", bands.index + band - 1)
+    bands.index.name = "band_min"
+
+    cities = side_table(frame, "city", "city")
+    altitudes = pd.concat(
+        [
+            frame[["home_city", "home_altitude_meters"]].set_axis(
+                ["city", "altitude_meters"], axis=1
+            ),
+            frame[["away_city", "away_altitude_meters"]].set_axis(
+                ["city", "altitude_meters"], axis=1
+            ),
+        ]
+    ).drop_duplicates("city")
+    cities = cities.merge(altitudes, on="city", how="left")
+    cities.insert(1, "altitude_meters", cities.pop("altitude_meters"))
+
+    return {
+        "altitude_band": bands.reset_index(),
+        "team": side_table(frame, "team", "team"),
+        "city": cities,
+    }
+
+
+def materialize_aggregates(
+    csv_path: str,
+    city_map_path: str,
+    tournament: str,
+    output_dir: str = AGGREGATES_DIR,
+    band: int = BAND_METERS,
+    force: bool = False,
+) -> dict[str, str] | None:
+    """
+    Writes the summary tables of `csv_path` as <output_dir>/<tournament>_<table>.csv,
+    unless the manifest shows they were computed from the same inputs (and
+    `force` is not set). Returns {table: path}, or None on error.
+    """
+    try:
+        digest = input_hash(csv_path, city_map_path, band)
+    except FileNotFoundError as e:
+        print(f"[Error] Aggregation input not found: {e.filename}", file=sys.stderr)
+        return None
+
+    paths = {table: table_path(output_dir, tournament, table) for table in TABLES}
+    manifest_file = manifest_path(os.path.join(output_dir, f"{tournament}_aggregates"))
+    manifest = load_manifest(manifest_file)
+    if (
+        not force
+        and manifest.get("input_sha256") == digest
+        and all(os.path.exists(path) for path in paths.values())
+    ):
+        print(f"Aggregates for {tournament} are up to date.")
+        metrics.count("aggregates_total", outcome="reused", tournament=tournament)
+        return paths
+
+    import pandas as pd
+
+    with metrics.timer("aggregate", tournament=tournament):
+        tables = compute_aggregates(pd.read_csv(csv_path, encoding="utf-8-sig"), band)
+    try:
+        os.makedirs(output_dir, exist_ok=True)
+        for table, path in paths.items():
+            tables[table].to_csv(path, index=False, encoding="utf-8-sig")
+    except IOError as e:
+        print(f"Error writing aggregates to {output_dir}: {e}", file=sys.stderr)
+        return None
+    save_manifest(
+        manifest_file,
+        {"input_sha256": digest, "band_meters": band, "tables": sorted(paths)},
+    )
+    metrics.count("aggregates_total", outcome="computed", tournament=tournament)
+    print(f"Aggregates for {tournament} saved to: {output_dir}")
+    return paths
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Materializes the altitude-effect summary tables of a tournament."
+    )
+    parser.add_argument("tournament", help=f"One of: {', '.join(REGISTRY)}")
+    parser.add_argument("--output-dir", default=AGGREGATES_DIR)
+    parser.add_argument(
+        "--band",
+        type=int,
+        default=BAND_METERS,
+        help=f"Width of the altitude-difference bands in meters (default: {BAND_METERS}).",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Recompute even if the inputs are unchanged.",
+    )
+    metrics.add_arguments(parser)
+    args = parser.parse_args()
+
+    tournament = get_tournament(args.tournament)
+
+    with metrics.instrumented(f"aggregates_{tournament.name}", args):
+        paths = materialize_aggregates(
+            tournament.analysis_path,
+            os.path.join("data", "mappings", "city_mappings.json"),
+            tournament.name,
+            args.output_dir,
+            args.band,
+            args.force,
+        )
+    if paths is None:
+        sys.exit(1)
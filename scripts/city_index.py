@@ -0,0 +1,255 @@
+"""
+Compiled form of city_mappings.json used to process matches: the team ->
+city id table and, for every pair of cities, the altitude difference and
+the great-circle distance between them, as .npy arrays that are
+memory-mapped when loaded. Enriching a match is then a matter of indexing
+those arrays with the city ids of its teams.
+
+The artifact lives in data/cache/city_index/<hash>/, named after the hash
+of the mapping file, so it is compiled once and rebuilt only when the file
+(or INDEX_VERSION) changes.
+"""
+
+import json
+import os
+import shutil
+import sys
+from typing import NamedTuple
+import numpy as np
+import metrics
+from manifest import sha256_bytes
+from team_names import mapping_teams
+
+CITY_INDEX_DIR = os.path.join("data", "cache", "city_index")
+# Bump whenever the arrays or their computation change.
+INDEX_VERSION = 1
+EARTH_RADIUS_KM = 6371.0
+# Distance stored for pairs where a city has no coordinates.
+NO_DISTANCE = -1
+ARRAYS = ("team_city", "altitudes", "altitude_difference", "distance_km")
+
+
+class CityIndex(NamedTuple):
+    mapping_sha256: str
+    cities: list[str]
+    team_lookup: dict  # team -> mapping entry (see build_reverse_team_map)
+    mapping_teams: list[str]  # team names as listed in the mapping
+    team_city: np.ndarray  # city id of each team of team_lookup, in order
+    altitudes: np.ndarray  # per city id
+    altitude_difference: np.ndarray  # [home city, away city], meters
+    distance_km: np.ndarray  # [home city, away city], NO_DISTANCE if unknown
+
+    @property
+    def teams(self) -> list[str]:
+        return list(self.team_lookup)
+
+
+def load_city_mappings(filepath: str) -> dict:
+    """Helper function to load the city-based JSON mapping file."""
+    try:
+        with open(filepath, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        print(f"[Error] Mapping file not found at: {filepath}", file=sys.stderr)
+        sys.exit(1)
+    except json.JSONDecodeError:
+        print(f"[Error] Failed to decode JSON from: {filepath}", file=sys.stderr)
+        sys.exit(1)
+
+
+def build_reverse_team_map(city_mappings: dict) -> dict:
+    """Inverts the city map to create a fast team-lookup map."""
+    team_lookup = {}
+    malformed_cities = []
+
+    for city, data in city_mappings.items():
+        try:
+            altitude = data["altitude"]
+            teams = data["teams"]
+            if not isinstance(teams, list):
+                malformed_cities.append(f"{city} (la llave 'teams' no es una lista)")
+                continue
+            if not is_number(altitude):
+                malformed_cities.append(f"{city} (la altitud no es un número)")
+                continue
+            latitude, longitude = data.get("latitude"), data.get("longitude")
+            if not (is_number(latitude) and is_number(longitude)):
+                latitude = longitude = None
+            for team in teams:
+                team_lookup[team] = {
+                    "city": city,
+                    "altitude": altitude,
+                    "latitude": latitude,
+                    "longitude": longitude,
+                }
+        except KeyError:
+            malformed_cities.append(f"{city} (faltan llaves 'altitude' o 'teams')")
+        except Exception as e:
+            malformed_cities.append(f"{city} (error: {e})")
+
+    if malformed_cities:
+        print(
+            "\n[Warning] Se encontraron ciudades con formato incorrecto en "
+            "'city_mappings.json':"
+        )
+        for city_error in malformed_cities:
+            print(f"  - {city_error}")
+
+    return team_lookup
+
+
+def is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def great_circle_km(lat1, lon1, lat2, lon2):
+    """Haversine distance in km between points given in degrees (arrays or scalars)."""
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+def travel_distance(home: dict, away: dict) -> int | None:
+    """Rounded distance in km between two mapping entries, None without coordinates."""
+    if None in (home["latitude"], away["latitude"]):
+        return None
+    return int(
+        np.rint(
+            great_circle_km(
+                home["latitude"], home["longitude"], away["latitude"], away["longitude"]
+            )
+        )
+    )
+
+
+def compile_city_index(city_mappings: dict, mapping_sha256: str) -> CityIndex:
+    """Builds the lookup tables and city x city matrices of a city mapping."""
+    team_lookup = build_reverse_team_map(city_mappings)
+    entries = {entry["city"]: entry for entry in team_lookup.values()}
+    cities = list(entries)
+    city_ids = {city: i for i, city in enumerate(cities)}
+
+    altitudes = np.array([entries[c]["altitude"] for c in cities])
+    if not len(altitudes):
+        altitudes = np.empty(0, dtype=np.int64)
+    coordinates = np.array(
+        [
+            [
+                np.nan if entries[c][key] is None else entries[c][key]
+                for key in ("latitude", "longitude")
+            ]
+            for c in cities
+        ],
+        dtype=np.float64,
+    ).reshape(-1, 2)
+    lat, lon = coordinates[:, 0], coordinates[:, 1]
+    distances = great_circle_km(lat[:, None], lon[:, None], lat[None, :], lon[None, :])
+    distance_km = np.where(np.isnan(distances), NO_DISTANCE, np.rint(distances)).astype(
+        np.int32
+    )
+
+    return CityIndex(
+        mapping_sha256=mapping_sha256,
+        cities=cities,
+        team_lookup=team_lookup,
+        mapping_teams=mapping_teams(city_mappings),
+        team_city=np.array(
+            [city_ids[entry["city"]] for entry in team_lookup.values()],
+            dtype=np.int32,
+        ),
+        altitudes=altitudes,
+        altitude_difference=altitudes[:, None] - altitudes[None, :],
+        distance_km=distance_km,
+    )
+
+
+def save_city_index(index: CityIndex, directory: str):
+    """
+    Writes `index` as <directory>/index.json plus one .npy file per array,
+    replacing the directory as a whole so readers never see half of it.
+    """
+    tmp_dir = f"{directory}.tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    for name in ARRAYS:
+        np.save(os.path.join(tmp_dir, f"{name}.npy"), getattr(index, name))
+    with open(os.path.join(tmp_dir, "index.json"), "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "version": INDEX_VERSION,
+                "mapping_sha256": index.mapping_sha256,
+                "cities": index.cities,
+                "team_lookup": index.team_lookup,
+                "mapping_teams": index.mapping_teams,
+            },
+            f,
+            ensure_ascii=False,
+        )
+    shutil.rmtree(directory, ignore_errors=True)
+    os.replace(tmp_dir, directory)
+
+
+def read_city_index(directory: str) -> CityIndex:
+    """Loads a saved index, memory-mapping its arrays."""
+    with open(os.path.join(directory, "index.json"), "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    arrays = {
+        name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r")
+        for name in ARRAYS
+    }
+    return CityIndex(
+        mapping_sha256=meta["mapping_sha256"],
+        cities=meta["cities"],
+        team_lookup=meta["team_lookup"],
+        mapping_teams=meta["mapping_teams"],
+        **arrays,
+    )
+
+
+def load_city_index(city_map_path: str, cache_dir: str = CITY_INDEX_DIR) -> CityIndex:
+    """
+    The compiled index of the mapping file at `city_map_path`: read from
+    `cache_dir` if it was compiled from the same file contents, otherwise
+    compiled and saved there (replacing the indexes of older versions).
+    Exits with an error if the mapping file is missing or invalid.
+    """
+    try:
+        with open(city_map_path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        print(f"[Error] Mapping file not found at: {city_map_path}", file=sys.stderr)
+        sys.exit(1)
+    digest = sha256_bytes(f"{INDEX_VERSION}:".encode() + data)
+    directory = os.path.join(cache_dir, digest[:16])
+
+    if os.path.isdir(directory):
+        try:
+            index = read_city_index(directory)
+            if index.mapping_sha256 == digest:
+                metrics.count("city_index_total", outcome="reused")
+                return index
+        except (OSError, ValueError, KeyError) as e:
+            print(
+                f"[Warning] Ignoring unreadable city index {directory}: {e}",
+                file=sys.stderr,
+            )
+
+    try:
+        city_mappings = json.loads(data)
+    except json.JSONDecodeError:
+        print(f"[Error] Failed to decode JSON from: {city_map_path}", file=sys.stderr)
+        sys.exit(1)
+    index = compile_city_index(city_mappings, digest)
+    metrics.count("city_index_total", outcome="compiled")
+    try:
+        if os.path.isdir(cache_dir):
+            for name in os.listdir(cache_dir):
+                shutil.rmtree(os.path.join(cache_dir, name), ignore_errors=True)
+        save_city_index(index, directory)
+        return read_city_index(directory)
+    except OSError as e:
+        print(f"[Warning] Could not save city index {directory}: {e}", file=sys.stderr)
+        return index
@@ -0,0 +1,64 @@
+import re
+from functools import lru_cache
+from typing import NamedTuple
+from team_names import default_normalizer
+
+SCORE_RE = re.compile(r"\d+\s*[:–-]\s*\d+")
+# One scan of a score cell: the inline CSS that Wikipedia templates leak into
+# the text (up to the end of its line), parenthesized notes (half-time
+# scores, "(t. s.)" for extra time, "(4:3 p.)" for a penalty shoot-out) and
+# the full-time score itself.
+SCORE_TOKEN_RE = re.compile(
+    r"(?P<css>\.mw-parser-output[^\n]*)"
+    r"|\((?:(?P<home_pens>\d+)\s*[:–-]\s*(?P<away_pens>\d+)\s*p\."
+    r"|(?P<extra_time>t\.\s*s\.)"
+    r"|[^)\n]*)\)"
+    r"|(?P<home>\d+)\s*[:–-]\s*(?P<away>\d+)"
+)
+SCORE_CACHE_SIZE = 65536
+
+
+class Score(NamedTuple):
+    home: int | None
+    away: int | None
+    extra_time: bool = False
+    home_penalties: int | None = None
+    away_penalties: int | None = None
+
+
+NO_SCORE = Score(None, None)
+
+
+@lru_cache(maxsize=SCORE_CACHE_SIZE)
+def parse_score(score_text: str | None) -> Score:
+    """
+    Tokenizes score text (e.g. "1:1 (0:0)\n(4:3 p.)") in a single pass. The
+    goals are those of the first score outside parentheses; extra time and
+    the penalty shoot-out come from the notes. Results are cached, since
+    the same few score strings repeat across every season.
+    """
+    if score_text is None:
+        return NO_SCORE
+    home = away = home_pens = away_pens = None
+    extra_time = False
+    for token in SCORE_TOKEN_RE.finditer(score_text):
+        if token["home"] is not None:
+            if home is None:
+                home, away = int(token["home"]), int(token["away"])
+        elif token["home_pens"] is not None:
+            home_pens, away_pens = int(token["home_pens"]), int(token["away_pens"])
+        elif token["extra_time"] is not None:
+            extra_time = True
+    if home is None:
+        return NO_SCORE
+    return Score(home, away, extra_time, home_pens, away_pens)
+
+
+def clean_score(score_text: str | None) -> tuple[int | None, int | None]:
+    """Cleans score text (e.g., "1:1 (0:0)") and returns (home_goals, away_goals)."""
+    return parse_score(score_text)[:2]
+
+
+def clean_team_name(name: str) -> str:
+    """Normalizes team names to match the mapping file (see team_names.py)."""
+    return default_normalizer().normalize(name)
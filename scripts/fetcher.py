@@ -0,0 +1,399 @@
+"""
+Resilient HTTP GETs for the scraper. `Fetcher` wraps a requests session with:
+  - a token bucket per host (`TokenBucket`), which halves its rate on every
+    429 and creeps back up on successes, and pauses the whole host for as
+    long as a Retry-After header asks;
+  - retries of 429 / 5xx responses and dropped connections, after an
+    exponential backoff with full jitter (`backoff_delay`);
+  - a circuit breaker per host (`CircuitBreaker`), so a host that keeps
+    failing is left alone for a while instead of being hammered;
+  - a `RetryQueue` of the URLs that still failed, saved to disk so the next
+    run retries them first.
+"""
+
+import json
+import os
+import random
+import sys
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import requests
+
+RETRY_QUEUE_PATH = os.path.join("data", "cache", "retry_queue.json")
+DEFAULT_TIMEOUT = 10  # seconds
+DEFAULT_RATE = 10.0  # requests per second and host
+DEFAULT_BURST = 10
+DEFAULT_MAX_RETRIES = 4
+BACKOFF_BASE = 0.5  # seconds
+BACKOFF_CAP = 30.0
+# Longer Retry-After waits are not honored: the URL is queued for next run.
+MAX_RETRY_AFTER = 120.0
+BREAKER_THRESHOLD = 10  # consecutive failures that open a host's circuit
+BREAKER_COOLDOWN = 15.0  # seconds before a trial request is let through
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+RETRY_EXCEPTIONS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+)
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Raised instead of sending a request to a host whose circuit is open."""
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+def backoff_delay(
+    attempt: int,
+    retry_after: float | None = None,
+    base: float = BACKOFF_BASE,
+    cap: float = BACKOFF_CAP,
+    rng=random,
+) -> float:
+    """
+    Seconds to sleep before retry number `attempt` (0 = first retry): a
+    uniform draw in [0, min(cap, base * 2**attempt)] ("full jitter"), but
+    never less than the server's Retry-After.
+    """
+    delay = rng.uniform(0, min(cap, base * 2**attempt))
+    if retry_after is not None:
+        delay = max(delay, retry_after + rng.uniform(0, base))
+    return delay
+
+
+class TokenBucket:
+    """
+    Allows `rate` requests per second on average with bursts of up to
+    `burst`. Thread-safe; acquire() blocks until the request may be sent.
+    """
+
+    def __init__(self, rate: float, burst: int = DEFAULT_BURST):
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._throttled_at = float("-inf")
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated
+        self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+        self._updated = now
+
+    def acquire(self) -> float:
+        """Takes a token, sleeping until one is available; returns the wait."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= 1
+            wait = max(self._paused_until - now, -self.tokens / self.rate)
+        if wait > 0:
+            time.sleep(wait)
+        return max(wait, 0.0)
+
+    def pause(self, seconds: float):
+        """Holds back every request for `seconds` (e.g. after a Retry-After)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def throttle(self):
+        """
+        Halves the rate after the server pushed back (429). 429s arriving
+        within a second of the last halving answer requests sent before it
+        and do not halve it again.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if now - self._throttled_at < 1:
+                return
+            self._throttled_at = now
+            self._refill(now)
+            self.rate = max(self.max_rate / 64, self.rate / 2)
+
+    def recover(self):
+        """Raises the rate a step back towards `max_rate` after a success."""
+        with self._lock:
+            if self.rate < self.max_rate:
+                self._refill(time.monotonic())
+                self.rate = min(self.max_rate, self.rate + self.max_rate / 10)
+
+
+class CircuitBreaker:
+    """
+    Closed while a host answers. After `threshold` consecutive failures it
+    opens and requests fail fast for `cooldown` seconds; then one trial
+    request is let through (half-open), which closes the circuit again if
+    it succeeds and reopens it if it fails.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+    def __init__(
+        self, threshold: int = BREAKER_THRESHOLD, cooldown: float = BREAKER_COOLDOWN
+    ):
+        self.threshold = max(1, threshold)
+        self.cooldown = cooldown
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._trial_failed = False
+        self._changed = threading.Condition()
+
+    def before_request(self, wait: bool = False):
+        """
+        Returns if a request may be sent now. Otherwise raises
+        CircuitOpenError, or with `wait` blocks until the circuit lets a
+        request through, unless the last trial request failed too.
+        """
+        with self._changed:
+            while True:
+                if self.state == self.CLOSED:
+                    return
+                remaining = self._opened_at + self.cooldown - time.monotonic()
+                if self.state == self.OPEN and remaining <= 0:
+                    self.state = self.HALF_OPEN
+                    return
+                if not wait or self._trial_failed:
+                    raise CircuitOpenError(
+                        f"circuit {self.state} after {self.failures} failures"
+                    )
+                self._changed.wait(remaining if self.state == self.OPEN else None)
+
+    def record_success(self):
+        with self._changed:
+            self.failures = 0
+            self.state = self.CLOSED
+            self._trial_failed = False
+            self._changed.notify_all()
+
+    def record_failure(self):
+        with self._changed:
+            self.failures += 1
+            if self.state == self.HALF_OPEN:
+                self._trial_failed = True
+            if self.state == self.HALF_OPEN or self.failures >= self.threshold:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+            self._changed.notify_all()
+
+
+class RetryQueue:
+    """
+    URLs whose download still failed after every retry, with how many times
+    they were given up on and the last error. Saved as JSON so the next run
+    can fetch them first. Thread-safe; call save() to persist it.
+    """
+
+    def __init__(self, path: str = RETRY_QUEUE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict] = self._load()
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (json.JSONDecodeError, OSError) as e:
+            print(
+                f"  [Warning] Ignoring unreadable retry queue {self.path}: {e}",
+                file=sys.stderr,
+            )
+            return {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._entries
+
+    def urls(self) -> list[str]:
+        with self._lock:
+            return list(self._entries)
+
+    def add(self, url: str, error: str):
+        with self._lock:
+            failures = self._entries.get(url, {}).get("failures", 0) + 1
+            self._entries[url] = {
+                "failures": failures,
+                "error": error,
+                "failed_at": time.time(),
+            }
+
+    def discard(self, url: str):
+        with self._lock:
+            self._entries.pop(url, None)
+
+    def save(self):
+        """Writes the queue to disk atomically (removes the file when empty)."""
+        with self._lock:
+            snapshot = json.dumps(self._entries, indent=1) if self._entries else None
+        try:
+            if snapshot is None:
+                if os.path.exists(self.path):
+                    os.remove(self.path)
+                return
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(snapshot)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"  [Warning] Could not save retry queue: {e}", file=sys.stderr)
+
+
+class Fetcher:
+    """
+    Sends GETs through `session` (or plain `requests`) with per-host rate
+    limiting, retries and circuit breaking. `rate` is in requests per second
+    and host (0 disables the limit). URLs that exhaust their retries, or
+    whose host circuit is open, are kept in `failed` and added to `queue`
+    (if any), and removed from both once they succeed. Thread-safe.
+    """
+
+    def __init__(
+        self,
+        session: requests.Session | None = None,
+        rate: float = DEFAULT_RATE,
+        burst: int = DEFAULT_BURST,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        timeout: float = DEFAULT_TIMEOUT,
+        breaker_threshold: int = BREAKER_THRESHOLD,
+        breaker_cooldown: float = BREAKER_COOLDOWN,
+        queue: RetryQueue | None = None,
+        rng=random,
+    ):
+        self.session = session
+        self.rate = rate
+        self.burst = burst
+        self.max_retries = max(0, max_retries)
+        self.timeout = timeout
+        self.breaker_threshold = breaker_threshold
+        self.breaker_cooldown = breaker_cooldown
+        self.queue = queue
+        self.rng = rng
+        self.failed: set[str] = set()
+        self.stats = {
+            "requests": 0,
+            "retries": 0,
+            "throttled": 0,
+            "dropped": 0,
+            "server_errors": 0,
+            "circuit_open": 0,
+        }
+        self._lock = threading.Lock()
+        self._buckets: dict[str, TokenBucket] = {}
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def _count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _host(self, url: str) -> tuple[TokenBucket | None, CircuitBreaker]:
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker(
+                    self.breaker_threshold, self.breaker_cooldown
+                )
+                if self.rate > 0:
+                    self._buckets[host] = TokenBucket(self.rate, self.burst)
+            return self._buckets.get(host), self._breakers[host]
+
+    def get(
+        self, url: str, headers: dict | None = None, wait_for_circuit: bool = False
+    ) -> requests.Response:
+        """
+        GETs `url`, retrying 429 / 5xx answers and dropped connections. Returns
+        the last response (which may still be an error status; 4xx other than
+        429 are returned at once) or raises the last RequestException.
+        With `wait_for_circuit`, an open circuit is waited out once (before
+        the first attempt) instead of failing fast.
+        """
+        client = self.session or requests
+        bucket, breaker = self._host(url)
+        attempt = 0
+        while True:
+            try:
+                breaker.before_request(wait=wait_for_circuit and not attempt)
+            except CircuitOpenError as e:
+                self._count("circuit_open")
+                self._give_up(url, str(e))
+                raise
+            if bucket is not None:
+                bucket.acquire()
+            self._count("requests")
+
+            retry_after = None
+            try:
+                response = client.get(url, headers=headers, timeout=self.timeout)
+            except RETRY_EXCEPTIONS as e:
+                self._count("dropped")
+                breaker.record_failure()
+                error, outcome = e, f"{type(e).__name__}: {e}"
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    breaker.record_success()
+                    if bucket is not None:
+                        bucket.recover()
+                    with self._lock:
+                        self.failed.discard(url)
+                    if self.queue is not None:
+                        self.queue.discard(url)
+                    return response
+                breaker.record_failure()
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                if response.status_code == 429:
+                    self._count("throttled")
+                    if bucket is not None:
+                        bucket.throttle()
+                else:
+                    self._count("server_errors")
+                error, outcome = response, f"HTTP {response.status_code}"
+
+            delay = backoff_delay(attempt, retry_after, rng=self.rng)
+            if attempt >= self.max_retries or (
+                retry_after is not None and retry_after > MAX_RETRY_AFTER
+            ):
+                self._give_up(url, outcome)
+                if isinstance(error, Exception):
+                    raise error
+                return error
+            if retry_after is not None and bucket is not None:
+                bucket.pause(retry_after)
+            self._count("retries")
+            attempt += 1
+            time.sleep(delay)
+
+    def _give_up(self, url: str, error: str):
+        with self._lock:
+            self.failed.add(url)
+        if self.queue is not None:
+            self.queue.add(url, error)
+
+    def summary(self) -> str:
+        return (
+            "{requests} requests, {retries} retries ({throttled} throttled, "
+            "{server_errors} server errors, {dropped} dropped connections), "
+            "{circuit_open} refused by an open circuit, {failed} pages failed.".format(
+                failed=len(self.failed), **self.stats
+            )
+        )
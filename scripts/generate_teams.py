@@ -1,16 +1,40 @@
+"""
+Writes the sorted list of canonical team names found in a raw matches file.
+Only uses the standard library (no numpy or pandas), so it starts quickly
+both as a script and as the "teams" stage of pipeline.py.
+"""
+
 import json
-import os
+import metrics
 import sys
+from collections.abc import Iterable
+from raw_matches import iter_matches
+from team_names import default_normalizer, print_approximate
+from tournaments import REGISTRY, get_tournament
 
 
-def generate_unique_teams(raw_json_path: str, output_txt_path: str):
+def generate_unique_teams(
+    raw_json_path: str, output_txt_path: str, matches: Iterable | None = None
+):
     """
-    Reads a raw JSON file and creates a text file
-    containing a unique list of all team names.
+    Streams a raw matches file and creates a text file
+    containing a unique list of all team names, resolved to their
+    canonical names (see team_names.py).
+    `matches` (Match records or dicts) are used instead of the file if given,
+    e.g. when the scraper just produced them in the same process.
     """
+    # Each distinct raw name is kept once, in first-seen order.
+    raw_names = {}
     try:
-        with open(raw_json_path, "r", encoding="utf-8") as f:
-            matches = json.load(f)
+        matches = matches if matches is not None else iter_matches(raw_json_path)
+        with metrics.timer("load_team_matches"):
+            for match in matches:
+                if isinstance(match, dict):
+                    raw_names[match.get("home_team")] = None
+                    raw_names[match.get("away_team")] = None
+                else:
+                    raw_names[match.home_team] = None
+                    raw_names[match.away_team] = None
     except FileNotFoundError:
         print(f"[Error] Raw data file not found at: {raw_json_path}", file=sys.stderr)
         return
@@ -18,13 +42,13 @@ def generate_unique_teams(raw_json_path: str, output_txt_path: str):
         print(f"[Error] Failed to decode JSON from: {raw_json_path}", file=sys.stderr)
         return
 
-    team_names = set()
-    for match in matches:
-        if match.get("home_team"):
-            team_names.add(match["home_team"].strip())
-        if match.get("away_team"):
-            team_names.add(match["away_team"].strip())
-
+    normalizer = default_normalizer()
+    team_names = {
+        normalizer.normalize(name)
+        for name in raw_names
+        if isinstance(name, str) and name.strip()
+    }
+    metrics.count("unique_teams_total", len(team_names))
     if not team_names:
         print("[Warning] No teams were found in the JSON file.")
         return
@@ -39,6 +63,7 @@ def generate_unique_teams(raw_json_path: str, output_txt_path: str):
         print(f"--- Unique Team List Generation Finished ---")
         print(f"Found {len(sorted_teams)} unique teams.")
         print(f"List saved to: {output_txt_path}")
+        print_approximate(normalizer)
     except IOError as e:
         print(f"Error writing to {output_txt_path}: {e}", file=sys.stderr)
 
@@ -47,22 +72,12 @@ if __name__ == "__main__":
     if len(sys.argv) < 2:
         print("Error: Missing tournament name argument.", file=sys.stderr)
         print(
-            "Usage: python3 generate_teams.py [sudamericana|libertadores]",
+            f"Usage: python3 generate_teams.py [{'|'.join(REGISTRY)}]",
             file=sys.stderr,
         )
         sys.exit(1)
 
-    tournament_name = sys.argv[1].lower()
-    RAW_DIR = os.path.join("data", "raw")
-
-    if tournament_name == "sudamericana":
-        RAW_JSON_PATH = os.path.join(RAW_DIR, "sudamericana_matches.json")
-        OUTPUT_TXT_PATH = os.path.join(RAW_DIR, "unique_teams_sudamericana.txt")
-    elif tournament_name == "libertadores":
-        RAW_JSON_PATH = os.path.join(RAW_DIR, "libertadores_matches.json")
-        OUTPUT_TXT_PATH = os.path.join(RAW_DIR, "unique_teams_libertadores.txt")
-    else:
-        print(f"Error: Unknown tournament '{tournament_name}'.", file=sys.stderr)
-        sys.exit(1)
+    tournament = get_tournament(sys.argv[1])
 
-    generate_unique_teams(RAW_JSON_PATH, OUTPUT_TXT_PATH)
+    with metrics.instrumented(f"generate_teams_{tournament.name}"):
+        generate_unique_teams(tournament.raw_path, tournament.teams_path)
@@ -0,0 +1,501 @@
+"""
+Parsing backend working directly on lxml elements.
+
+Produces exactly the same matches as the PyQuery parsers in scraper.py (which
+stay as the reference implementation), but without building PyQuery wrappers
+in the hot loop: selectors are precompiled XPath expressions and the text of
+every cell is extracted once per page and cached.
+"""
+
+import re
+from collections import Counter
+from collections.abc import Callable
+import lxml.html
+from lxml import etree
+from pyquery.text import INLINE_TAGS, SEPARATORS, extract_text, squash_html_whitespace
+from cleaning import SCORE_RE, clean_team_name, parse_score
+import metrics
+
+# Same as SCORE_RE but also tolerating the zero-width spaces that PyQuery's
+# .text() turns into blanks, for classifying tables from their raw text.
+RAW_SCORE_RE = re.compile(r"\d+[\s\u200b]*[:–-][\s\u200b]*\d+")
+GROUP_RE = re.compile(r"\bGrupo\b", re.IGNORECASE)
+WHITESPACE_RE = re.compile(r"\s+")
+HEADING_TAGS = {"h2", "h3", "h4"}
+GROUP_HEADER_WINDOW = 12
+
+
+def has_class(name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+KNOCKOUT_TABLES = etree.XPath(
+    "descendant-or-self::table"
+    f"[{has_class('collapsible')} and {has_class('vevent')} and {has_class('plainlist')}]"
+)
+KNOCKOUT_CLASSES = {"collapsible", "vevent", "plainlist"}
+HEADLINE_SPANS = etree.XPath(f"descendant::span[{has_class('mw-headline')}]")
+ROWS = etree.XPath("descendant::tr")
+CELLS = etree.XPath("descendant::td")
+HEADER_CELLS = etree.XPath("descendant::th")
+
+
+HTML_PARSER = lxml.html.HTMLParser(encoding="utf-8")
+
+
+def record_rows(rows: Counter, backend: str):
+    """
+    Adds the outcome of every table row looked at, per parsing branch (row
+    layout), to the run metrics as group_rows_total.
+    """
+    for (branch, outcome), n in rows.items():
+        metrics.count(
+            "group_rows_total", n, backend=backend, branch=branch, outcome=outcome
+        )
+
+
+def parse_document(content: bytes):
+    """Parses a raw (UTF-8, as served by Wikipedia) HTML body into an lxml root."""
+    return lxml.html.fromstring(content, parser=HTML_PARSER)
+
+
+def element_text(el) -> str:
+    """
+    Same result as PyQuery(el).text(). Cells holding only inline markup take
+    a fast path; anything else goes through PyQuery's own text extraction.
+    """
+    for child in el.iterdescendants():
+        tag = child.tag
+        if not isinstance(tag, str) or tag not in INLINE_TAGS or tag in SEPARATORS:
+            return extract_text(el)
+    return squash_html_whitespace("".join(el.itertext())).strip()
+
+
+class TextCache:
+    """Collapsed text of each element, computed at most once per table."""
+
+    def __init__(self):
+        self._texts: dict = {}
+
+    def __call__(self, el) -> str:
+        text = self._texts.get(el)
+        if text is None:
+            text = WHITESPACE_RE.sub(" ", element_text(el).strip())
+            self._texts[el] = text
+        return text
+
+
+class PendingGroup:
+    """A "Grupo" heading still looking for its match table."""
+
+    def __init__(self, name: str, anchor):
+        self.name = name
+        self.anchor = anchor
+        self.container = anchor.getparent()
+        window = []
+        for sib in anchor.itersiblings():
+            window.append(sib)
+            if len(window) == GROUP_HEADER_WINDOW + 1:
+                break
+        # The heuristic inspects GROUP_HEADER_WINDOW siblings, plus the first
+        # table inside the one right after them when the last says "Partidos".
+        self.window = set(window[:GROUP_HEADER_WINDOW])
+        self.partidos_sibling = None
+        if (
+            len(window) > GROUP_HEADER_WINDOW
+            and isinstance(window[-2].tag, str)
+            and "Partidos" in "".join(window[-2].itertext())
+        ):
+            self.partidos_sibling = window[-1]
+        self.table = None
+
+    def top_level(self, el):
+        """The child of the heading's container that holds `el`, or None."""
+        parent = el.getparent()
+        while parent is not None and parent is not self.container:
+            el, parent = parent, parent.getparent()
+        return el if parent is not None else None
+
+
+def find_group_tables(roots) -> tuple[list[tuple[str, object]], list]:
+    """
+    Locates the match table of every "Grupo" heading in one document-order
+    walk, with the same rules as scraper.parse_group_stage_matches.
+    Returns ([(group_name, table or None)], [every table with a score]).
+    """
+    has_score: dict = {}
+
+    def classify(table) -> bool:
+        if table not in has_score:
+            has_score[table] = bool(RAW_SCORE_RE.search("".join(table.itertext())))
+        return has_score[table]
+
+    def close(group: PendingGroup):
+        # No table after the heading: look inside the heading itself, then
+        # in the sibling following a "Partidos" subtitle.
+        for t in group.anchor.iter("table"):
+            if classify(t):
+                group.table = t
+                return
+        if group.partidos_sibling is not None:
+            inner = next(group.partidos_sibling.iterdescendants("table"), None)
+            if inner is not None and classify(inner):
+                group.table = inner
+
+    groups: list[PendingGroup] = []
+    pending: list[PendingGroup] = []
+    tables = []
+
+    for root in roots:
+        for el in root.iter():
+            tag = el.tag
+            if tag == "table":
+                tables.append(el)
+                if not pending or not classify(el):
+                    continue
+                still_pending = []
+                for group in pending:
+                    top = group.top_level(el)
+                    if top is group.anchor:
+                        still_pending.append(group)
+                    elif top is not None and top in group.window:
+                        group.table = el
+                    else:
+                        close(group)
+                pending = still_pending
+            elif tag == "span" and "mw-headline" in (el.get("class") or "").split():
+                if not any(a.tag in HEADING_TAGS for a in el.iterancestors()):
+                    continue
+                name = WHITESPACE_RE.sub(" ", element_text(el).strip())
+                if GROUP_RE.search(name):
+                    group = PendingGroup(name, el.getparent())
+                    groups.append(group)
+                    pending.append(group)
+
+    for group in pending:
+        close(group)
+
+    score_tables = [t for t in tables if classify(t)]
+    metrics.count("tables_examined_total", len(tables))
+    metrics.count("score_tables_total", len(score_tables))
+    for g in groups:
+        metrics.count(
+            "groups_total", table="found" if g.table is not None else "missing"
+        )
+    return [(g.name, g.table) for g in groups], score_tables
+
+
+def parse_group_table(
+    table,
+    group_name: str,
+    year: int,
+    stadium: str | None = None,
+    clean_name: Callable[[str], str] = clean_team_name,
+) -> tuple[list[dict], str | None]:
+    """lxml counterpart of scraper.parse_group_table."""
+    matches: list[dict] = []
+    text = TextCache()
+    rows = Counter()
+
+    for row in ROWS(table):
+        header_ths = HEADER_CELLS(row)
+        if header_ths and any(
+            "fecha" in text(th).lower() or "local" in text(th).lower()
+            for th in header_ths
+        ):
+            rows["header", "skipped"] += 1
+            continue
+
+        cols = CELLS(row)
+        if len(cols) < 4:
+            rows["short", "skipped"] += 1
+            continue
+
+        date = None
+        stadium = None
+        home_team = ""
+        away_team = ""
+        score_raw = ""
+
+        if len(cols) >= 5:
+            branch = "5_cols"
+            date = text(cols[0])
+            stadium = text(cols[1]) or None
+            home_team = text(cols[2])
+            score_raw = text(cols[3])
+            away_team = text(cols[4])
+        else:
+            date = text(cols[0])
+            second_text = text(cols[1])
+            third_text = text(cols[2])
+            fourth_text = text(cols[3])
+
+            if SCORE_RE.search(third_text):
+                branch = "4_cols_score_third"
+                home_team, score_raw = second_text, third_text
+            elif SCORE_RE.search(second_text):
+                branch = "4_cols_score_second"
+                score_raw, home_team = second_text, third_text
+            else:
+                branch = "4_cols_no_score"
+                home_team, score_raw = second_text, third_text
+            away_team = fourth_text
+
+        if not score_raw or not SCORE_RE.search(score_raw):
+            rows[branch, "no_score"] += 1
+            continue
+
+        home_team = clean_name(home_team)
+        away_team = clean_name(away_team)
+
+        score = parse_score(score_raw)
+        if score.home is None:
+            m = SCORE_RE.search(score_raw)
+            if m:
+                score = parse_score(m.group(0))
+            if score.home is None:
+                rows[branch, "bad_score"] += 1
+                continue
+
+        if not home_team or not away_team:
+            rows[branch, "no_team"] += 1
+            continue
+
+        rows[branch, "match"] += 1
+        matches.append(
+            {
+                "year": year,
+                "phase": group_name,
+                "date": date,
+                "home_team": home_team,
+                "away_team": away_team,
+                "score": score_raw,
+                "home_goals": score.home,
+                "away_goals": score.away,
+                "stadium": stadium,
+                "extra_time": score.extra_time,
+                "home_penalties": score.home_penalties,
+                "away_penalties": score.away_penalties,
+            }
+        )
+
+    record_rows(rows, "lxml")
+    return matches, stadium
+
+
+def parse_fallback_tables(
+    tables: list,
+    year: int,
+    stadium: str | None = None,
+    clean_name: Callable[[str], str] = clean_team_name,
+) -> list[dict]:
+    """lxml counterpart of scraper.parse_fallback_tables."""
+    matches: list[dict] = []
+    rows = Counter()
+
+    for t in tables:
+        text = TextCache()
+        for row in ROWS(t):
+            cols = CELLS(row)
+            if len(cols) < 4:
+                rows["fallback", "skipped"] += 1
+                continue
+            date = text(cols[0])
+            if len(cols) >= 5:
+                stadium = text(cols[1]) or None
+                home_team = clean_name(text(cols[2]))
+                score_raw = text(cols[3])
+                away_team = clean_name(text(cols[4]))
+            else:
+                home_team = clean_name(text(cols[1]))
+                score_raw = text(cols[2])
+                away_team = clean_name(text(cols[3]))
+            score = parse_score(score_raw)
+            if score.home is None:
+                rows["fallback", "bad_score"] += 1
+                continue
+            rows["fallback", "match"] += 1
+            matches.append(
+                {
+                    "year": year,
+                    "phase": "Fase de Grupos",
+                    "date": date,
+                    "home_team": home_team,
+                    "away_team": away_team,
+                    "score": score_raw,
+                    "home_goals": score.home,
+                    "away_goals": score.away,
+                    "stadium": stadium,
+                    "extra_time": score.extra_time,
+                    "home_penalties": score.home_penalties,
+                    "away_penalties": score.away_penalties,
+                }
+            )
+
+    record_rows(rows, "lxml")
+    return matches
+
+
+def parse_group_stage_matches(
+    root, year: int, clean_name: Callable[[str], str] = clean_team_name
+) -> list[dict]:
+    """lxml counterpart of scraper.parse_group_stage_matches_single_pass."""
+    groups, score_tables = find_group_tables([root])
+
+    matches: list[dict] = []
+    stadium = None
+    for group_name, table in groups:
+        if table is None:
+            continue
+        group_matches, stadium = parse_group_table(
+            table, group_name, year, stadium, clean_name
+        )
+        matches.extend(group_matches)
+
+    if not matches:
+        matches = parse_fallback_tables(score_tables, year, stadium, clean_name)
+
+    return matches
+
+
+def heading_text(heading) -> str:
+    """
+    Title of an h2/h3 heading: its mw-headline spans in the pre-2024 markup,
+    the heading's own text in the current one (see synthetic.heading).
+    """
+    spans = HEADLINE_SPANS(heading)
+    return " ".join(element_text(s) for s in spans or [heading]).strip()
+
+
+def knockout_leg(
+    table, year: int, phase: str, clean_name: Callable[[str], str] = clean_team_name
+) -> dict | None:
+    """The match in the first row of a knockout table, None if it is too short."""
+    rows = ROWS(table)
+    cells = CELLS(rows[0]) if rows else []
+    if len(cells) < 5:
+        metrics.count("knockout_tables_total", backend="lxml", outcome="short")
+        return None
+    metrics.count("knockout_tables_total", backend="lxml", outcome="match")
+
+    date = element_text(cells[0]).strip()
+    home_team = clean_name(element_text(cells[1]).strip())
+    score_raw = element_text(cells[2]).strip()
+    away_team = clean_name(element_text(cells[3]).strip())
+    stadium = element_text(cells[4]).strip().split(",")[0]
+    score = parse_score(score_raw)
+
+    return {
+        "year": year,
+        "phase": phase,
+        "date": date,
+        "home_team": home_team,
+        "away_team": away_team,
+        "score": score_raw,
+        "home_goals": score.home,
+        "away_goals": score.away,
+        "stadium": stadium,
+        "extra_time": score.extra_time,
+        "home_penalties": score.home_penalties,
+        "away_penalties": score.away_penalties,
+    }
+
+
+def parse_knockout_matches(
+    root, year: int, clean_name: Callable[[str], str] = clean_team_name
+) -> list[dict]:
+    """lxml counterpart of scraper.parse_knockout_matches."""
+    matches = []
+    current_phase = "Fase Final"
+
+    for table in KNOCKOUT_TABLES(root):
+        # Like PyQuery's prev_all("h2, h3").eq(0): the first h2/h3 sibling
+        # before the table, in document order.
+        parent = table.getparent()
+        for sib in parent.iterchildren() if parent is not None else ():
+            if sib is table:
+                break
+            if sib.tag in ("h2", "h3"):
+                span_text = " ".join(element_text(s) for s in HEADLINE_SPANS(sib))
+                if span_text:
+                    current_phase = span_text.strip()
+                break
+
+        match = knockout_leg(table, year, current_phase, clean_name)
+        if match is not None:
+            matches.append(match)
+    return matches
+
+
+def pair_legs(matches: list[dict]):
+    """
+    Adds the tie of every knockout match: two consecutive matches of the same
+    phase with the teams swapped are the legs of one tie, and get `leg` 1
+    and 2 and the aggregate score from their own home side's point of view.
+    Single matches (e.g. a one-off final) get None in all three fields.
+    Team names are compared as given, so they should be normalized first.
+    """
+    i = 0
+    while i < len(matches):
+        first = matches[i]
+        second = matches[i + 1] if i + 1 < len(matches) else None
+        if (
+            second is None
+            or second["phase"] != first["phase"]
+            or second["home_team"] != first["away_team"]
+            or second["away_team"] != first["home_team"]
+        ):
+            first.update(leg=None, aggregate_home_goals=None, aggregate_away_goals=None)
+            i += 1
+            continue
+        goals = (
+            first["home_goals"],
+            first["away_goals"],
+            second["home_goals"],
+            second["away_goals"],
+        )
+        if None in goals:
+            first_side = second_side = None
+        else:
+            first_side = goals[0] + goals[3]
+            second_side = goals[1] + goals[2]
+        first.update(
+            leg=1, aggregate_home_goals=first_side, aggregate_away_goals=second_side
+        )
+        second.update(
+            leg=2, aggregate_home_goals=second_side, aggregate_away_goals=first_side
+        )
+        i += 2
+
+
+def parse_knockout_matches_single_pass(
+    root, year: int, clean_name: Callable[[str], str] = clean_team_name
+) -> list[dict]:
+    """
+    Knockout matches read in one document-order walk over headings and
+    tables: each table takes its phase from the closest h2/h3 heading before
+    it, in either heading markup, instead of looking for a heading among the
+    table's preceding siblings (quadratic in the fixtures of a page, and
+    blind to the current markup, where headings sit inside a div). Both
+    legs of each tie get their aggregate score (see pair_legs); penalty
+    shoot-outs come with the deciding leg's score.
+    """
+    matches = []
+    phase = "Fase Final"
+
+    for el in root.iter("h2", "h3", "table"):
+        if el.tag != "table":
+            phase = heading_text(el) or phase
+        elif KNOCKOUT_CLASSES.issubset((el.get("class") or "").split()):
+            match = knockout_leg(el, year, phase, clean_name)
+            if match is not None:
+                matches.append(match)
+
+    pair_legs(matches)
+    return matches
+
+
+KNOCKOUT_PARSERS = {
+    "sibling-scan": parse_knockout_matches,
+    "single-pass": parse_knockout_matches_single_pass,
+}
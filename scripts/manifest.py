@@ -0,0 +1,64 @@
+import hashlib
+import json
+import os
+import sys
+
+
+def sha256_bytes(data: bytes) -> str:
+    """Hex SHA-256 of a byte string."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def sha256_json(obj) -> str:
+    """Hex SHA-256 of a JSON-serializable object, independent of key order."""
+    payload = json.dumps(obj, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return sha256_bytes(payload.encode("utf-8"))
+
+
+def manifest_path(output_path: str) -> str:
+    """Manifest stored next to an output file: <name>_manifest.json."""
+    root, _ = os.path.splitext(output_path)
+    return f"{root}_manifest.json"
+
+
+def partial_manifest_path(output_path: str) -> str:
+    """
+    Manifest of the seasons written so far to the temporary file of an
+    output (see raw_matches.MatchWriter): <name>_manifest.partial.json.
+    """
+    root, _ = os.path.splitext(output_path)
+    return f"{root}_manifest.partial.json"
+
+
+def load_manifest(path: str) -> dict:
+    """Loads a per-season manifest; a missing or unreadable one is empty."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return {"seasons": {}}
+    except (json.JSONDecodeError, OSError) as e:
+        print(f"  [Warning] Ignoring unreadable manifest {path}: {e}", file=sys.stderr)
+        return {"seasons": {}}
+    manifest.setdefault("seasons", {})
+    return manifest
+
+
+def save_manifest(path: str, manifest: dict):
+    """Writes a manifest atomically."""
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Error writing manifest {path}: {e}", file=sys.stderr)
+
+
+def group_by_year(rows: list[dict]) -> dict[str, list[dict]]:
+    """Groups rows by their "year" value (as a string), keeping file order."""
+    seasons: dict[str, list[dict]] = {}
+    for row in rows:
+        seasons.setdefault(str(row.get("year")), []).append(row)
+    return seasons
@@ -0,0 +1,124 @@
+"""
+Match identity and deduplication. A match is identified by (tournament,
+year, phase, date, home team, away team), with the text fields folded
+(case, accents and punctuation, see team_names.fold) so that the same
+fixture listed twice on a page, or spelled slightly differently, has the
+same key.
+
+`MatchIndex` deduplicates in O(1) per match with a hash index on that key,
+and `change_set` compares two raw files' worth of matches by key.
+"""
+
+import json
+import os
+import sys
+from collections.abc import Iterable
+from match_table import Match
+from team_names import fold
+
+# Fields compared to tell a modified match from an unchanged one.
+COMPARED_FIELDS = Match._fields
+
+
+def match_key(tournament: str, match: Match) -> tuple:
+    """Identity of a match within all scraped data."""
+    return (
+        tournament,
+        match.year,
+        fold(match.phase or ""),
+        fold(match.date or ""),
+        fold(match.home_team or ""),
+        fold(match.away_team or ""),
+    )
+
+
+class MatchIndex:
+    """Matches of a tournament by identity, keeping the first of each."""
+
+    def __init__(self, tournament: str, matches: Iterable[Match] = ()):
+        self.tournament = tournament
+        self.matches: dict[tuple, Match] = {}
+        self.duplicates = 0
+        self.update(matches)
+
+    def add(self, match: Match) -> bool:
+        """Indexes `match`; False if a match with the same identity is indexed."""
+        key = match_key(self.tournament, match)
+        if key in self.matches:
+            self.duplicates += 1
+            return False
+        self.matches[key] = match
+        return True
+
+    def dedupe(self, matches: Iterable[Match]) -> list[Match]:
+        """The matches not indexed yet, in order; they are indexed as well."""
+        return [match for match in matches if self.add(match)]
+
+    def update(self, matches: Iterable[Match]):
+        """Indexes `matches`, e.g. rows already deduplicated by a previous run."""
+        for match in matches:
+            self.add(match)
+
+    def __contains__(self, match: Match) -> bool:
+        return match_key(self.tournament, match) in self.matches
+
+    def __len__(self) -> int:
+        return len(self.matches)
+
+
+def dedupe_rows(tournament: str, rows: list[dict]) -> list[dict]:
+    """Raw match dicts without repeated matches (see MatchIndex)."""
+    index = MatchIndex(tournament)
+    return [row for row in rows if index.add(Match.from_dict(row))]
+
+
+def change_set(previous: MatchIndex, current: MatchIndex) -> dict:
+    """
+    Matches added, removed and modified (same identity, other values) from
+    `previous` to `current`, and the seasons they belong to.
+    """
+    added = [m for key, m in current.matches.items() if key not in previous.matches]
+    removed = [m for key, m in previous.matches.items() if key not in current.matches]
+    modified = []
+    for key, match in current.matches.items():
+        old = previous.matches.get(key)
+        if old is not None and old != match:
+            changed = {
+                field: [getattr(old, field), getattr(match, field)]
+                for field in COMPARED_FIELDS
+                if getattr(old, field) != getattr(match, field)
+            }
+            modified.append({"match": match._asdict(), "changed": changed})
+    seasons = {m.year for m in added + removed}
+    seasons.update(change["match"]["year"] for change in modified)
+    return {
+        "tournament": current.tournament,
+        "summary": {
+            "added": len(added),
+            "removed": len(removed),
+            "modified": len(modified),
+            "unchanged": len(current) - len(added) - len(modified),
+        },
+        "seasons": sorted((s for s in seasons if s is not None), reverse=True),
+        "added": [m._asdict() for m in added],
+        "removed": [m._asdict() for m in removed],
+        "modified": modified,
+    }
+
+
+def change_set_path(raw_path: str) -> str:
+    """Change set stored next to a raw file: <name>_changes.json."""
+    root, _ = os.path.splitext(raw_path)
+    return f"{root}_changes.json"
+
+
+def save_change_set(path: str, changes: dict):
+    """Writes a change set atomically."""
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(changes, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Error writing change set {path}: {e}", file=sys.stderr)
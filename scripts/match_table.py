@@ -0,0 +1,236 @@
+"""
+Compact in-memory representation of matches: `Match`, a record with the
+fields of a raw match, and `MatchTable`, a columnar store in which team,
+phase, date, score and stadium strings are interned into shared pools and
+held as int32 codes, and years, goals, penalties and legs as int32 arrays.
+A table hands its columns to pandas without converting them row by row.
+"""
+
+from operator import itemgetter
+from typing import NamedTuple
+
+import numpy as np
+
+
+class Match(NamedTuple):
+    year: int | None
+    phase: str | None
+    date: str | None
+    home_team: str | None
+    away_team: str | None
+    score: str | None
+    home_goals: int | None
+    away_goals: int | None
+    stadium: str | None
+    extra_time: bool = False
+    home_penalties: int | None = None
+    away_penalties: int | None = None
+    # Two-legged knockout ties (see lxml_backend.pair_legs).
+    leg: int | None = None
+    aggregate_home_goals: int | None = None
+    aggregate_away_goals: int | None = None
+
+    @classmethod
+    def from_dict(cls, match: dict) -> "Match":
+        """Match from a raw dict; goals and years stored as strings become ints."""
+        return cls(
+            *(
+                to_int(match.get(field)) if field in INT_FIELDS else match.get(field)
+                for field in FIELDS
+            )
+        )
+
+
+FIELDS = Match._fields
+INT_FIELDS = (
+    "year",
+    "home_goals",
+    "away_goals",
+    "home_penalties",
+    "away_penalties",
+    "leg",
+    "aggregate_home_goals",
+    "aggregate_away_goals",
+)
+BOOL_FIELDS = ("extra_time",)
+# String field -> pool it is interned in; home and away teams share one.
+STRING_FIELDS = {
+    "phase": "phase",
+    "date": "date",
+    "home_team": "team",
+    "away_team": "team",
+    "score": "score",
+    "stadium": "stadium",
+}
+
+
+def to_int(value) -> int | None:
+    """`value` as an int, or None if it is missing or not a whole number."""
+    if value is None or isinstance(value, int):
+        return value
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def int_column(values: list) -> tuple[np.ndarray, np.ndarray | None]:
+    """(int32 values, mask of missing ones or None if none is missing)."""
+    try:
+        return np.array(values, dtype=np.int32), None
+    except (TypeError, ValueError, OverflowError):
+        pass
+    values = [to_int(v) for v in values]
+    missing = np.fromiter((v is None for v in values), dtype=bool, count=len(values))
+    array = np.fromiter(
+        (0 if v is None else v for v in values), dtype=np.int32, count=len(values)
+    )
+    return array, missing
+
+
+def field_values(matches: list, field: str) -> list:
+    """Values of one field of a list of Match records or raw dicts."""
+    if isinstance(matches[0], tuple):
+        return list(map(itemgetter(FIELDS.index(field)), matches))
+    try:
+        return list(map(itemgetter(field), matches))
+    except KeyError:
+        return [m.get(field) for m in matches]
+
+
+class StringPool:
+    """Interns strings as consecutive int codes, in first-seen order."""
+
+    __slots__ = ("index",)
+
+    def __init__(self):
+        self.index = {}
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    @property
+    def values(self) -> list[str]:
+        return list(self.index)
+
+    def codes(self, values: list) -> np.ndarray:
+        """int32 codes of `values`, interning new ones; None is -1."""
+        index = self.index
+        return np.fromiter(
+            (-1 if v is None else index.setdefault(v, len(index)) for v in values),
+            dtype=np.int32,
+            count=len(values),
+        )
+
+    def lookup(self, codes: np.ndarray) -> np.ndarray:
+        """Object array of the strings behind `codes` (None for -1)."""
+        strings = np.empty(len(self.index) + 1, dtype=object)
+        strings[:-1] = self.values
+        return strings[codes]
+
+
+class MatchTable:
+    """
+    Columnar match store. Matches are added a batch at a time with `extend`
+    (e.g. one season); `fields` limits the table to some of the Match
+    fields. Tables sharing `pools` produce comparable string codes.
+    """
+
+    __slots__ = ("fields", "pools", "length", "_chunks", "_missing")
+
+    def __init__(self, fields=FIELDS, pools: dict[str, StringPool] | None = None):
+        self.fields = tuple(fields)
+        self.pools = pools if pools is not None else {}
+        for field in self.fields:
+            if field in STRING_FIELDS:
+                self.pools.setdefault(STRING_FIELDS[field], StringPool())
+        self.length = 0
+        self._chunks = {field: [] for field in self.fields}
+        self._missing = {field: [] for field in self.fields if field in INT_FIELDS}
+
+    def __len__(self) -> int:
+        return self.length
+
+    def extend(self, matches: list) -> "MatchTable":
+        """Appends Match records or raw match dicts."""
+        if not matches:
+            return self
+        for field in self.fields:
+            values = field_values(matches, field)
+            if field in STRING_FIELDS:
+                column = self.pools[STRING_FIELDS[field]].codes(values)
+            elif field in INT_FIELDS:
+                column, missing = int_column(values)
+                if missing is None:
+                    missing = np.zeros(len(values), dtype=bool)
+                self._missing[field].append(missing)
+            else:
+                column = np.fromiter(map(bool, values), dtype=bool, count=len(values))
+            self._chunks[field].append(column)
+        self.length += len(matches)
+        return self
+
+    def _combined(self, chunks: list, dtype) -> np.ndarray:
+        if len(chunks) != 1:
+            chunks[:] = [np.concatenate(chunks) if chunks else np.empty(0, dtype)]
+        return chunks[0]
+
+    def column(self, field: str) -> np.ndarray:
+        """Codes of a string field, values of an int or bool field."""
+        dtype = bool if field in BOOL_FIELDS else np.int32
+        return self._combined(self._chunks[field], dtype)
+
+    def missing(self, field: str) -> np.ndarray:
+        """Mask of the missing values of an int field."""
+        return self._combined(self._missing[field], bool)
+
+    def pool(self, field: str) -> StringPool:
+        return self.pools[STRING_FIELDS[field]]
+
+    def strings(self, field: str) -> np.ndarray:
+        """Object array with the values of a string field."""
+        return self.pool(field).lookup(self.column(field))
+
+    def values(self, field: str) -> list:
+        """Values of any field as Python objects (None when missing)."""
+        if field in STRING_FIELDS:
+            return self.strings(field).tolist()
+        values = self.column(field).tolist()
+        if field in INT_FIELDS:
+            for i in np.flatnonzero(self.missing(field)):
+                values[i] = None
+        return values
+
+    def rows(self):
+        """Iterates over the matches as Match records."""
+        if self.fields != FIELDS:
+            raise ValueError("rows() needs a table with every Match field")
+        return map(Match._make, zip(*(self.values(f) for f in FIELDS)))
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the column arrays (string pools excluded)."""
+        total = sum(self.column(f).nbytes for f in self.fields)
+        return total + sum(self.missing(f).nbytes for f in self._missing)
+
+    def to_frame(self, fields=None):
+        """
+        DataFrame of the table: string fields become categoricals over their
+        pool and int fields nullable Int32 arrays, both built on the table's
+        arrays without a per-row conversion.
+        """
+        import pandas as pd
+
+        data = {}
+        for field in fields or self.fields:
+            if field in STRING_FIELDS:
+                data[field] = pd.Categorical.from_codes(
+                    self.column(field), categories=self.pool(field).values
+                )
+            elif field in INT_FIELDS:
+                data[field] = pd.arrays.IntegerArray(
+                    self.column(field), self.missing(field)
+                )
+            else:
+                data[field] = self.column(field)
+        return pd.DataFrame(data, copy=False)
@@ -0,0 +1,410 @@
+"""
+Run instrumentation: counters, gauges and timers recorded by the scripts
+into a process-wide registry (`REGISTRY`, used through `count`, `gauge`,
+`observe` and `timer`), and a report written at the end of every run as
+JSON and in the Prometheus text exposition format. `instrumented` wraps a
+command's main code, optionally under cProfile and/or tracemalloc.
+
+Metric values can carry labels (e.g. outcome="fresh"); `scope` adds labels
+to everything recorded by the current thread, such as the tournament.
+Timers also count their observations in LATENCY_BUCKETS, from which the
+report estimates tail latencies (p50/p95/p99), as a Prometheus histogram.
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+METRICS_DIR = os.path.join("data", "metrics")
+PROMETHEUS_PREFIX = "altitude_"
+PROFILE_TOP = 15
+MEMORY_TOP = 10
+# Upper bounds (seconds) of the timer histogram buckets; a last one is unbounded.
+LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+def label_key(labels: dict) -> tuple:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def bucket_index(seconds: float) -> int:
+    for i, bound in enumerate(LATENCY_BUCKETS):
+        if seconds <= bound:
+            return i
+    return len(LATENCY_BUCKETS)
+
+
+def bucket_quantile(buckets: list[int], q: float, longest: float) -> float | None:
+    """
+    Estimated `q` quantile of the observations counted in `buckets`,
+    interpolating linearly within the bucket it falls in (the last bucket
+    ends at the longest observation).
+    """
+    total = sum(buckets)
+    if not total:
+        return None
+    rank = q * total
+    seen = 0
+    for i, n in enumerate(buckets):
+        if n and seen + n >= rank:
+            lower = LATENCY_BUCKETS[i - 1] if i else 0.0
+            upper = LATENCY_BUCKETS[i] if i < len(LATENCY_BUCKETS) else longest
+            upper = min(upper, longest)
+            return lower + (upper - lower) * max(rank - seen, 0) / n
+        seen += n
+    return longest
+
+
+class Metrics:
+    """Thread-safe registry of counters, gauges and timers, keyed by name and labels."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._scope = threading.local()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.counters: dict[tuple, float] = {}
+            self.gauges: dict[tuple, float] = {}
+            # (name, labels) -> [count, total seconds, max seconds, bucket counts]
+            self.timers: dict[tuple, list] = {}
+
+    def _key(self, name: str, labels: dict) -> tuple:
+        scoped = getattr(self._scope, "labels", None)
+        if scoped:
+            labels = {**scoped, **labels}
+        return name, label_key(labels)
+
+    def count(self, name: str, value: float = 1, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def gauge(self, name: str, value: float, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            self.gauges[key] = value
+
+    def observe(self, name: str, seconds: float, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            timer = self.timers.setdefault(key, new_timer())
+            timer[0] += 1
+            timer[1] += seconds
+            timer[2] = max(timer[2], seconds)
+            timer[3][bucket_index(seconds)] += 1
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """Observes the wall-clock time of the block (also when it raises)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    @contextmanager
+    def scope(self, **labels):
+        """Adds `labels` to every metric recorded by this thread in the block."""
+        previous = getattr(self._scope, "labels", None)
+        self._scope.labels = {**(previous or {}), **labels}
+        try:
+            yield
+        finally:
+            self._scope.labels = previous
+
+    def snapshot(self) -> dict:
+        """Picklable copy of the registry, e.g. to send back from a worker process."""
+        with self._lock:
+            return {
+                "counters": dict(self.counters),
+                "gauges": dict(self.gauges),
+                "timers": {
+                    k: [n, total, longest, list(buckets)]
+                    for k, (n, total, longest, buckets) in self.timers.items()
+                },
+            }
+
+    def merge(self, snapshot: dict):
+        """Adds the values of another registry's snapshot to this one."""
+        with self._lock:
+            for key, value in snapshot["counters"].items():
+                self.counters[key] = self.counters.get(key, 0) + value
+            self.gauges.update(snapshot["gauges"])
+            for key, (n, total, longest, buckets) in snapshot["timers"].items():
+                timer = self.timers.setdefault(key, new_timer())
+                timer[0] += n
+                timer[1] += total
+                timer[2] = max(timer[2], longest)
+                timer[3] = [a + b for a, b in zip(timer[3], buckets)]
+
+    def total(self, name: str, **labels) -> float:
+        """Sum of counter `name` over every label set that includes `labels`."""
+        wanted = set(label_key(labels))
+        with self._lock:
+            return sum(
+                value
+                for (counter, key), value in self.counters.items()
+                if counter == name and wanted <= set(key)
+            )
+
+    def quantiles(self, name: str, **labels) -> dict[float, float | None]:
+        """
+        Estimated QUANTILES of timer `name` over every label set that
+        includes `labels` (e.g. all outcomes of "fetch_page").
+        """
+        wanted = set(label_key(labels))
+        buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        longest = 0.0
+        with self._lock:
+            for (timer_name, key), timer in self.timers.items():
+                if timer_name == name and wanted <= set(key):
+                    buckets = [a + b for a, b in zip(buckets, timer[3])]
+                    longest = max(longest, timer[2])
+        return {q: bucket_quantile(buckets, q, longest) for q in QUANTILES}
+
+    def to_dict(self) -> dict:
+        snapshot = self.snapshot()
+
+        def entries(values: dict) -> list[dict]:
+            return [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in sorted(values.items())
+            ]
+
+        return {
+            "counters": entries(snapshot["counters"]),
+            "gauges": entries(snapshot["gauges"]),
+            "timers": [
+                {
+                    "name": name,
+                    "labels": dict(labels),
+                    "count": n,
+                    "sum_seconds": round(total, 6),
+                    "max_seconds": round(longest, 6),
+                    **{
+                        f"p{round(q * 100)}_seconds": round(
+                            bucket_quantile(buckets, q, longest), 6
+                        )
+                        for q in QUANTILES
+                    },
+                }
+                for (name, labels), (n, total, longest, buckets) in sorted(
+                    snapshot["timers"].items()
+                )
+            ],
+        }
+
+    def to_prometheus(self, prefix: str = PROMETHEUS_PREFIX) -> str:
+        """The registry in the Prometheus text exposition format (version 0.0.4)."""
+        snapshot = self.snapshot()
+        families: dict[str, tuple[str, list[str]]] = {}
+
+        def add(family: str, kind: str, sample: str, labels: tuple, value):
+            families.setdefault(family, (kind, []))[1].append(
+                f"{sample}{prometheus_labels(labels)} {value:g}"
+            )
+
+        for (name, labels), value in sorted(snapshot["counters"].items()):
+            family = f"{prefix}{name}"
+            add(family, "counter", family, labels, value)
+        for (name, labels), value in sorted(snapshot["gauges"].items()):
+            family = f"{prefix}{name}"
+            add(family, "gauge", family, labels, value)
+        for (name, labels), (n, total, longest, buckets) in sorted(
+            snapshot["timers"].items()
+        ):
+            family = f"{prefix}{name}_seconds"
+            cumulative = 0
+            for bound, count in zip((*LATENCY_BUCKETS, "+Inf"), buckets):
+                cumulative += count
+                le = bound if bound == "+Inf" else f"{bound:g}"
+                add(
+                    family,
+                    "histogram",
+                    f"{family}_bucket",
+                    label_key({**dict(labels), "le": le}),
+                    cumulative,
+                )
+            add(family, "histogram", f"{family}_count", labels, n)
+            add(family, "histogram", f"{family}_sum", labels, total)
+            add(f"{family}_max", "gauge", f"{family}_max", labels, longest)
+
+        lines = []
+        for family, (kind, samples) in families.items():
+            lines.append(f"# TYPE {family} {kind}")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+
+def prometheus_labels(labels: tuple) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        (k, v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for k, v in labels
+    )
+    return "{" + ",".join(f'{k}="{v}"' for k, v in escaped) + "}"
+
+
+def new_timer() -> list:
+    return [0, 0.0, 0.0, [0] * (len(LATENCY_BUCKETS) + 1)]
+
+
+REGISTRY = Metrics()
+count = REGISTRY.count
+gauge = REGISTRY.gauge
+observe = REGISTRY.observe
+timer = REGISTRY.timer
+scope = REGISTRY.scope
+merge = REGISTRY.merge
+quantiles = REGISTRY.quantiles
+total = REGISTRY.total
+
+
+def write_report(
+    command: str,
+    metrics_dir: str = METRICS_DIR,
+    extra: dict | None = None,
+    registry: Metrics = REGISTRY,
+) -> str | None:
+    """
+    Writes <metrics_dir>/<command>.json and <command>.prom; returns the JSON
+    path, or None if the report could not be written.
+    """
+    report = {"command": command, **(extra or {}), **registry.to_dict()}
+    json_path = os.path.join(metrics_dir, f"{command}.json")
+    try:
+        os.makedirs(metrics_dir, exist_ok=True)
+        for path, text in (
+            (json_path, json.dumps(report, ensure_ascii=False, indent=1)),
+            (
+                os.path.join(metrics_dir, f"{command}.prom"),
+                registry.to_prometheus(),
+            ),
+        ):
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"[Warning] Could not write the metrics report: {e}", file=sys.stderr)
+        return None
+    return json_path
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    """Adds the --metrics-dir / --profile / --trace-memory options to a CLI."""
+    group = parser.add_argument_group("instrumentation")
+    group.add_argument(
+        "--metrics-dir",
+        default=METRICS_DIR,
+        help=f"Where the JSON / Prometheus metrics report goes (default: {METRICS_DIR}).",
+    )
+    group.add_argument(
+        "--profile",
+        action="store_true",
+        help="Run under cProfile; saves <command>.pstats and prints the top functions.",
+    )
+    group.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="Trace allocations with tracemalloc; the peak and top sites go to the report.",
+    )
+
+
+@contextmanager
+def instrumented(command: str, args: argparse.Namespace | None = None):
+    """
+    Runs the block as `command`: times it, optionally profiles it (see
+    add_arguments for the options read from `args`) and writes the metrics
+    report at the end, also when the block fails.
+    """
+    metrics_dir = getattr(args, "metrics_dir", METRICS_DIR)
+    profile = getattr(args, "profile", False)
+    trace_memory = getattr(args, "trace_memory", False)
+    extra = {
+        "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "argv": sys.argv[1:],
+        "python": sys.version.split()[0],
+    }
+
+    profiler = None
+    if trace_memory:
+        import tracemalloc
+
+        tracemalloc.start()
+    if profile:
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        extra["duration_seconds"] = round(time.perf_counter() - start, 6)
+        if profiler is not None:
+            profiler.disable()
+            extra["profile"] = save_profile(profiler, command, metrics_dir)
+        if trace_memory:
+            extra["memory"] = memory_summary()
+            gauge("tracemalloc_peak_bytes", extra["memory"]["peak_bytes"])
+        path = write_report(command, metrics_dir, extra)
+        if path:
+            print(f"Metrics report saved to: {path}")
+
+
+def save_profile(profiler, command: str, metrics_dir: str) -> str | None:
+    """Dumps the profile to <command>.pstats and prints its top functions."""
+    import pstats
+
+    path = os.path.join(metrics_dir, f"{command}.pstats")
+    try:
+        os.makedirs(metrics_dir, exist_ok=True)
+        profiler.dump_stats(path)
+    except OSError as e:
+        print(f"[Warning] Could not save the profile: {e}", file=sys.stderr)
+        path = None
+    print(f"\n--- Profile ({command}), top {PROFILE_TOP} by cumulative time ---")
+    pstats.Stats(profiler).sort_stats("cumulative").print_stats(PROFILE_TOP)
+    return path
+
+
+def memory_summary() -> dict:
+    """Peak traced memory and the allocation sites holding the most memory now."""
+    import tracemalloc
+
+    snapshot = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    top = snapshot.statistics("lineno")[:MEMORY_TOP]
+    return {
+        "peak_bytes": peak,
+        "top": [
+            {"site": str(stat.traceback[0]), "size_bytes": stat.size} for stat in top
+        ],
+    }
@@ -0,0 +1,312 @@
+"""
+Local stand-in for es.wikipedia.org that replays saved season pages
+(<pages_dir>/<title>.html, e.g. written by `scraper.py --save-pages` or
+`bench_pipeline.py --record`) with configurable latency, a per-response
+bandwidth cap and injected failures, so the scraper can be load-tested and
+run with no network. It runs standalone (point `--base-url` at it) or
+inside scraper.py / pipeline.py with `--replay`.
+Only uses the standard library.
+"""
+
+import argparse
+import hashlib
+import os
+import random
+import sys
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+# Bytes written between two pauses of a bandwidth-capped response.
+CHUNK_SIZE = 16 * 1024
+
+
+class FaultInjector:
+    """
+    Decides which requests fail: a share `error_rate` is answered with
+    `error_status` (and a Retry-After of `retry_after` seconds) and a share
+    `drop_rate` has its connection closed, either before any response or
+    halfway through the body. Seeded, so runs are reproducible.
+    """
+
+    def __init__(
+        self,
+        error_rate: float = 0.0,
+        drop_rate: float = 0.0,
+        error_status: int = 429,
+        retry_after: int | None = 1,
+        seed: int = 0,
+    ):
+        self.error_rate = error_rate
+        self.drop_rate = drop_rate
+        self.error_status = error_status
+        self.retry_after = retry_after
+        self.counts = {"error": 0, "drop": 0, "truncate": 0}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def pick(self) -> str | None:
+        """ "error", "drop", "truncate" or None (serve normally)."""
+        with self._lock:
+            draw = self._rng.random()
+            if draw < self.error_rate:
+                fault = "error"
+            elif draw < self.error_rate + self.drop_rate:
+                fault = self._rng.choice(("drop", "truncate"))
+            else:
+                return None
+            self.counts[fault] += 1
+            return fault
+
+
+def write_paced(wfile, body: bytes, bandwidth: float):
+    """Writes `body` in chunks, pausing so it goes out at most at `bandwidth` bytes/s."""
+    start = time.monotonic()
+    for offset in range(0, len(body), CHUNK_SIZE):
+        chunk = body[offset : offset + CHUNK_SIZE]
+        wfile.write(chunk)
+        delay = start + (offset + len(chunk)) / bandwidth - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
+def make_handler(
+    pages_dir: str,
+    latency: float,
+    faults: FaultInjector | None = None,
+    bandwidth: float = 0.0,
+    log: bool = True,
+):
+    """
+    Builds a request handler serving <pages_dir>/<title>.html for /wiki/<title>,
+    sending each body at most at `bandwidth` bytes/s (0: unlimited).
+    """
+
+    def send_body(wfile, body: bytes):
+        if bandwidth > 0:
+            write_paced(wfile, body, bandwidth)
+        else:
+            wfile.write(body)
+
+    class WikiPageHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            title = unquote(urlsplit(self.path).path.rstrip("/").rsplit("/", 1)[-1])
+            page_path = os.path.join(pages_dir, f"{title}.html")
+
+            if latency > 0:
+                time.sleep(latency)
+
+            fault = faults.pick() if faults is not None else None
+            if fault == "drop":
+                self.close_connection = True
+                return
+            if fault == "error":
+                self.send_response(faults.error_status)
+                if faults.retry_after is not None:
+                    self.send_header("Retry-After", str(faults.retry_after))
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+
+            if not title or not os.path.isfile(page_path):
+                self.send_error(404, f"No saved page for '{title}'")
+                return
+
+            with open(page_path, "rb") as f:
+                body = f.read()
+            etag = f'"{hashlib.sha1(body).hexdigest()}"'
+
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=UTF-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", etag)
+            self.send_header(
+                "Last-Modified",
+                formatdate(os.path.getmtime(page_path), usegmt=True),
+            )
+            self.end_headers()
+            if fault == "truncate":
+                send_body(self.wfile, body[: len(body) // 2])
+                self.close_connection = True
+                return
+            send_body(self.wfile, body)
+
+        def log_message(self, format, *args):
+            if log:
+                print(f"  [mock] {self.address_string()} {format % args}")
+
+    return WikiPageHandler
+
+
+def start_server(
+    pages_dir: str,
+    host: str = "127.0.0.1",
+    port: int = 0,
+    latency: float = 0.0,
+    faults: FaultInjector | None = None,
+    bandwidth: float = 0.0,
+    log: bool = True,
+) -> ThreadingHTTPServer:
+    """
+    Creates a threaded local stand-in for es.wikipedia.org.
+    Use port 0 to pick a free port; the bound address is in `server.server_address`.
+    `faults` makes some requests fail (see FaultInjector) and `bandwidth`
+    caps the bytes/s of each response.
+    """
+    handler = make_handler(pages_dir, latency, faults, bandwidth, log)
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def add_replay_arguments(parser: argparse.ArgumentParser):
+    """Adds --replay and the options of its server to a CLI (see start_replay)."""
+    group = parser.add_argument_group("offline replay (see mock_server.py)")
+    group.add_argument(
+        "--replay",
+        metavar="DIR",
+        help="Fetch the season pages from a local server replaying DIR/<title>.html "
+        "(e.g. saved with --save-pages) instead of Wikipedia; the page cache and "
+        "the retry queue are not used.",
+    )
+    group.add_argument(
+        "--replay-latency",
+        type=float,
+        default=0.0,
+        help="Delay in seconds before every replayed response.",
+    )
+    group.add_argument(
+        "--replay-bandwidth",
+        type=float,
+        default=0.0,
+        help="Maximum KiB/s of every replayed response (default: unlimited).",
+    )
+    group.add_argument(
+        "--replay-error-rate",
+        type=float,
+        default=0.0,
+        help="Share of replayed requests answered with a 429.",
+    )
+    group.add_argument(
+        "--replay-drop-rate",
+        type=float,
+        default=0.0,
+        help="Share of replayed requests whose connection is dropped.",
+    )
+
+
+def start_replay(args: argparse.Namespace) -> tuple[ThreadingHTTPServer, str]:
+    """
+    Serves `args.replay` in a background thread with the --replay-* options
+    (see add_replay_arguments); returns the server and its wiki root URL.
+    Exits with an error if the directory does not exist.
+    """
+    if not os.path.isdir(args.replay):
+        print(f"[Error] Pages directory not found: {args.replay}", file=sys.stderr)
+        sys.exit(1)
+    faults = None
+    if args.replay_error_rate or args.replay_drop_rate:
+        faults = FaultInjector(args.replay_error_rate, args.replay_drop_rate)
+    server = start_server(
+        args.replay,
+        latency=args.replay_latency,
+        faults=faults,
+        bandwidth=args.replay_bandwidth * 1024,
+        log=False,
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}/wiki/"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Serves saved Wikipedia season pages locally (for scraper testing)."
+    )
+    parser.add_argument(
+        "pages_dir",
+        nargs="?",
+        default=os.path.join("data", "pages"),
+        help="Directory with <title>.html files (default: data/pages).",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="Artificial delay in seconds before every response.",
+    )
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0.0,
+        help="Share of requests answered with --error-status instead of the page.",
+    )
+    parser.add_argument(
+        "--error-status",
+        type=int,
+        default=429,
+        help="Status of the injected errors (default: 429).",
+    )
+    parser.add_argument(
+        "--retry-after",
+        type=int,
+        default=1,
+        help="Retry-After seconds sent with injected errors (default: 1).",
+    )
+    parser.add_argument(
+        "--drop-rate",
+        type=float,
+        default=0.0,
+        help="Share of requests whose connection is dropped (before or mid-body).",
+    )
+    parser.add_argument(
+        "--bandwidth",
+        type=float,
+        default=0.0,
+        help="Maximum KiB/s of every response (default: unlimited).",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the faults.")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.pages_dir):
+        print(f"[Error] Pages directory not found: {args.pages_dir}", file=sys.stderr)
+        sys.exit(1)
+
+    faults = None
+    if args.error_rate or args.drop_rate:
+        faults = FaultInjector(
+            args.error_rate,
+            args.drop_rate,
+            args.error_status,
+            args.retry_after,
+            args.seed,
+        )
+    server = start_server(
+        args.pages_dir,
+        args.host,
+        args.port,
+        args.latency,
+        faults,
+        args.bandwidth * 1024,
+    )
+    host, port = server.server_address[:2]
+    print(f"--- Serving {args.pages_dir} at http://{host}:{port}/wiki/ ---")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
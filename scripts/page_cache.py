@@ -0,0 +1,168 @@
+import gzip
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from datetime import date
+
+CACHE_DIR = os.path.join("data", "cache", "pages")
+CURRENT_SEASON_TTL = 6 * 60 * 60  # seconds
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def season_ttl(year: int, current_year: int | None = None) -> float | None:
+    """
+    Freshness lifetime for a season page: short while the season can still
+    change, None (never expires) once it is finished.
+    """
+    current_year = current_year or date.today().year
+    if year >= current_year:
+        return CURRENT_SEASON_TTL
+    return None
+
+
+class PageCache:
+    """
+    Persistent, content-addressed cache of downloaded pages.
+
+    Bodies are stored gzip-compressed as objects/<sha[:2]>/<sha>.html.gz and
+    shared by every URL with the same content. index.json maps each URL to
+    its object hash plus the ETag / Last-Modified validators used for
+    conditional GETs. Thread-safe; call save() to persist the index.
+    """
+
+    def __init__(self, cache_dir: str = CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(cache_dir, "index.json")
+        self.stats = {"fresh": 0, "revalidated": 0, "downloaded": 0, "stale": 0}
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict] = self._load_index()
+
+    def _load_index(self) -> dict:
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (json.JSONDecodeError, OSError) as e:
+            print(
+                f"  [Warning] Ignoring unreadable page cache index {self.index_path}: {e}",
+                file=sys.stderr,
+            )
+            return {}
+
+    def _object_path(self, sha: str) -> str:
+        return os.path.join(self.cache_dir, "objects", sha[:2], f"{sha}.html.gz")
+
+    def is_fresh(self, url: str, ttl: float | None) -> bool:
+        """True if the cached copy of `url` may be used without contacting the server."""
+        with self._lock:
+            entry = self._entries.get(url)
+        if entry is None or not os.path.exists(self._object_path(entry["sha256"])):
+            return False
+        return ttl is None or time.time() - entry["fetched_at"] < ttl
+
+    def validators(self, url: str) -> dict:
+        """Conditional GET headers for `url` (empty if nothing usable is cached)."""
+        with self._lock:
+            entry = self._entries.get(url)
+        if entry is None or not os.path.exists(self._object_path(entry["sha256"])):
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def read(self, url: str) -> bytes | None:
+        """Returns the cached body of `url`, or None if it is not cached."""
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None:
+                return None
+            entry["accessed_at"] = time.time()
+        try:
+            with gzip.open(self._object_path(entry["sha256"]), "rb") as f:
+                return f.read()
+        except (OSError, EOFError):
+            return None
+
+    def count(self, outcome: str):
+        """Records a fetch outcome ("fresh", "revalidated", "downloaded" or "stale")."""
+        with self._lock:
+            self.stats[outcome] += 1
+
+    def revalidated(self, url: str):
+        """Marks the cached copy of `url` as confirmed current (HTTP 304)."""
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                entry["fetched_at"] = entry["accessed_at"] = time.time()
+
+    def store(
+        self,
+        url: str,
+        body: bytes,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> str:
+        """Adds or replaces the cached body of `url`; returns its content hash."""
+        sha = hashlib.sha256(body).hexdigest()
+        path = self._object_path(sha)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with gzip.open(tmp_path, "wb") as f:
+                f.write(body)
+            os.replace(tmp_path, path)
+
+        now = time.time()
+        with self._lock:
+            self._entries[url] = {
+                "sha256": sha,
+                "etag": etag,
+                "last_modified": last_modified,
+                "fetched_at": now,
+                "accessed_at": now,
+                "size": os.path.getsize(path),
+            }
+        return sha
+
+    def evict(self):
+        """Drops least recently used pages until the cache fits in `max_bytes`."""
+        with self._lock:
+            sizes = {e["sha256"]: e["size"] for e in self._entries.values()}
+            total = sum(sizes.values())
+            if total <= self.max_bytes:
+                return
+
+            by_age = sorted(self._entries.items(), key=lambda kv: kv[1]["accessed_at"])
+            for url, entry in by_age:
+                if total <= self.max_bytes:
+                    break
+                del self._entries[url]
+                sha = entry["sha256"]
+                if any(e["sha256"] == sha for e in self._entries.values()):
+                    continue
+                total -= sizes[sha]
+                try:
+                    os.remove(self._object_path(sha))
+                except OSError:
+                    pass
+
+    def save(self):
+        """Writes the index to disk atomically."""
+        with self._lock:
+            snapshot = json.dumps(self._entries, indent=1)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{self.index_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(snapshot)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            print(f"  [Warning] Could not save page cache index: {e}", file=sys.stderr)
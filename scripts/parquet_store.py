@@ -0,0 +1,162 @@
+"""
+Typed, columnar copy of the analysis datasets: a Parquet dataset partitioned
+as <root>/tournament=<name>/year=<year>/part-0.parquet, with integer goal and
+altitude columns and dictionary-encoded text columns.
+Requires the optional pyarrow package (pip install pyarrow).
+"""
+
+import argparse
+import os
+import pandas as pd
+import shutil
+import sys
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+except ImportError:
+    pa = ds = None
+
+PARQUET_DIR = os.path.join("data", "processed", "parquet")
+
+# Column -> Arrow type name, in the analysis CSV order.
+COLUMN_TYPES = {
+    "phase": "dictionary",
+    "date": "string",
+    "home_team": "dictionary",
+    "home_city": "dictionary",
+    "home_altitude_meters": "int32",
+    "away_team": "dictionary",
+    "away_city": "dictionary",
+    "away_altitude_meters": "int32",
+    "altitude_difference": "int32",
+    "travel_distance_km": "int32",
+    "home_goals": "int16",
+    "away_goals": "int16",
+    "score_raw": "string",
+    "stadium": "dictionary",
+}
+
+
+def pyarrow_missing() -> bool:
+    """Prints an error and returns True when pyarrow is not installed."""
+    if pa is None:
+        print(
+            "[Error] Parquet output needs pyarrow (pip install pyarrow).",
+            file=sys.stderr,
+        )
+        return True
+    return False
+
+
+def partitioning():
+    return ds.partitioning(
+        pa.schema([("tournament", pa.string()), ("year", pa.int16())]),
+        flavor="hive",
+    )
+
+
+def to_table(df, tournament: str):
+    """
+    Converts an analysis DataFrame (as written to the CSV, or read back from
+    it as strings) into a typed Arrow table. Goals that are not numbers
+    become nulls; non-integer altitudes raise ValueError.
+    """
+    arrays = {
+        "tournament": pa.array([tournament] * len(df), pa.string()),
+        "year": pa.array(
+            pd.to_numeric(df["year"], errors="coerce").astype("Int16"), pa.int16()
+        ),
+    }
+    for column, kind in COLUMN_TYPES.items():
+        values = df[column]
+        if kind in ("int16", "int32"):
+            numbers = pd.to_numeric(values, errors="coerce")
+            try:
+                values = numbers.astype("Int16" if kind == "int16" else "Int32")
+            except TypeError as e:
+                raise ValueError(f"Column {column} is not integral: {e}") from e
+            arrays[column] = pa.array(values, getattr(pa, kind)())
+            continue
+        # Empty strings are what a CSV round trip leaves of missing values.
+        values = values.astype(object)
+        present = values.notna() & (values != "")
+        text = pa.array(values.where(present, None), pa.string())
+        arrays[column] = text.dictionary_encode() if kind == "dictionary" else text
+    return pa.table(arrays)
+
+
+def write_parquet(df, tournament: str, root: str = PARQUET_DIR) -> bool:
+    """
+    Replaces the partitions of `tournament` under `root` with the rows of
+    `df`, one file per year. Returns False if nothing could be written.
+    """
+    if pyarrow_missing():
+        return False
+    try:
+        table = to_table(df, tournament)
+    except ValueError as e:
+        print(f"[Error] Could not build the Parquet table: {e}", file=sys.stderr)
+        return False
+
+    try:
+        shutil.rmtree(
+            os.path.join(root, f"tournament={tournament}"), ignore_errors=True
+        )
+        ds.write_dataset(
+            table,
+            root,
+            format="parquet",
+            partitioning=partitioning(),
+            basename_template="part-{i}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+        )
+    except (OSError, pa.ArrowException) as e:
+        print(f"Error writing Parquet dataset {root}: {e}", file=sys.stderr)
+        return False
+    return True
+
+
+def load_analysis(
+    root: str = PARQUET_DIR,
+    columns: list[str] | None = None,
+    years: list[int] | None = None,
+    tournaments: list[str] | None = None,
+):
+    """
+    Loads the Parquet analysis dataset as a DataFrame. Only the requested
+    `columns` are read, and only from the partitions of the requested
+    `years` and `tournaments` (all of them when None).
+    """
+    if pa is None:
+        raise ImportError("load_analysis needs pyarrow (pip install pyarrow)")
+
+    dataset = ds.dataset(root, format="parquet", partitioning=partitioning())
+    condition = None
+    if years is not None:
+        condition = ds.field("year").isin(list(years))
+    if tournaments is not None:
+        in_tournaments = ds.field("tournament").isin(list(tournaments))
+        condition = in_tournaments if condition is None else condition & in_tournaments
+    return dataset.to_table(columns=columns, filter=condition).to_pandas()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Reads a slice of the Parquet analysis dataset."
+    )
+    parser.add_argument("root", nargs="?", default=PARQUET_DIR)
+    parser.add_argument("--columns", nargs="+", help="Columns to read (default: all).")
+    parser.add_argument("--years", nargs="+", type=int, help="Years to read.")
+    parser.add_argument("--tournaments", nargs="+", help="Tournaments to read.")
+    args = parser.parse_args()
+
+    if pyarrow_missing():
+        sys.exit(1)
+    if not os.path.isdir(args.root):
+        print(f"[Error] Dataset not found: {args.root}", file=sys.stderr)
+        sys.exit(1)
+
+    df = load_analysis(args.root, args.columns, args.years, args.tournaments)
+    print(df)
+    print(f"\n{len(df)} rows.")
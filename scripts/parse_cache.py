@@ -0,0 +1,106 @@
+"""
+Persistent cache of parsed season pages. A page whose bytes were parsed
+before, by the same PARSER_VERSION and parser options, is not parsed again:
+its match records are read back from data/cache/parsed/.
+
+Records are stored with the team names as found on the page, before they
+are normalized (see scraper.parse_records), so a change to the alias table
+or the city mapping only re-normalizes cached records.
+"""
+
+import gzip
+import json
+import os
+import sys
+import threading
+from manifest import sha256_bytes
+
+PARSE_CACHE_DIR = os.path.join("data", "cache", "parsed")
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+
+def parse_key(page_sha256: str, parser_version: int, *options: str) -> str:
+    """
+    Cache key of a page parsed by a given parser version and options
+    (backend, group and knockout parser; see scraper.parse_season).
+    """
+    return sha256_bytes(":".join((page_sha256, str(parser_version), *options)).encode())
+
+
+class ParseCache:
+    """
+    Parse results as objects/<key[:2]>/<key>.json.gz, each holding the
+    (group_matches, knockout_matches) records of one page. Thread-safe;
+    reading an entry marks it as recently used for evict().
+    """
+
+    def __init__(
+        self, cache_dir: str = PARSE_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES
+    ):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.stats = {"hit": 0, "miss": 0, "stored": 0}
+        self._lock = threading.Lock()
+
+    def _object_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, "objects", key[:2], f"{key}.json.gz")
+
+    def _count(self, outcome: str):
+        with self._lock:
+            self.stats[outcome] += 1
+
+    def get(self, key: str) -> tuple[list[tuple], list[tuple]] | None:
+        """The cached records of `key`, or None if they are not cached."""
+        path = self._object_path(key)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                group_records, knockout_records = json.load(f)
+            os.utime(path)
+        except FileNotFoundError:
+            self._count("miss")
+            return None
+        except (OSError, EOFError, ValueError) as e:
+            print(
+                f"  [Warning] Ignoring unreadable parse cache entry {path}: {e}",
+                file=sys.stderr,
+            )
+            self._count("miss")
+            return None
+        self._count("hit")
+        return list(map(tuple, group_records)), list(map(tuple, knockout_records))
+
+    def put(self, key: str, records: tuple[list[tuple], list[tuple]]):
+        """Stores the records parsed from a page."""
+        path = self._object_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+                json.dump(records, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"  [Warning] Could not cache parse result: {e}", file=sys.stderr)
+            return
+        self._count("stored")
+
+    def evict(self):
+        """Drops least recently used entries until the cache fits in `max_bytes`."""
+        entries = []
+        objects_dir = os.path.join(self.cache_dir, "objects")
+        for root, _, files in os.walk(objects_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
@@ -0,0 +1,242 @@
+"""
+Runs the whole workflow (scrape -> team lists -> altitude processing ->
+altitude-effect aggregates) for any set of tournaments in a single process.
+Tournaments come from the registry in tournaments.py. Matches scraped in
+this run are handed to the later stages in memory instead of being re-read
+from data/raw/. Stage modules are imported only when their stage runs, so
+`--help` and team-list-only runs do not load pandas, requests or pyquery.
+
+    python3 scripts/pipeline.py                         # every stage and tournament
+    python3 scripts/pipeline.py libertadores --stages teams,process
+"""
+
+import argparse
+import metrics
+import os
+import time
+from contextlib import contextmanager
+from mock_server import add_replay_arguments, start_replay
+from tournaments import REGISTRY, Tournament, get_tournament, parse_years, with_years
+
+STAGES = ("scrape", "teams", "process", "aggregate")
+CITY_MAP_PATH = os.path.join("data", "mappings", "city_mappings.json")
+
+
+class StageTimer:
+    """
+    Wall-clock time of each stage, in the order they ran; each one is also
+    observed as the "stage" timer of the metrics report.
+    """
+
+    def __init__(self):
+        self.seconds: dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        print(f"\n=== {name} ===")
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[name] = time.perf_counter() - start
+            metrics.observe("stage", self.seconds[name], stage=name)
+            print(f"=== {name} finished in {self.seconds[name]:.2f}s ===")
+
+    def report(self):
+        total = sum(self.seconds.values())
+        print("\n--- Stage timings ---")
+        for name, seconds in self.seconds.items():
+            share = seconds / total if total else 0
+            print(f"  {name:<28} {seconds:8.2f}s {share:6.1%}")
+        print(f"  {'total':<28} {total:8.2f}s")
+
+
+def scrape_stage(tournaments: list[Tournament], args) -> dict:
+    """
+    Scrapes every tournament at once; returns {tournament: {year: matches}}.
+    With --replay, the pages come from a local server replaying saved pages.
+    """
+    from page_cache import PageCache
+    from parse_cache import ParseCache
+    from scraper import (
+        DEFAULT_MAX_WORKERS,
+        WIKI_URL,
+        Fetcher,
+        create_session,
+        print_fetch_summary,
+        scrape_tournaments,
+    )
+
+    options = {"max_workers": args.workers, "parse_workers": args.parse_workers}
+    base_url = args.base_url or WIKI_URL
+    server = None
+    if args.replay:
+        server, base_url = start_replay(args)
+        print(f"--- Replaying {args.replay} at {base_url} ---")
+        options["fetcher"] = Fetcher(
+            create_session(args.workers or DEFAULT_MAX_WORKERS)
+        )
+    start = time.perf_counter()
+    try:
+        return scrape_tournaments(
+            with_years(tournaments, args.years),
+            base_url,
+            cache=None if args.no_cache or server else PageCache(),
+            parse_cache=None if args.no_cache or server else ParseCache(),
+            refresh=args.refresh,
+            incremental=args.incremental,
+            **{key: value for key, value in options.items() if value is not None},
+        )
+    finally:
+        print_fetch_summary(time.perf_counter() - start)
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+
+def teams_stage(tournament: Tournament, seasons: dict | None):
+    from generate_teams import generate_unique_teams
+
+    matches = None
+    if seasons is not None:
+        matches = (match for season in seasons.values() for match in season)
+    generate_unique_teams(tournament.raw_path, tournament.teams_path, matches)
+
+
+def process_stage(tournament: Tournament, seasons: dict | None, args):
+    from process_altitude import process_data
+
+    parquet_dir = args.parquet
+    if parquet_dir is True:
+        from parquet_store import PARQUET_DIR
+
+        parquet_dir = PARQUET_DIR
+    sqlite_path = args.sqlite
+    if sqlite_path is True:
+        from warehouse import WAREHOUSE_PATH
+
+        sqlite_path = WAREHOUSE_PATH
+    raw_seasons = None
+    if seasons is not None:
+        raw_seasons = (
+            (year, [match._asdict() for match in season])
+            for year, season in seasons.items()
+        )
+    process_data(
+        tournament.raw_path,
+        CITY_MAP_PATH,
+        tournament.analysis_path,
+        incremental=args.incremental,
+        parquet_dir=parquet_dir,
+        tournament=tournament.name,
+        raw_seasons=raw_seasons,
+        sqlite_path=sqlite_path,
+    )
+
+
+def aggregate_stage(tournament: Tournament):
+    from aggregates import materialize_aggregates
+
+    materialize_aggregates(tournament.analysis_path, CITY_MAP_PATH, tournament.name)
+
+
+def run_pipeline(tournaments: list[Tournament], stages: list[str], args) -> StageTimer:
+    """
+    Runs `stages` (in STAGES order) for `tournaments`. Stages that run
+    without the scrape stage read the raw files left by a previous run.
+    """
+    timer = StageTimer()
+    scraped = {}
+    if "scrape" in stages:
+        with timer.stage("scrape"):
+            scraped = scrape_stage(tournaments, args)
+    for tournament in tournaments:
+        name = tournament.name
+        seasons = scraped.get(name)
+        with metrics.scope(tournament=name):
+            if "teams" in stages:
+                with timer.stage(f"teams[{name}]"):
+                    teams_stage(tournament, seasons)
+            if "process" in stages:
+                with timer.stage(f"process[{name}]"):
+                    process_stage(tournament, seasons, args)
+            if "aggregate" in stages:
+                with timer.stage(f"aggregate[{name}]"):
+                    aggregate_stage(tournament)
+    return timer
+
+
+def parse_stages(value: str) -> list[str]:
+    stages = [s.strip() for s in value.split(",") if s.strip()]
+    unknown = [s for s in stages if s not in STAGES]
+    if unknown or not stages:
+        raise argparse.ArgumentTypeError(
+            f"unknown stage(s) {', '.join(unknown) or '(none)'}; "
+            f"choose from {', '.join(STAGES)}"
+        )
+    return stages
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Runs the scrape, team list, altitude processing and aggregate "
+        "stages in one process."
+    )
+    parser.add_argument(
+        "tournaments",
+        nargs="*",
+        metavar="tournament",
+        help=f"Any of: {', '.join(REGISTRY)} (default: all).",
+    )
+    parser.add_argument(
+        "--stages",
+        type=parse_stages,
+        default=list(STAGES),
+        help=f"Comma-separated stages to run (default: {','.join(STAGES)}).",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only re-scrape / re-process seasons whose inputs changed.",
+    )
+    parser.add_argument(
+        "--parquet",
+        nargs="?",
+        const=True,
+        metavar="DIR",
+        help="Also write a typed Parquet dataset (default DIR: data/processed/parquet).",
+    )
+    parser.add_argument(
+        "--sqlite",
+        nargs="?",
+        const=True,
+        metavar="DB",
+        help="Also upsert the rows into a SQLite warehouse "
+        "(default DB: data/processed/matches.sqlite).",
+    )
+    scraping = parser.add_argument_group("scrape stage (see scraper.py)")
+    scraping.add_argument("--workers", type=int, help="Concurrent page downloads.")
+    scraping.add_argument("--parse-workers", type=int, help="Parse processes.")
+    scraping.add_argument("--base-url", help="Wiki root to fetch season pages from.")
+    scraping.add_argument(
+        "--years",
+        type=parse_years,
+        metavar="FIRST-LAST",
+        help="Seasons to scrape instead of each tournament's registered range.",
+    )
+    scraping.add_argument(
+        "--no-cache", action="store_true", help="Bypass the page and parse caches."
+    )
+    scraping.add_argument(
+        "--refresh", action="store_true", help="Revalidate every cached page."
+    )
+    add_replay_arguments(parser)
+    metrics.add_arguments(parser)
+    args = parser.parse_args()
+
+    tournaments = [get_tournament(t) for t in args.tournaments] or list(
+        REGISTRY.values()
+    )
+    stages = [stage for stage in STAGES if stage in args.stages]
+    with metrics.instrumented("pipeline", args):
+        run_pipeline(tournaments, stages, args).report()
@@ -1,83 +1,94 @@
-import json
+import argparse
+import csv
+import metrics
 import os
-import pandas as pd
 import sys
+from raw_matches import SeasonsNotGrouped, iter_seasons, load_matches
+from team_names import ALIASES_PATH, TeamNormalizer, load_aliases, print_approximate
+from tournaments import REGISTRY, get_tournament
+from warehouse import WAREHOUSE_PATH, write_warehouse
+from manifest import (
+    group_by_year,
+    load_manifest,
+    manifest_path,
+    save_manifest,
+    sha256_bytes,
+    sha256_json,
+)
 
+# numpy, and match_table, match_index and city_index that load it, are only
+# imported by the functions that enrich seasons, so --help and an
+# incremental run with nothing to do start without them.
 
-def load_city_mappings(filepath: str) -> dict:
-    """Helper function to load the city-based JSON mapping file."""
-    try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except FileNotFoundError:
-        print(f"[Error] Mapping file not found at: {filepath}", file=sys.stderr)
-        sys.exit(1)
-    except json.JSONDecodeError:
-        print(f"[Error] Failed to decode JSON from: {filepath}", file=sys.stderr)
-        sys.exit(1)
-
-
-def build_reverse_team_map(city_mappings: dict) -> dict:
-    """Inverts the city map to create a fast team-lookup map."""
-    team_lookup = {}
-    malformed_cities = []
-
-    for city, data in city_mappings.items():
-        try:
-            altitude = data["altitude"]
-            teams = data["teams"]
-            if not isinstance(teams, list):
-                malformed_cities.append(f"{city} (la llave 'teams' no es una lista)")
-                continue
-            for team in teams:
-                team_lookup[team] = {"city": city, "altitude": altitude}
-        except KeyError:
-            malformed_cities.append(f"{city} (faltan llaves 'altitude' o 'teams')")
-        except Exception as e:
-            malformed_cities.append(f"{city} (error: {e})")
-
-    if malformed_cities:
-        print(
-            "\n[Warning] Se encontraron ciudades con formato incorrecto en 'city_mappings.json':"
-        )
-        for city_error in malformed_cities:
-            print(f"  - {city_error}")
+# Bump whenever the processed columns or their computation change.
+PROCESSOR_VERSION = 3
 
-    return team_lookup
+# Output column -> raw match key, for the columns copied as they are.
+RAW_COLUMNS = {
+    "year": "year",
+    "phase": "phase",
+    "date": "date",
+    "home_goals": "home_goals",
+    "away_goals": "away_goals",
+    "score_raw": "score",
+    "stadium": "stadium",
+}
+OUTPUT_COLUMNS = [
+    "year",
+    "phase",
+    "date",
+    "home_team",
+    "home_city",
+    "home_altitude_meters",
+    "away_team",
+    "away_city",
+    "away_altitude_meters",
+    "altitude_difference",
+    "travel_distance_km",
+    "home_goals",
+    "away_goals",
+    "score_raw",
+    "stadium",
+]
+RAW_FIELDS = ("home_team", "away_team", *RAW_COLUMNS.values())
+INT_COLUMNS = ("year", "travel_distance_km", "home_goals", "away_goals")
+# String column -> pool its values are interned in while processing: the raw
+# fields share the pools of the raw MatchTable (see match_table.STRING_FIELDS).
+COLUMN_POOLS = {
+    "phase": "phase",
+    "date": "date",
+    "home_team": "canonical_team",
+    "home_city": "city",
+    "away_team": "canonical_team",
+    "away_city": "city",
+    "score_raw": "score",
+    "stadium": "stadium",
+}
 
 
-def process_data(raw_json_path: str, city_map_path: str, output_csv_path: str):
+def enrich_matches(
+    matches: list[dict],
+    team_lookup: dict,
+    missing_teams: set,
+    normalizer: TeamNormalizer | None = None,
+) -> list[dict]:
     """
-    Reads raw match data and the single mapping file to create the final
-    processed CSV with altitude calculations.
+    Adds city and altitude data to each match. Matches with a team missing
+    from `team_lookup` are skipped and the team is added to `missing_teams`.
+    With a `normalizer`, team names are first resolved to canonical ones.
     """
-    city_mappings = load_city_mappings(city_map_path)
-
-    try:
-        with open(raw_json_path, "r", encoding="utf-8") as f:
-            matches = json.load(f)
-    except FileNotFoundError:
-        print(f"[Error] Raw data file not found: {raw_json_path}", file=sys.stderr)
-        return
-
-    if not city_mappings:
-        print("[Error] Aborting due to missing city mapping file.", file=sys.stderr)
-        return
-
-    team_lookup = build_reverse_team_map(city_mappings)
-    print(f"Loaded {len(matches)} raw matches.")
-    print(
-        f"Loaded {len(city_mappings)} cities and created lookup map for {len(team_lookup)} teams."
-    )
+    from city_index import travel_distance
 
     processed_data = []
-    missing_teams = set()
 
     for match in matches:
         home_team = match.get("home_team")
         away_team = match.get("away_team")
         if not home_team or not away_team:
             continue
+        if normalizer:
+            home_team = normalizer.normalize(home_team)
+            away_team = normalizer.normalize(away_team)
 
         home_mapping = team_lookup.get(home_team)
         away_mapping = team_lookup.get(away_team)
@@ -107,6 +118,7 @@ def process_data(raw_json_path: str, city_map_path: str, output_csv_path: str):
                 "away_city": away_city,
                 "away_altitude_meters": away_altitude,
                 "altitude_difference": altitude_difference,
+                "travel_distance_km": travel_distance(home_mapping, away_mapping),
                 "home_goals": match.get("home_goals"),
                 "away_goals": match.get("away_goals"),
                 "score_raw": match.get("score"),
@@ -114,6 +126,450 @@ def process_data(raw_json_path: str, city_map_path: str, output_csv_path: str):
             }
         )
 
+    return processed_data
+
+
+def build_team_table(index: "CityIndex", city_pool: "StringPool") -> tuple:
+    """
+    ({team: position}, city id of each team, city code of each city id) of a
+    compiled city index.
+    """
+    import numpy as np
+
+    teams = {team: i for i, team in enumerate(index.teams)}
+    city_codes = city_pool.codes(index.cities)
+    return teams, np.asarray(index.team_city), city_codes
+
+
+def resolve_teams(
+    codes: "np.ndarray",
+    raw_pool: "StringPool",
+    teams: dict[str, int],
+    team_pool: "StringPool",
+    normalizer: TeamNormalizer | None,
+) -> "tuple[np.ndarray, np.ndarray]":
+    """
+    Codes of the canonical names in `team_pool` and positions in `teams`
+    (-1 if absent) of raw team codes, resolving each distinct name once.
+    """
+    import numpy as np
+
+    distinct = np.unique(codes[codes >= 0])
+    names = raw_pool.lookup(distinct).tolist()
+    if normalizer is not None:
+        names = [normalizer.normalize(n) if isinstance(n, str) else n for n in names]
+    # One extra slot, so that code -1 (no name) maps to -1.
+    canonical = np.full(len(raw_pool) + 1, -1, dtype=np.int32)
+    positions = np.full(len(raw_pool) + 1, -1, dtype=np.intp)
+    canonical[distinct] = team_pool.codes(names)
+    positions[distinct] = [teams.get(name, -1) for name in names]
+    return canonical[codes], positions[codes]
+
+
+def enrich_columns(
+    season: "MatchTable",
+    index: "CityIndex",
+    team_table: tuple,
+    pools: "dict[str, StringPool]",
+    normalizer: TeamNormalizer | None = None,
+) -> tuple:
+    """
+    Vectorized counterpart of enrich_matches over a MatchTable of RAW_FIELDS:
+    resolves every team at once against `team_table` (see build_team_table)
+    and takes altitudes, altitude differences and travel distances from the
+    arrays of `index` by city id, so the CSV is the same as with
+    enrich_matches.
+    Returns (columns, keep, home_missing, away_missing): the output columns
+    of the kept matches (string codes into `pools`, (values, missing) pairs
+    for INT_COLUMNS, numbers otherwise), and boolean masks over the season
+    of the kept matches and of those with an unmapped home/away team.
+    """
+    import numpy as np
+    from city_index import NO_DISTANCE
+
+    raw_team_pool = season.pool("home_team")
+    home_codes = season.column("home_team")
+    away_codes = season.column("away_team")
+    valid = (home_codes >= 0) & (away_codes >= 0)
+    empty = raw_team_pool.index.get("")
+    if empty is not None:
+        valid &= (home_codes != empty) & (away_codes != empty)
+
+    teams, team_city, city_codes = team_table
+    home, home_idx = resolve_teams(
+        home_codes, raw_team_pool, teams, pools["canonical_team"], normalizer
+    )
+    away, away_idx = resolve_teams(
+        away_codes, raw_team_pool, teams, pools["canonical_team"], normalizer
+    )
+
+    home_missing = valid & (home_idx < 0)
+    away_missing = valid & (away_idx < 0)
+    keep = valid & ~home_missing & ~away_missing
+
+    kept = np.flatnonzero(keep)
+    home_city = team_city[home_idx[kept]]
+    away_city = team_city[away_idx[kept]]
+    distance = index.distance_km[home_city, away_city]
+
+    columns = {
+        "home_team": home[kept],
+        "home_city": city_codes[home_city],
+        "home_altitude_meters": index.altitudes[home_city],
+        "away_team": away[kept],
+        "away_city": city_codes[away_city],
+        "away_altitude_meters": index.altitudes[away_city],
+        "altitude_difference": index.altitude_difference[home_city, away_city],
+        "travel_distance_km": (distance, distance == NO_DISTANCE),
+    }
+    for column, field in RAW_COLUMNS.items():
+        if column in INT_COLUMNS:
+            columns[column] = (season.column(field)[kept], season.missing(field)[kept])
+        else:
+            columns[column] = season.column(field)[kept]
+
+    return (
+        {column: columns[column] for column in OUTPUT_COLUMNS},
+        keep,
+        home_missing,
+        away_missing,
+    )
+
+
+def reused_columns(rows: list[dict], pools: "dict[str, StringPool]") -> dict:
+    """Output columns, as in enrich_columns, of rows read back from the CSV."""
+    import numpy as np
+    from match_table import int_column
+
+    columns = {}
+    for column in OUTPUT_COLUMNS:
+        values = [row.get(column) for row in rows]
+        if column in INT_COLUMNS:
+            values, missing = int_column(values)
+            if missing is None:
+                missing = np.zeros(len(values), dtype=bool)
+            columns[column] = (values, missing)
+        elif column in COLUMN_POOLS:
+            columns[column] = pools[COLUMN_POOLS[column]].codes(values)
+        else:
+            columns[column] = number_column(values)
+    return columns
+
+
+def number_column(values: list[str]) -> "np.ndarray":
+    """int64 array of numbers read from the CSV, or float64 if one is not whole."""
+    import numpy as np
+
+    try:
+        return np.array(values, dtype=np.int64)
+    except ValueError:
+        return np.array(values, dtype=np.float64)
+
+
+def analysis_rows(parts: list[dict], pools: "dict[str, StringPool]"):
+    """
+    Rows (tuples in OUTPUT_COLUMNS order, None for missing values) of the
+    concatenated season columns, converted to Python values a season at a time.
+    """
+    # A code of -1 (no value) picks the None at the end.
+    strings = {name: pool.values + [None] for name, pool in pools.items()}
+    for part in parts:
+        columns = []
+        for column in OUTPUT_COLUMNS:
+            if column in INT_COLUMNS:
+                values, missing = part[column]
+                columns.append(
+                    [
+                        None if m else v
+                        for v, m in zip(values.tolist(), missing.tolist())
+                    ]
+                )
+            elif column in COLUMN_POOLS:
+                lookup = strings[COLUMN_POOLS[column]].__getitem__
+                columns.append(list(map(lookup, part[column].tolist())))
+            else:
+                columns.append(part[column].tolist())
+        yield from zip(*columns)
+
+
+def write_analysis_csv(path: str, parts: list[dict], pools: "dict[str, StringPool]"):
+    """
+    Writes the analysis CSV with the csv module: the same file that
+    DataFrame.to_csv(index=False, encoding="utf-8-sig") writes, without
+    building a DataFrame (or importing pandas).
+    """
+    with open(path, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(OUTPUT_COLUMNS)
+        writer.writerows(analysis_rows(parts, pools))
+
+
+def analysis_frame(parts: list[dict], pools: "dict[str, StringPool]"):
+    """
+    DataFrame of the concatenated season columns, built on their arrays:
+    string columns become categoricals over their pool and INT_COLUMNS
+    nullable Int32 arrays.
+    """
+    import numpy as np
+    import pandas as pd
+
+    if not parts:
+        return pd.DataFrame(columns=OUTPUT_COLUMNS)
+    data = {}
+    for column in OUTPUT_COLUMNS:
+        arrays = [part[column] for part in parts]
+        if column in INT_COLUMNS:
+            data[column] = pd.arrays.IntegerArray(
+                np.concatenate([values for values, _ in arrays]),
+                np.concatenate([missing for _, missing in arrays]),
+            )
+        elif column in COLUMN_POOLS:
+            data[column] = pd.Categorical.from_codes(
+                np.concatenate(arrays), categories=pools[COLUMN_POOLS[column]].values
+            )
+        else:
+            data[column] = np.concatenate(arrays)
+    return pd.DataFrame(data, copy=False)
+
+
+def season_mapping_hash(
+    season_matches: list[dict],
+    team_lookup: dict,
+    normalizer: TeamNormalizer | None = None,
+) -> str:
+    """
+    Hashes only the mapping entries of the teams that play in a season (and
+    the canonical names they resolve to, when it is not the same name).
+    """
+    teams = {m.get("home_team") for m in season_matches}
+    teams |= {m.get("away_team") for m in season_matches}
+    entries = {}
+    for team in teams:
+        if not team:
+            continue
+        canonical = normalizer.normalize(team) if normalizer else team
+        entry = team_lookup.get(canonical)
+        if canonical != team:
+            entry = {"name": canonical, "mapping": entry}
+        entries[str(team)] = entry
+    return sha256_json(entries)
+
+
+def input_hash(
+    raw_json_path: str, city_map_path: str, aliases_path: str = ALIASES_PATH
+) -> str | None:
+    """
+    Hash of everything the CSV depends on: the raw file, the mapping and
+    alias files and PROCESSOR_VERSION. None if the raw file does not exist.
+    """
+    parts = [str(PROCESSOR_VERSION).encode()]
+    for path in (raw_json_path, city_map_path, aliases_path):
+        try:
+            with open(path, "rb") as f:
+                parts.append(sha256_bytes(f.read()).encode())
+        except FileNotFoundError:
+            if path == raw_json_path:
+                return None
+            parts.append(b"missing")
+    return sha256_bytes(b"\n".join(parts))
+
+
+def load_processed_rows(csv_path: str) -> list[dict]:
+    """Reads a previously written analysis CSV as rows of strings."""
+    try:
+        with open(csv_path, "r", encoding="utf-8-sig", newline="") as f:
+            return list(csv.DictReader(f))
+    except FileNotFoundError:
+        return []
+
+
+def enrich_seasons(
+    raw_seasons,
+    index: "CityIndex",
+    previous_seasons: dict,
+    previous_rows: dict,
+    incremental: bool,
+    normalizer: TeamNormalizer | None = None,
+    tournament: str = "",
+) -> tuple:
+    """
+    Enriches an iterable of (year, matches) one season at a time with the
+    compiled city `index`, reusing unchanged seasons from `previous_rows`
+    when `incremental`. Team names are resolved with `normalizer`, if given.
+    Repeated matches of a season are only processed once (see match_index).
+    Returns (season columns, string pools, manifest seasons, missing teams,
+    reused season count, raw match count); see analysis_rows and
+    analysis_frame for turning the columns into rows or a DataFrame.
+    """
+    import numpy as np
+    from match_index import dedupe_rows
+    from match_table import MatchTable, StringPool
+
+    pools = {name: StringPool() for name in dict.fromkeys(COLUMN_POOLS.values())}
+    team_table = build_team_table(index, pools["city"])
+    parts = []
+    seasons = {}
+    missing_teams = set()
+    reused = total = 0
+
+    for year, season_matches in raw_seasons:
+        with metrics.timer("process_season", year=year):
+            total += len(season_matches)
+            entry = {
+                "processor_version": PROCESSOR_VERSION,
+                "raw_sha256": sha256_json(season_matches),
+                "mapping_sha256": season_mapping_hash(
+                    season_matches, index.team_lookup, normalizer
+                ),
+            }
+            old_entry = previous_seasons.get(year, {})
+            old_rows = previous_rows.get(year, [])
+            if (
+                incremental
+                and all(old_entry.get(k) == v for k, v in entry.items())
+                and old_entry.get("rows") == len(old_rows)
+            ):
+                parts.append(reused_columns(old_rows, pools))
+                missing_teams.update(old_entry.get("missing_teams", []))
+                seasons[year] = old_entry
+                reused += 1
+                metrics.count("processed_seasons_total", outcome="reused")
+                continue
+
+            unique_matches = dedupe_rows(tournament, season_matches)
+            metrics.count(
+                "duplicate_matches_total", len(season_matches) - len(unique_matches)
+            )
+            season_matches = unique_matches
+            season = MatchTable(RAW_FIELDS, pools).extend(season_matches)
+            columns, keep, home_missing, away_missing = enrich_columns(
+                season, index, team_table, pools, normalizer
+            )
+            season_missing = {
+                season_matches[i]["home_team"] for i in np.flatnonzero(home_missing)
+            }
+            season_missing |= {
+                season_matches[i]["away_team"] for i in np.flatnonzero(away_missing)
+            }
+            parts.append(columns)
+            missing_teams |= season_missing
+            entry["rows"] = int(keep.sum())
+            entry["missing_teams"] = sorted(season_missing)
+            seasons[year] = entry
+            metrics.count("processed_seasons_total", outcome="processed")
+            unmapped = int((home_missing | away_missing).sum())
+            metrics.count("rows_rejected_total", unmapped, reason="unmapped_team")
+            metrics.count(
+                "rows_rejected_total",
+                len(keep) - entry["rows"] - unmapped,
+                reason="no_team",
+            )
+
+    return parts, pools, seasons, missing_teams, reused, total
+
+
+def process_data(
+    raw_json_path: str,
+    city_map_path: str,
+    output_csv_path: str,
+    incremental: bool = False,
+    parquet_dir: str | None = None,
+    tournament: str | None = None,
+    raw_seasons=None,
+    sqlite_path: str | None = None,
+):
+    """
+    Reads raw match data and the single mapping file to create the final
+    processed CSV with altitude and travel distance calculations. The mapping
+    is used in its compiled form (see city_index), which is only rebuilt when
+    the file changes.
+    `raw_seasons`, an iterable of (year, match dicts) in file order, is used
+    instead of reading `raw_json_path` if given (e.g. the seasons the scraper
+    just wrote in the same process).
+    With `parquet_dir`, the rows are also written as the `tournament`
+    partitions of a typed Parquet dataset (see parquet_store.py), and with
+    `sqlite_path` they are upserted into the SQLite warehouse (see
+    warehouse.py); the tournament defaults to the CSV name prefix.
+    The raw file is streamed one season at a time (see raw_matches), so only
+    the enriched columns are kept in memory, as compact arrays (see
+    match_table). The CSV and the warehouse rows are written from them with
+    the standard library; pandas is only imported for the Parquet dataset.
+    A manifest next to the CSV records, per season, the hash of its raw rows
+    and of the mapping entries of its teams. With `incremental`, seasons whose
+    hashes are unchanged reuse their rows from the existing CSV, so editing
+    one city only re-processes the seasons where its teams play. If none of
+    the input files changed (see input_hash), the CSV is left as it is
+    without loading the city index or numpy.
+    """
+    tournament = tournament or os.path.basename(output_csv_path).split("_")[0]
+    manifest_file = manifest_path(output_csv_path)
+    manifest = load_manifest(manifest_file)
+    digest = input_hash(raw_json_path, city_map_path)
+    if (
+        incremental
+        and raw_seasons is None
+        and not parquet_dir
+        and not sqlite_path
+        and digest is not None
+        and manifest.get("input_sha256") == digest
+        and os.path.exists(output_csv_path)
+    ):
+        print(f"{output_csv_path} is up to date.")
+        return
+
+    from city_index import load_city_index
+
+    with metrics.timer("load_city_index"):
+        index = load_city_index(city_map_path)
+
+    if raw_seasons is None and not os.path.exists(raw_json_path):
+        print(f"[Error] Raw data file not found: {raw_json_path}", file=sys.stderr)
+        return
+
+    if not index.cities:
+        print("[Error] Aborting due to missing city mapping file.", file=sys.stderr)
+        return
+
+    normalizer = TeamNormalizer(load_aliases(), index.mapping_teams)
+    print(
+        f"Loaded {len(index.cities)} cities and created lookup map for "
+        f"{len(index.team_lookup)} teams."
+    )
+
+    previous_seasons = manifest["seasons"]
+    previous_rows = (
+        group_by_year(load_processed_rows(output_csv_path)) if incremental else {}
+    )
+
+    try:
+        with metrics.scope(tournament=tournament), metrics.timer("enrich_seasons"):
+            parts, pools, seasons, missing_teams, reused, total = enrich_seasons(
+                iter_seasons(raw_json_path) if raw_seasons is None else raw_seasons,
+                index,
+                previous_seasons,
+                previous_rows,
+                incremental,
+                normalizer,
+                tournament,
+            )
+    except SeasonsNotGrouped:
+        # Seasons interleaved in the file: group them in memory instead.
+        parts, pools, seasons, missing_teams, reused, total = enrich_seasons(
+            group_by_year(load_matches(raw_json_path)).items(),
+            index,
+            previous_seasons,
+            previous_rows,
+            incremental,
+            normalizer,
+            tournament,
+        )
+    print(f"Loaded {total} raw matches.")
+    metrics.count("raw_matches_total", total, tournament=tournament)
+    metrics.count("missing_teams_total", len(missing_teams), tournament=tournament)
+
+    if incremental:
+        print(f"Reused {reused} unchanged seasons, processed {len(seasons) - reused}.")
+
     if missing_teams:
         print(
             f"\n[Warning] {len(missing_teams)} teams are missing from your 'city_mappings.json' file:"
@@ -123,49 +579,97 @@ def process_data(raw_json_path: str, city_map_path: str, output_csv_path: str):
                 print(f"  ... and {len(missing_teams) - 10} more.")
                 break
             print(f"  - {team}")
+    print_approximate(normalizer)
 
-    if not processed_data:
+    row_count = sum(len(part["year"][0]) for part in parts)
+    if not row_count:
         print(
             "\n[Error] No data was processed. Check your mapping file.", file=sys.stderr
         )
         return
 
-    df = pd.DataFrame(processed_data)
-
     try:
         os.makedirs(os.path.dirname(output_csv_path), exist_ok=True)
-        df.to_csv(output_csv_path, index=False, encoding="utf-8-sig")
+        with metrics.timer("csv_write", tournament=tournament):
+            write_analysis_csv(output_csv_path, parts, pools)
+        metrics.count("rows_written_total", row_count, tournament=tournament)
+        save_manifest(manifest_file, {"seasons": seasons, "input_sha256": digest})
 
         print(f"\n--- Altitude Processing Finished ---")
-        print(f"Successfully processed {len(df)} matches.")
+        print(f"Successfully processed {row_count} matches.")
         print(f"Final analysis CSV saved to: {output_csv_path}")
 
     except IOError as e:
         print(f"Error writing to {output_csv_path}: {e}", file=sys.stderr)
+        return
+
+    if parquet_dir:
+        from parquet_store import write_parquet
+
+        with metrics.timer("parquet_write", tournament=tournament):
+            written = write_parquet(
+                analysis_frame(parts, pools), tournament, parquet_dir
+            )
+        if written:
+            print(f"Parquet dataset updated in: {parquet_dir}")
+    if sqlite_path:
+        with metrics.timer("sqlite_write", tournament=tournament):
+            rows = (
+                dict(zip(OUTPUT_COLUMNS, row)) for row in analysis_rows(parts, pools)
+            )
+            written = write_warehouse(rows, tournament, sqlite_path)
+        if written:
+            print(f"SQLite warehouse updated: {sqlite_path}")
 
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Error: Missing tournament name argument.", file=sys.stderr)
-        print(
-            "Usage: python3 process_altitude.py [sudamericana|libertadores]",
-            file=sys.stderr,
-        )
-        sys.exit(1)
+    parser = argparse.ArgumentParser(
+        description="Enriches raw matches with city altitudes and writes the "
+        "analysis CSV."
+    )
+    parser.add_argument("tournament", help=f"One of: {', '.join(REGISTRY)}")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only re-process seasons whose raw matches or team mappings changed.",
+    )
+    parser.add_argument(
+        "--parquet",
+        nargs="?",
+        const=True,
+        metavar="DIR",
+        help="Also write a typed Parquet dataset "
+        "(default DIR: data/processed/parquet).",
+    )
+    parser.add_argument(
+        "--sqlite",
+        nargs="?",
+        const=WAREHOUSE_PATH,
+        metavar="DB",
+        help="Also upsert the rows into a SQLite warehouse "
+        f"(default DB: {WAREHOUSE_PATH}).",
+    )
+    metrics.add_arguments(parser)
+    args = parser.parse_args()
 
-    tournament_name = sys.argv[1].lower()
-    RAW_DIR = os.path.join("data", "raw")
-    PROCESSED_DIR = os.path.join("data", "processed")
+    tournament = get_tournament(args.tournament)
+    tournament_name = tournament.name
     CITY_MAP_PATH = os.path.join("data", "mappings", "city_mappings.json")
 
-    if tournament_name == "sudamericana":
-        RAW_JSON_PATH = os.path.join(RAW_DIR, "sudamericana_matches.json")
-        OUTPUT_CSV_PATH = os.path.join(PROCESSED_DIR, "sudamericana_analysis.csv")
-    elif tournament_name == "libertadores":
-        RAW_JSON_PATH = os.path.join(RAW_DIR, "libertadores_matches.json")
-        OUTPUT_CSV_PATH = os.path.join(PROCESSED_DIR, "libertadores_analysis.csv")
-    else:
-        print(f"Error: Unknown tournament '{tournament_name}'.", file=sys.stderr)
-        sys.exit(1)
-
-    process_data(RAW_JSON_PATH, CITY_MAP_PATH, OUTPUT_CSV_PATH)
+    parquet_dir = args.parquet
+    if parquet_dir is True:
+        # Imported only when needed: parquet_store loads pandas and pyarrow.
+        from parquet_store import PARQUET_DIR
+
+        parquet_dir = PARQUET_DIR
+
+    with metrics.instrumented(f"process_altitude_{tournament_name}", args):
+        process_data(
+            tournament.raw_path,
+            CITY_MAP_PATH,
+            tournament.analysis_path,
+            incremental=args.incremental,
+            parquet_dir=parquet_dir,
+            tournament=tournament_name,
+            sqlite_path=args.sqlite,
+        )
@@ -0,0 +1,130 @@
+"""
+Raw match files in JSON Lines: one match object per line, written season by
+season to <path>.tmp and flushed to disk after each one. The file only
+replaces <path> when the whole scrape finishes, so an interrupted scrape
+leaves the previous file as it was, and the next one resumes from the
+seasons already in <path>.tmp (see scraper.scrape_tournaments).
+Files in the previous format (a single JSON array) are still readable.
+Only uses the standard library, so reading raw files does not load numpy.
+"""
+
+import json
+import os
+import sys
+from collections.abc import Iterator
+
+
+class SeasonsNotGrouped(ValueError):
+    """A season's matches are not stored contiguously in the file."""
+
+
+def iter_matches(path: str) -> Iterator[dict]:
+    """
+    Streams the matches of a raw file one at a time. Lines that are not valid
+    JSON (e.g. the last one of an interrupted write) are skipped with a
+    warning. Raises FileNotFoundError if the file does not exist.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        first = f.read(1)
+        while first.isspace():
+            first = f.read(1)
+        if first == "[":
+            # Legacy single-array file: has to be decoded at once.
+            yield from json.loads(first + f.read())
+            return
+
+        f.seek(0)
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                print(
+                    f"  [Warning] Skipping malformed line {line_number} of {path}: {e}",
+                    file=sys.stderr,
+                )
+
+
+def load_matches(path: str) -> list[dict]:
+    """All matches of a raw file; a missing file has none."""
+    try:
+        return list(iter_matches(path))
+    except FileNotFoundError:
+        return []
+    except json.JSONDecodeError as e:
+        print(f"  [Warning] Ignoring unreadable file {path}: {e}", file=sys.stderr)
+        return []
+
+
+def iter_seasons(path: str) -> Iterator[tuple[str, list[dict]]]:
+    """
+    Streams (year, matches) per season, holding one season in memory at a
+    time. Years are strings, as in manifest.group_by_year. Raises
+    SeasonsNotGrouped when a year shows up again after another one.
+    """
+    seen = set()
+    year, season = None, []
+    for match in iter_matches(path):
+        match_year = str(match.get("year"))
+        if match_year != year:
+            if season:
+                yield year, season
+            if match_year in seen:
+                raise SeasonsNotGrouped(f"{path}: year {match_year} is split")
+            seen.add(match_year)
+            year, season = match_year, []
+        season.append(match)
+    if season:
+        yield year, season
+
+
+def partial_path(path: str) -> str:
+    """File a MatchWriter for `path` writes to until it is closed."""
+    return f"{path}.tmp"
+
+
+class MatchWriter:
+    """
+    Writes a raw file season by season into <path>.tmp, syncing it after
+    every season, and moves it onto `path` on close(). Used as a context
+    manager, the file is only moved if the block finishes without an
+    exception; otherwise `path` is left untouched and the seasons written so
+    far stay in <path>.tmp, synced, for the next run to resume from.
+    """
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.tmp_path = partial_path(path)
+        self.count = 0
+        self._file = open(self.tmp_path, "w", encoding="utf-8")
+
+    def write_season(self, matches: list):
+        """Appends Match records (see match_table) or raw match dicts."""
+        lines = "".join(
+            json.dumps(
+                match._asdict() if isinstance(match, tuple) else match,
+                ensure_ascii=False,
+            )
+            + "\n"
+            for match in matches
+        )
+        self._file.write(lines)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.count += len(matches)
+
+    def close(self, commit: bool = True):
+        """Closes the file and, with `commit`, moves it onto `path`."""
+        if self._file.closed:
+            return
+        self._file.close()
+        if commit:
+            os.replace(self.tmp_path, self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(commit=exc_type is None)
@@ -1,88 +1,275 @@
 import requests
+from requests.adapters import HTTPAdapter
 from pyquery import PyQuery
+from cleaning import SCORE_RE, clean_team_name, parse_score
+from lxml_backend import GROUP_HEADER_WINDOW, GROUP_RE
+import lxml_backend
+from page_cache import PageCache, season_ttl, CACHE_DIR
+from parse_cache import ParseCache, parse_key, PARSE_CACHE_DIR
+from fetcher import (
+    DEFAULT_BURST,
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_RATE,
+    RETRY_QUEUE_PATH,
+    Fetcher,
+    RetryQueue,
+)
+from match_table import Match
+from team_names import TeamNormalizer, default_normalizer
+from match_index import MatchIndex, change_set, change_set_path, save_change_set
+import metrics
+from mock_server import add_replay_arguments, start_replay
+from tournaments import (
+    PARSER_PROFILES,
+    REGISTRY,
+    Tournament,
+    get_tournament,
+    parse_years,
+    schedule,
+    with_years,
+)
+from raw_matches import MatchWriter, load_matches, partial_path
+from manifest import (
+    group_by_year,
+    load_manifest,
+    manifest_path,
+    partial_manifest_path,
+    save_manifest,
+    sha256_bytes,
+)
+from collections import Counter
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from urllib.parse import urlsplit, unquote
+import argparse
+import multiprocessing
+import threading
+import time
 import sys
 import re
-import json
 import os
 
+WIKI_URL = "https://es.wikipedia.org/wiki/"
+# Bump whenever parsing or cleaning changes, so incremental runs re-parse.
+PARSER_VERSION = 6
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/5.37.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/5.37.36"
+}
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_PER_HOST = 4
+DEFAULT_PARSE_WORKERS = os.cpu_count() or 1
+# Field order of the compact match records sent back by parse workers.
+MATCH_FIELDS = Match._fields
+TEAM_FIELDS = (MATCH_FIELDS.index("home_team"), MATCH_FIELDS.index("away_team"))
+# Filled in by lxml_backend.pair_legs; left empty in parse_records.
+TIE_FIELDS = ("leg", "aggregate_home_goals", "aggregate_away_goals")
+
+
+def create_session(pool_size: int = DEFAULT_MAX_WORKERS) -> requests.Session:
+    """Creates a keep-alive session whose connection pool fits `pool_size` threads."""
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def fetch_page(
+    url: str,
+    session: requests.Session | None = None,
+    cache: PageCache | None = None,
+    ttl: float | None = 0,
+    fetcher: Fetcher | None = None,
+    wait_for_circuit: bool = False,
+) -> bytes | None:
+    """
+    Downloads the raw HTML body of a given URL.
+    With a `cache`, a copy younger than `ttl` seconds (None = forever) is
+    returned without touching the network; otherwise the cached ETag /
+    Last-Modified are sent and a 304 reuses the cached body. Requests go
+    through `fetcher` (rate limiting, retries, circuit breaking; a default
+    one over `session` if None). If the download still fails, a stale
+    cached copy is returned when there is one.
+    The time taken and the outcome (see fetch_page_with_outcome) are
+    recorded in the run metrics.
+    """
+    start = time.perf_counter()
+    content, outcome = fetch_page_with_outcome(
+        url, session, cache, ttl, fetcher, wait_for_circuit
+    )
+    metrics.observe("fetch_page", time.perf_counter() - start, outcome=outcome)
+    metrics.count("pages_fetched_total", outcome=outcome)
+    if outcome == "downloaded":
+        metrics.count("bytes_downloaded_total", len(content))
+    return content
+
+
+def fetch_page_with_outcome(
+    url: str,
+    session: requests.Session | None = None,
+    cache: PageCache | None = None,
+    ttl: float | None = 0,
+    fetcher: Fetcher | None = None,
+    wait_for_circuit: bool = False,
+) -> tuple[bytes | None, str]:
+    """
+    fetch_page returning (body, outcome), where outcome is "fresh",
+    "revalidated", "downloaded", "stale" or "failed".
+    """
+    fetcher = fetcher or Fetcher(session)
+    headers = HEADERS
+    if cache is not None:
+        if cache.is_fresh(url, ttl):
+            content = cache.read(url)
+            if content is not None:
+                cache.count("fresh")
+                return content, "fresh"
+        headers = {**HEADERS, **cache.validators(url)}
 
-def fetch_html_tree(url: str) -> PyQuery | None:
-    """Downloads and parses the HTML content from a given URL."""
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/5.37.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/5.37.36"
-    }
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        response = fetcher.get(url, headers, wait_for_circuit)
+        if response.status_code == 304 and cache is not None:
+            content = cache.read(url)
+            if content is not None:
+                cache.revalidated(url)
+                cache.count("revalidated")
+                return content, "revalidated"
+            response = fetcher.get(url, HEADERS, wait_for_circuit)
         response.raise_for_status()
-        return PyQuery(response.content)
     except requests.exceptions.RequestException as e:
         print(f"  [Error] Failed to fetch {url}: {e}", file=sys.stderr)
-        return None
+        content = cache.read(url) if cache is not None else None
+        if content is None:
+            return None, "failed"
+        print(f"  [Warning] Using the stale cached copy of {url}.", file=sys.stderr)
+        cache.count("stale")
+        return content, "stale"
+
+    if cache is not None:
+        cache.count("downloaded")
+        try:
+            cache.store(
+                url,
+                response.content,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
+        except OSError as e:
+            print(f"  [Warning] Could not cache {url}: {e}", file=sys.stderr)
+    return response.content, "downloaded"
+
+
+def parse_html(content: bytes) -> PyQuery | None:
+    """Parses a raw HTML body into a PyQuery document."""
+    try:
+        return PyQuery(content)
     except Exception as e:
         print(f"  [Error] Failed to parse HTML: {e}", file=sys.stderr)
         return None
 
 
-def clean_score(score_text: str) -> tuple[str | None, str | None]:
-    """Cleans score text (e.g., "1:1 (0:0)") and returns (home_goals, away_goals)."""
-    if score_text is None:
-        return None, None
-    score_clean = re.sub(r"\(.*\)", "", score_text).strip()
-    score_parts = score_clean.split(":", 1)
+def fetch_html_tree(
+    url: str,
+    session: requests.Session | None = None,
+    cache: PageCache | None = None,
+    ttl: float | None = 0,
+) -> PyQuery | None:
+    """Downloads and parses the HTML content from a given URL."""
+    content = fetch_page(url, session, cache, ttl)
+    if content is None:
+        return None
+    return parse_html(content)
+
+
+class HostLimiter:
+    """Caps the number of in-flight requests per host (politeness limit)."""
 
-    cleaned_text = re.sub(
-        r"\s*\.mw-parser-output.*?(\n|$)", "", score_text, flags=re.DOTALL
-    )
-    cleaned_text = re.sub(r"\(.*?\)", "", cleaned_text)
-    cleaned_text = cleaned_text.strip()
-
-    match = re.search(r"(\d+)\s*[:–-]\s*(\d+)", cleaned_text)
-    if match:
-        return match.group(1), match.group(2)
-    return None, None
-
-
-def clean_team_name(name: str) -> str:
-    """Normalizes team names to match the mapping file."""
-    name = name.strip()
-
-    if name == "Bahia" or name == "Bahía":
-        return "Bahia"
-    if name == "Brasilia" or name == "Brasília":
-        return "Brasilia"
-    if name == "Athletico Paranaense" or name == "Paranaense":
-        return "Atlético Paranaense"
-    if name == "Táchira":
-        return "Deportivo Táchira"
-    if name == "Mineiro":
-        return "Atlético Mineiro"
-    if name == "Goianiense":
-        return "Atlético Goianiense"
-    if name == "Cali":
-        return "Deportivo Cali"
-    if name == "Capiatá":
-        return "Deportivo Capiatá"
-    if name == "Tucumán":
-        return "Atlético Tucumán"
-    if name == "Nacional" and "Atlético Nacional" in name:
-        return "Atlético Nacional"
-    if name == "Medellín":
-        return "Independiente Medellín"
-    if name == "Racing Club":
-        return "Racing Club"
-    if name == "Racing":
-        return "Racing"
-    if name == "Estudiantes":
-        return "Estudiantes (LP)"
-    if name == "Estudiantes (LP)":
-        return "Estudiantes (LP)"
-
-    return name.strip()
-
-
-def parse_knockout_matches(doc: PyQuery, year: int) -> list[dict]:
-    """
-    Parses knockout matches using PyQuery.
+    def __init__(self, per_host: int):
+        self.per_host = max(1, per_host)
+        self._lock = threading.Lock()
+        self._semaphores: dict[str, threading.Semaphore] = {}
+
+    def for_url(self, url: str) -> threading.Semaphore:
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.Semaphore(self.per_host)
+            return self._semaphores[host]
+
+
+def fetch_pages(
+    urls: list[str],
+    session: requests.Session | None = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    per_host: int = DEFAULT_PER_HOST,
+    cache: PageCache | None = None,
+    ttls: dict[str, float | None] | None = None,
+    on_page=None,
+    fetcher: Fetcher | None = None,
+) -> dict[str, bytes | None]:
+    """
+    Downloads several pages concurrently over one shared connection pool.
+    At most `max_workers` requests are in flight overall and at most
+    `per_host` against the same host; `fetcher` adds rate limiting, retries
+    and circuit breaking (see fetcher.py). Pages that still failed with a
+    transient error are tried once more after the others, waiting for their
+    host's circuit to let requests through again. `ttls` gives the cache
+    freshness lifetime per URL. `on_page(url, body)` is called from the
+    download thread as soon as each page is fetched (or finally given up
+    on). Returns {url: body or None}.
+    """
+    ttls = ttls or {}
+    max_workers = max(1, min(max_workers, len(urls) or 1))
+    session = session or create_session(max_workers)
+    fetcher = fetcher or Fetcher(session)
+    limiter = HostLimiter(per_host)
+
+    def fetch_one(url: str, last_try: bool) -> bytes | None:
+        ttl = ttls.get(url, 0)
+        if cache is not None and cache.is_fresh(url, ttl):
+            content = fetch_page(url, session, cache, ttl, fetcher)
+        else:
+            with limiter.for_url(url):
+                content = fetch_page(url, session, cache, ttl, fetcher, last_try)
+        if content is None and not last_try and url in fetcher.failed:
+            return None
+        if on_page is not None:
+            on_page(url, content)
+        return content
+
+    # With retries disabled, the first failure is final.
+    first_try_is_last = not fetcher.max_retries
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        pages = dict(
+            zip(urls, pool.map(fetch_one, urls, [first_try_is_last] * len(urls)))
+        )
+        failed = [url for url in urls if pages[url] is None and url in fetcher.failed]
+        if failed and not first_try_is_last:
+            print(f"  Retrying {len(failed)} failed pages.")
+            pages.update(zip(failed, pool.map(fetch_one, failed, [True] * len(failed))))
+    return pages
+
+
+def save_page(content: bytes, url: str, pages_dir: str):
+    """Stores a fetched page as <pages_dir>/<title>.html for offline replay."""
+    title = unquote(urlsplit(url).path.rstrip("/").rsplit("/", 1)[-1])
+    try:
+        os.makedirs(pages_dir, exist_ok=True)
+        with open(os.path.join(pages_dir, f"{title}.html"), "wb") as f:
+            f.write(content)
+    except OSError as e:
+        print(f"  [Warning] Could not save page {url}: {e}", file=sys.stderr)
+
+
+def parse_knockout_matches(
+    doc: PyQuery, year: int, clean_name: Callable[[str], str] = clean_team_name
+) -> list[dict]:
+    """
+    Parses knockout matches using PyQuery. Team names go through
+    `clean_name`, as in every parser below.
     """
     matches = []
     knockout_tables = doc("table.collapsible.vevent.plainlist").items()
@@ -99,14 +286,18 @@ def parse_knockout_matches(doc: PyQuery, year: int) -> list[dict]:
 
             cells = list(table.find("tr").eq(0).find("td").items())
             if len(cells) < 5:
+                metrics.count(
+                    "knockout_tables_total", backend="pyquery", outcome="short"
+                )
                 continue
+            metrics.count("knockout_tables_total", backend="pyquery", outcome="match")
 
             date = cells[0].text().strip()
-            home_team = clean_team_name(cells[1].text().strip())
+            home_team = clean_name(cells[1].text().strip())
             score_raw = cells[2].text().strip()
-            away_team = clean_team_name(cells[3].text().strip())
+            away_team = clean_name(cells[3].text().strip())
             stadium = cells[4].text().strip().split(",")[0]
-            home_goals, away_goals = clean_score(score_raw)
+            score = parse_score(score_raw)
 
             matches.append(
                 {
@@ -116,9 +307,12 @@ def parse_knockout_matches(doc: PyQuery, year: int) -> list[dict]:
                     "home_team": home_team,
                     "away_team": away_team,
                     "score": score_raw,
-                    "home_goals": home_goals,
-                    "away_goals": away_goals,
+                    "home_goals": score.home,
+                    "away_goals": score.away,
                     "stadium": stadium,
+                    "extra_time": score.extra_time,
+                    "home_penalties": score.home_penalties,
+                    "away_penalties": score.away_penalties,
                 }
             )
         except (AttributeError, IndexError, TypeError) as e:
@@ -127,7 +321,220 @@ def parse_knockout_matches(doc: PyQuery, year: int) -> list[dict]:
     return matches
 
 
-def parse_group_stage_matches(doc: PyQuery, year: int) -> list[dict]:
+def parse_knockout_matches_single_pass(
+    doc: PyQuery, year: int, clean_name: Callable[[str], str] = clean_team_name
+) -> list[dict]:
+    """
+    Knockout matches of a PyQuery document read in one document-order walk,
+    with each table's phase taken from the closest heading before it and
+    the legs of every tie paired (see lxml_backend.parse_knockout_matches_single_pass).
+    """
+    matches = []
+    for root in doc:
+        matches.extend(
+            lxml_backend.parse_knockout_matches_single_pass(root, year, clean_name)
+        )
+    return matches
+
+
+def tx(el: PyQuery) -> str:
+    """Text of an element with whitespace collapsed to single spaces."""
+    return re.sub(r"\s+", " ", (el.text() or "").strip())
+
+
+def table_has_score(table_el: PyQuery) -> bool:
+    txt = table_el.text() or ""
+    return bool(SCORE_RE.search(txt))
+
+
+def parse_group_table(
+    table: PyQuery,
+    group_name: str,
+    year: int,
+    stadium: str | None = None,
+    clean_name: Callable[[str], str] = clean_team_name,
+) -> tuple[list[dict], str | None]:
+    """
+    Parses the match rows of one group table.
+    Returns the matches and the last stadium value seen, which the fallback
+    parser inherits for 4-column rows.
+    """
+    matches: list[dict] = []
+    rows = Counter()
+
+    for row in table.find("tr").items():
+        header_ths = list(row.find("th").items())
+        if header_ths and any(
+            "fecha" in (tx(th).lower()) or "local" in (tx(th).lower())
+            for th in header_ths
+        ):
+            rows["header", "skipped"] += 1
+            continue
+
+        cols = list(row.find("td").items())
+        if len(cols) < 4:
+            rows["short", "skipped"] += 1
+            continue
+
+        date = None
+        stadium = None
+        home_team = ""
+        away_team = ""
+        score_raw = ""
+
+        if len(cols) >= 5:
+            branch = "5_cols"
+            date = tx(cols[0])
+            stadium = tx(cols[1]) or None
+            home_team = tx(cols[2])
+            score_raw = tx(cols[3])
+            away_team = tx(cols[4])
+        elif len(cols) == 4:
+            date = tx(cols[0])
+            second_text = tx(cols[1])
+            third_text = tx(cols[2])
+            fourth_text = tx(cols[3])
+
+            if SCORE_RE.search(third_text):
+                branch = "4_cols_score_third"
+                home_team = second_text
+                score_raw = third_text
+                away_team = fourth_text
+                stadium = None
+            elif SCORE_RE.search(second_text):
+                branch = "4_cols_score_second"
+                score_raw = second_text
+                home_team = third_text
+                away_team = fourth_text
+                stadium = None
+            else:
+                branch = "4_cols_no_score"
+                home_team = second_text
+                score_raw = third_text
+                away_team = fourth_text
+                stadium = None
+        else:
+            branch = "other"
+            texts = [tx(c) for c in cols]
+            score_idx = None
+            for i, t in enumerate(texts):
+                if SCORE_RE.search(t):
+                    score_idx = i
+                    break
+            if score_idx is None or score_idx == 0 or score_idx >= len(texts) - 1:
+                rows[branch, "no_score"] += 1
+                continue
+            score_raw = texts[score_idx]
+            home_team = texts[score_idx - 1]
+            away_team = texts[score_idx + 1]
+            date = texts[0] if len(texts) > 0 else None
+            stadium = None
+
+        if not score_raw or not SCORE_RE.search(score_raw):
+            rows[branch, "no_score"] += 1
+            continue
+
+        home_team = clean_name(home_team)
+        away_team = clean_name(away_team)
+
+        score = parse_score(score_raw)
+        if score.home is None:
+            m = SCORE_RE.search(score_raw)
+            if m:
+                maybe = m.group(0)
+                score = parse_score(maybe)
+            if score.home is None:
+                rows[branch, "bad_score"] += 1
+                continue
+
+        if not home_team or not away_team:
+            rows[branch, "no_team"] += 1
+            continue
+
+        rows[branch, "match"] += 1
+        match = {
+            "year": year,
+            "phase": group_name,
+            "date": date,
+            "home_team": home_team,
+            "away_team": away_team,
+            "score": score_raw,
+            "home_goals": score.home,
+            "away_goals": score.away,
+            "stadium": stadium,
+            "extra_time": score.extra_time,
+            "home_penalties": score.home_penalties,
+            "away_penalties": score.away_penalties,
+        }
+        matches.append(match)
+
+    lxml_backend.record_rows(rows, "pyquery")
+    return matches, stadium
+
+
+def parse_fallback_tables(
+    tables: list[PyQuery],
+    year: int,
+    stadium: str | None = None,
+    clean_name: Callable[[str], str] = clean_team_name,
+) -> list[dict]:
+    """
+    Last-resort parser: reads every row of every score-bearing table as a
+    "Fase de Grupos" match. 4-column rows carry over the previous stadium.
+    """
+    matches: list[dict] = []
+    rows = Counter()
+
+    for t in tables:
+        for row in t.find("tr").items():
+            cols = list(row.find("td").items())
+            if len(cols) < 4:
+                rows["fallback", "skipped"] += 1
+                continue
+            try:
+                if len(cols) >= 5:
+                    date = tx(cols[0])
+                    stadium = tx(cols[1]) or None
+                    home_team = clean_name(tx(cols[2]))
+                    score_raw = tx(cols[3])
+                    away_team = clean_name(tx(cols[4]))
+                else:
+                    date = tx(cols[0])
+                    home_team = clean_name(tx(cols[1]))
+                    score_raw = tx(cols[2])
+                    away_team = clean_name(tx(cols[3]))
+                score = parse_score(score_raw)
+                if score.home is None:
+                    rows["fallback", "bad_score"] += 1
+                    continue
+                rows["fallback", "match"] += 1
+                matches.append(
+                    {
+                        "year": year,
+                        "phase": "Fase de Grupos",
+                        "date": date,
+                        "home_team": home_team,
+                        "away_team": away_team,
+                        "score": score_raw,
+                        "home_goals": score.home,
+                        "away_goals": score.away,
+                        "stadium": stadium,
+                        "extra_time": score.extra_time,
+                        "home_penalties": score.home_penalties,
+                        "away_penalties": score.away_penalties,
+                    }
+                )
+            except Exception:
+                rows["fallback", "error"] += 1
+                continue
+
+    lxml_backend.record_rows(rows, "pyquery")
+    return matches
+
+
+def parse_group_stage_matches(
+    doc: PyQuery, year: int, clean_name: Callable[[str], str] = clean_team_name
+) -> list[dict]:
     """
     Robust parser for group stage matches (Libertadores / Sudamericana, 2014-2024).
     Tries multiple heuristics:
@@ -135,23 +542,19 @@ def parse_group_stage_matches(doc: PyQuery, year: int) -> list[dict]:
         - find "Partidos" subtitles then pull the nested table
         - fallback: search all tables with a score pattern and try to infer group
     Returns list of dicts with keys:
-        year, phase, date, home_team, away_team, score, home_goals, away_goals, stadium
+        year, phase, date, home_team, away_team, score, home_goals, away_goals, stadium,
+        extra_time, home_penalties, away_penalties
+
+    Kept as the reference implementation for parse_group_stage_matches_single_pass.
     """
     matches: list[dict] = []
-    score_re = re.compile(r"\d+\s*[:–-]\s*\d+")
-
-    def table_has_score(table_el: PyQuery) -> bool:
-        txt = table_el.text() or ""
-        return bool(score_re.search(txt))
-
-    def tx(el: PyQuery) -> str:
-        return re.sub(r"\s+", " ", (el.text() or "").strip())
+    stadium = None
 
     header_selectors = "h2 span.mw-headline, h3 span.mw-headline, h4 span.mw-headline"
     group_headers = []
     for span in doc(header_selectors).items():
         text = tx(span)
-        if re.search(r"\bGrupo\b", text, re.IGNORECASE):
+        if GROUP_RE.search(text):
             group_headers.append(span)
 
     for span in group_headers:
@@ -161,14 +564,14 @@ def parse_group_stage_matches(doc: PyQuery, year: int) -> list[dict]:
 
         sib = h_parent.next()
         steps = 0
-        while sib is not None and sib.length > 0 and steps < 12:
+        while sib is not None and sib.length > 0 and steps < GROUP_HEADER_WINDOW:
             if sib.is_("table"):
                 if table_has_score(sib):
                     found_table = sib
                     break
             if (
                 sib.is_("div.wikitable-wrapper")
-                or "wikitable-wrapper" in sib.attr("class")
+                or "wikitable-wrapper" in (sib.attr("class") or "")
                 or sib.is_("div.mw-parser-output")
             ):
                 inner = sib.find("table").eq(0)
@@ -182,7 +585,7 @@ def parse_group_stage_matches(doc: PyQuery, year: int) -> list[dict]:
             ):
                 inner = (
                     sib.find("table")
-                    .filter(lambda i, el: score_re.search(PyQuery(el).text() or ""))
+                    .filter(lambda i, el: SCORE_RE.search(PyQuery(el).text() or ""))
                     .eq(0)
                 )
                 if inner.length > 0:
@@ -209,7 +612,7 @@ def parse_group_stage_matches(doc: PyQuery, year: int) -> list[dict]:
         if not found_table:
             sib = h_parent.next()
             steps = 0
-            while sib is not None and sib.length > 0 and steps < 12:
+            while sib is not None and sib.length > 0 and steps < GROUP_HEADER_WINDOW:
                 if "Partidos" in (tx(sib) or ""):
                     inner = sib.find("table").eq(0)
                     if inner.length > 0 and table_has_score(inner):
@@ -227,204 +630,746 @@ def parse_group_stage_matches(doc: PyQuery, year: int) -> list[dict]:
         if not found_table:
             continue
 
-        for row in found_table.find("tr").items():
-            header_ths = list(row.find("th").items())
-            if header_ths and any(
-                "fecha" in (tx(th).lower()) or "local" in (tx(th).lower())
-                for th in header_ths
-            ):
-                continue
+        group_matches, stadium = parse_group_table(
+            found_table, group_name, year, stadium, clean_name
+        )
+        matches.extend(group_matches)
 
-            cols = list(row.find("td").items())
-            if len(cols) < 4:
-                continue
+    if not matches:
+        score_tables = [t for t in doc("table").items() if table_has_score(t)]
+        matches = parse_fallback_tables(score_tables, year, stadium, clean_name)
 
-            date = None
-            stadium = None
-            home_team = ""
-            away_team = ""
-            score_raw = ""
-
-            if len(cols) >= 5:
-                date = tx(cols[0])
-                stadium = tx(cols[1]) or None
-                home_team = tx(cols[2])
-                score_raw = tx(cols[3])
-                away_team = tx(cols[4])
-            elif len(cols) == 4:
-                date = tx(cols[0])
-                second_text = tx(cols[1])
-                third_text = tx(cols[2])
-                fourth_text = tx(cols[3])
-
-                if score_re.search(third_text):
-                    home_team = second_text
-                    score_raw = third_text
-                    away_team = fourth_text
-                    stadium = None
-                elif score_re.search(second_text):
-                    score_raw = second_text
-                    home_team = third_text
-                    away_team = fourth_text
-                    stadium = None
-                else:
-                    home_team = second_text
-                    score_raw = third_text
-                    away_team = fourth_text
-                    stadium = None
-            else:
-                texts = [tx(c) for c in cols]
-                score_idx = None
-                for i, t in enumerate(texts):
-                    if score_re.search(t):
-                        score_idx = i
-                        break
-                if score_idx is None or score_idx == 0 or score_idx >= len(texts) - 1:
-                    continue
-                score_raw = texts[score_idx]
-                home_team = texts[score_idx - 1]
-                away_team = texts[score_idx + 1]
-                date = texts[0] if len(texts) > 0 else None
-                stadium = None
+    return matches
 
-            if not score_raw or not score_re.search(score_raw):
-                continue
 
-            home_team = clean_team_name(home_team)
-            away_team = clean_team_name(away_team)
+def parse_group_stage_matches_single_pass(
+    doc: PyQuery, year: int, clean_name: Callable[[str], str] = clean_team_name
+) -> list[dict]:
+    """
+    Single-pass group stage parser producing the same matches as
+    parse_group_stage_matches.
+    Walks the tree once in document order, keeping the "Grupo" headings that
+    are still looking for their table as state, and classifies every table
+    (has a score pattern or not) exactly once (see
+    lxml_backend.find_group_tables). Rows are still read through PyQuery.
+    """
+    groups, score_tables = lxml_backend.find_group_tables(doc)
+    matches: list[dict] = []
+    stadium = None
+    for group_name, table in groups:
+        if table is None:
+            continue
+        group_matches, stadium = parse_group_table(
+            PyQuery(table), group_name, year, stadium, clean_name
+        )
+        matches.extend(group_matches)
 
-            hg, ag = clean_score(score_raw)
-            if hg is None or ag is None:
-                m = score_re.search(score_raw)
-                if m:
-                    maybe = m.group(0)
-                    hg, ag = clean_score(maybe)
-                if hg is None or ag is None:
-                    continue
+    if not matches:
+        score_tables = [PyQuery(t) for t in score_tables]
+        matches = parse_fallback_tables(score_tables, year, stadium, clean_name)
 
-            if not home_team or not away_team:
-                continue
+    return matches
 
-            match = {
-                "year": year,
-                "phase": group_name,
-                "date": date,
-                "home_team": home_team,
-                "away_team": away_team,
-                "score": score_raw,
-                "home_goals": hg,
-                "away_goals": ag,
-                "stadium": stadium,
-            }
-            matches.append(match)
 
-    if not matches:
-        for t in doc("table").items():
-            if not table_has_score(t):
-                continue
-            for row in t.find("tr").items():
-                cols = list(row.find("td").items())
-                if len(cols) < 4:
-                    continue
-                try:
-                    if len(cols) >= 5:
-                        date = tx(cols[0])
-                        stadium = tx(cols[1]) or None
-                        home_team = clean_team_name(tx(cols[2]))
-                        score_raw = tx(cols[3])
-                        away_team = clean_team_name(tx(cols[4]))
-                    else:
-                        date = tx(cols[0])
-                        home_team = clean_team_name(tx(cols[1]))
-                        score_raw = tx(cols[2])
-                        away_team = clean_team_name(tx(cols[3]))
-                    hg, ag = clean_score(score_raw)
-                    if hg is None or ag is None:
-                        continue
-                    matches.append(
-                        {
-                            "year": year,
-                            "phase": "Fase de Grupos",
-                            "date": date,
-                            "home_team": home_team,
-                            "away_team": away_team,
-                            "score": score_raw,
-                            "home_goals": hg,
-                            "away_goals": ag,
-                            "stadium": stadium if "stadium" in locals() else None,
-                        }
-                    )
-                except Exception:
-                    continue
+GROUP_PARSERS = {
+    "single-pass": parse_group_stage_matches_single_pass,
+    "heuristic": parse_group_stage_matches,
+}
+
+
+KNOCKOUT_PARSERS = {
+    "sibling-scan": parse_knockout_matches,
+    "single-pass": parse_knockout_matches_single_pass,
+}
 
-    return matches
 
+BACKENDS = ("lxml", "pyquery")
+# Group stage parser of the lxml backend, its only one.
+LXML_GROUP_PARSER = "single-pass"
 
-def run_scraper(tournament_name: str, base_url: str, output_file: str):
+
+def parse_season(
+    content: bytes,
+    year: int,
+    backend: str = "lxml",
+    group_parser: str = "single-pass",
+    knockout_parser: str = "sibling-scan",
+    clean_name: Callable[[str], str] = clean_team_name,
+) -> tuple[list[dict], list[dict]] | None:
     """
-    Main function to scrape all years for a given tournament.
+    Parses one season page into (group_matches, knockout_matches).
+    The "lxml" backend works on raw lxml elements (see lxml_backend.py); the
+    "pyquery" backend is the reference implementation, where `group_parser`
+    selects an entry of GROUP_PARSERS; the lxml backend only has the
+    single-pass one and raises ValueError for any other. `knockout_parser`
+    selects an entry of KNOCKOUT_PARSERS in either backend. Team names go
+    through `clean_name` (normalized by default). Returns None if the page
+    can't be parsed.
     """
-    YEARS = range(2024, 2013, -1)
-    all_matches = []
+    if backend == "lxml":
+        if group_parser != LXML_GROUP_PARSER:
+            raise ValueError(
+                f"The lxml backend has no {group_parser!r} group parser "
+                f"(only {LXML_GROUP_PARSER!r}); use the pyquery backend."
+            )
+        try:
+            with metrics.timer("parse_document", backend=backend):
+                root = lxml_backend.parse_document(content)
+        except Exception as e:
+            print(f"  [Error] Failed to parse HTML: {e}", file=sys.stderr)
+            return None
+        with metrics.timer("parse_group_stage", backend=backend):
+            group_matches = lxml_backend.parse_group_stage_matches(
+                root, year, clean_name
+            )
+        with metrics.timer("parse_knockout", backend=backend, parser=knockout_parser):
+            knockout_matches = lxml_backend.KNOCKOUT_PARSERS[knockout_parser](
+                root, year, clean_name
+            )
+        return group_matches, knockout_matches
 
-    for year in YEARS:
-        url = f"{base_url}{year}"
-        print(f"--- Scraping {url} ---")
+    with metrics.timer("parse_document", backend=backend):
+        doc = parse_html(content)
+    if doc is None:
+        return None
+    with metrics.timer("parse_group_stage", backend=backend, parser=group_parser):
+        group_matches = GROUP_PARSERS[group_parser](doc, year, clean_name)
+    with metrics.timer("parse_knockout", backend=backend, parser=knockout_parser):
+        knockout_matches = KNOCKOUT_PARSERS[knockout_parser](doc, year, clean_name)
+    return group_matches, knockout_matches
 
-        doc = fetch_html_tree(url)
-        if doc is None:
-            continue
 
-        group_matches = parse_group_stage_matches(doc, year)
-        knockout_matches = parse_knockout_matches(doc, year)
+def parse_records(
+    content: bytes,
+    year: int,
+    backend: str,
+    group_parser: str,
+    knockout_parser: str = "sibling-scan",
+) -> tuple[list[tuple], list[tuple]] | None:
+    """
+    parse_season for the parse worker processes: returns the matches as
+    tuples in MATCH_FIELDS order, which are much cheaper to send back (and
+    to cache). Team names are left as found on the page, only stripped, so
+    cached records can be normalized with the current rules; see
+    normalize_records. The legs of each tie are not paired (TIE_FIELDS are
+    None), since pairing compares team names; see pair_matches.
+    """
+    parsed = parse_season(
+        content, year, backend, group_parser, knockout_parser, clean_name=str.strip
+    )
+    if parsed is None:
+        return None
+    defaults = Match._field_defaults
+    return tuple(
+        [
+            tuple(
+                None if f in TIE_FIELDS else m.get(f, defaults.get(f))
+                for f in MATCH_FIELDS
+            )
+            for m in part
+        ]
+        for part in parsed
+    )
 
-        print(f"  Found {len(group_matches)} group stage matches.")
-        print(f"  Found {len(knockout_matches)} knockout matches.")
 
-        all_matches.extend(group_matches)
-        all_matches.extend(knockout_matches)
+def parse_records_measured(
+    content: bytes,
+    year: int,
+    backend: str,
+    group_parser: str,
+    knockout_parser: str,
+    labels: dict,
+) -> tuple:
+    """
+    parse_records in a parse worker process: returns (records, snapshot of
+    the metrics recorded while parsing, with `labels` added), so the parent
+    can merge them into its own.
+    """
+    metrics.REGISTRY.reset()
+    with metrics.scope(**labels), metrics.timer("parse_season", year=year):
+        records = parse_records(content, year, backend, group_parser, knockout_parser)
+    return records, metrics.REGISTRY.snapshot()
 
-    if not all_matches:
-        print(f"\nNo matches were scraped for {tournament_name}. Exiting.")
-        open(os.path.join("data", "raw", output_file), "w").close()
-        return
 
-    DATA_DIR = "data/raw"
+def normalize_records(records: list[tuple], normalizer: TeamNormalizer) -> list[tuple]:
+    """Records from parse_records with their team names normalized."""
+    home, away = TEAM_FIELDS
+    normalized = []
+    for record in records:
+        record = list(record)
+        record[home] = normalizer.normalize(record[home])
+        record[away] = normalizer.normalize(record[away])
+        normalized.append(tuple(record))
+    return normalized
+
+
+def records_to_matches(records: list[tuple]) -> list[Match]:
+    return list(map(Match._make, records))
+
+
+def pair_matches(matches: list[Match]) -> list[Match]:
+    """
+    Knockout matches with the legs of each tie paired (see
+    lxml_backend.pair_legs), for records whose team names are normalized.
+    """
+    legs = [match._asdict() for match in matches]
+    lxml_backend.pair_legs(legs)
+    return [Match(**leg) for leg in legs]
+
+
+def create_parse_pool(parse_workers: int) -> ProcessPoolExecutor | None:
+    """
+    Process pool for the parse stage, or None to parse in this process.
+    Workers are spawned (not forked) since download threads are running.
+    """
+    if parse_workers <= 1:
+        return None
+    return ProcessPoolExecutor(
+        max_workers=parse_workers, mp_context=multiprocessing.get_context("spawn")
+    )
+
+
+def scrape_tournaments(
+    tournaments: list[Tournament],
+    base_url: str = WIKI_URL,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    per_host: int = DEFAULT_PER_HOST,
+    pages_dir: str | None = None,
+    cache: PageCache | None = None,
+    refresh: bool = False,
+    incremental: bool = False,
+    group_parser: str | None = None,
+    backend: str | None = None,
+    knockout_parser: str | None = None,
+    parse_workers: int = DEFAULT_PARSE_WORKERS,
+    fetcher: Fetcher | None = None,
+    parse_cache: ParseCache | None = None,
+):
+    """
+    Scrapes all seasons of several tournaments (registry entries, see
+    tournaments.py) at once, with their pages under `base_url`. Every
+    (tournament, year) season is planned into one work queue (see
+    tournaments.schedule) and their pages are fetched concurrently through a
+    single pooled session (fetch stage). With `parse_workers` > 1, each page is
+    handed to a pool of that many processes as soon as it arrives, so pages
+    are parsed on all cores while the rest are still downloading (parse
+    stage); otherwise pages are parsed here, one after another.
+    With a `cache`, finished seasons are served from disk and the current one
+    is revalidated; `refresh` revalidates every cached page.
+    Each tournament's matches are written to its JSON Lines output season by
+    season, newest first, and the output only replaces the previous one once
+    all its seasons are done (see raw_matches.MatchWriter), without repeated
+    matches (see match_index.MatchIndex). The added, removed and modified
+    matches with respect to the previous output are saved next to it as
+    <name>_changes.json, a report for people: incremental processing finds
+    the changed seasons through the per-season manifests instead.
+    A manifest next to each output records the page hash, parser version and
+    team-name rules (TeamNormalizer.sha256) of every season and is saved
+    right after the output, so it always describes what the output holds. With
+    `incremental`, seasons where all three are unchanged reuse their rows
+    from the existing output instead of being re-parsed, and seasons that
+    fail to download keep their previous rows.
+    The seasons written so far are also recorded in a partial manifest next
+    to the output's temporary file. If a run is interrupted, the next one
+    resumes from them: seasons whose entry is still the same reuse the rows
+    left in the temporary file, with or without `incremental`.
+    Each season is parsed with its tournament's parser profile; `backend`,
+    `group_parser` and `knockout_parser`, if given, override it (see
+    parse_season). With a
+    `parse_cache`, pages parsed before with the same parser and options are
+    not parsed again: their cached records are only re-normalized.
+    Downloads go through `fetcher` (see fetcher.py); pages left in its retry
+    queue by the previous run are fetched first, and the queue is saved
+    with whatever still failed.
+    Returns {tournament_name: {year: matches}} with the seasons written to
+    each output, so later stages can use them without re-reading the files.
+    """
+    fetcher = fetcher or Fetcher(create_session(max_workers), queue=RetryQueue())
+    normalizer = default_normalizer()
+    jobs = {job.url: job for job in schedule(tournaments, base_url)}
+    previous = {}
+    previous_indexes = {}
+    resumed = set()
+    for tournament in tournaments:
+        output_path = tournament.raw_path
+        previous_seasons = load_manifest(manifest_path(output_path))["seasons"]
+        old_matches = load_matches(output_path)
+        previous_indexes[tournament.name] = MatchIndex(
+            tournament.name, map(Match.from_dict, old_matches)
+        )
+        previous_rows = group_by_year(old_matches) if incremental else {}
+        for year in tournament.years:
+            key = str(year)
+            previous[tournament.season_url(base_url, year)] = (
+                previous_seasons.get(key),
+                [Match.from_dict(m) for m in previous_rows.pop(key, [])],
+            )
+
+        # Seasons finished by an interrupted run, left in the temporary file.
+        partial_seasons = load_manifest(partial_manifest_path(output_path))["seasons"]
+        partial_rows = group_by_year(load_matches(partial_path(output_path)))
+        resumable = 0
+        for year in tournament.years:
+            key = str(year)
+            entry = partial_seasons.get(key)
+            rows = partial_rows.get(key, [])
+            if entry and entry["matches"] == len(rows):
+                url = tournament.season_url(base_url, year)
+                previous[url] = (entry, [Match.from_dict(m) for m in rows])
+                resumed.add(url)
+                resumable += 1
+        if resumable:
+            print(
+                f"Resuming {tournament.name}: {resumable} seasons were finished "
+                "by an interrupted run."
+            )
+
+    def season_entry(url: str, content: bytes) -> dict:
+        return {
+            "page_sha256": sha256_bytes(content),
+            "parser_version": PARSER_VERSION,
+            "normalizer_sha256": normalizer.sha256,
+            "matches": len(previous[url][1]),
+        }
+
+    def reusable(url: str, entry: dict) -> bool:
+        return (incremental or url in resumed) and previous[url][0] == entry
+
+    def parser_options(tournament: Tournament) -> tuple[str, str, str]:
+        profile_backend, profile_group_parser, profile_knockout_parser = (
+            PARSER_PROFILES[tournament.parser]
+        )
+        season_backend = backend or profile_backend
+        if season_backend != profile_backend:
+            # The profile's group parser belongs to its own backend.
+            profile_group_parser = LXML_GROUP_PARSER
+        return (
+            season_backend,
+            group_parser or profile_group_parser,
+            knockout_parser or profile_knockout_parser,
+        )
+
+    def cache_key(url: str, entry: dict) -> str:
+        return parse_key(
+            entry["page_sha256"], PARSER_VERSION, *parser_options(jobs[url].tournament)
+        )
+
+    cached_records = {}
+
+    def cached(url: str, entry: dict) -> tuple | None:
+        """Cached records of a page, looked up once per page."""
+        if parse_cache is None:
+            return None
+        if url not in cached_records:
+            cached_records[url] = parse_cache.get(cache_key(url, entry))
+        return cached_records[url]
+
+    parse_workers = max(1, min(parse_workers, len(jobs)))
+    parse_pool = create_parse_pool(parse_workers)
+    parse_jobs: dict[str, Future] = {}
+
+    def on_page(url: str, content: bytes | None):
+        if content is None:
+            return
+        entry = season_entry(url, content)
+        if reusable(url, entry) or cached(url, entry) is not None:
+            return
+        job = jobs[url]
+        parse_jobs[url] = parse_pool.submit(
+            parse_records_measured,
+            content,
+            job.year,
+            *parser_options(job.tournament),
+            {"tournament": job.tournament.name},
+        )
+
+    ttls = {url: 0 if refresh else season_ttl(job.year) for url, job in jobs.items()}
+    queue = fetcher.queue
+    pending = [url for url in ttls if queue is not None and url in queue]
+    urls = pending + [url for url in ttls if url not in pending]
+    print(
+        f"--- Fetching {len(urls)} pages ({max_workers} workers, "
+        f"{parse_workers} parse processes) ---"
+    )
+    if pending:
+        print(f"  {len(pending)} pages failed last run, fetching them first.")
+    scraped = {}
     try:
-        os.makedirs(DATA_DIR, exist_ok=True)
-    except OSError as e:
-        print(f"Error creating directory {DATA_DIR}: {e}", file=sys.stderr)
+        pages = fetch_pages(
+            urls,
+            session=fetcher.session,
+            max_workers=max_workers,
+            per_host=per_host,
+            cache=cache,
+            ttls=ttls,
+            on_page=on_page if parse_pool else None,
+            fetcher=fetcher,
+        )
+        print(f"  Fetcher: {fetcher.summary()}")
+        for event, value in fetcher.stats.items():
+            metrics.count("http_events_total", value, event=event)
+        if queue is not None:
+            queue.save()
+            if fetcher.failed:
+                print(
+                    f"  [Warning] {len(fetcher.failed)} pages could not be fetched; "
+                    f"they are queued in {queue.path} for the next run.",
+                    file=sys.stderr,
+                )
+        if cache is not None:
+            cache.evict()
+            cache.save()
+            print(
+                "  Page cache: {fresh} fresh, {revalidated} revalidated (304), "
+                "{downloaded} downloaded, {stale} stale.".format(**cache.stats)
+            )
+
+        for tournament in tournaments:
+            tournament_name = tournament.name
+            output_path = tournament.raw_path
+            manifest_file = manifest_path(output_path)
+            partial_manifest = partial_manifest_path(output_path)
+            seasons = {}
+
+            try:
+                writer = MatchWriter(output_path)
+            except OSError as e:
+                print(f"Error opening {output_path}: {e}", file=sys.stderr)
+                continue
+
+            written = scraped[tournament_name] = {}
+            index = MatchIndex(tournament_name)
+            with writer:
+                for year in tournament.years:
+                    url = tournament.season_url(base_url, year)
+                    print(f"--- Scraping {url} ---")
+                    with metrics.scope(tournament=tournament_name), metrics.timer(
+                        "scrape_season", year=year
+                    ):
+                        key = str(year)
+                        old_entry, old_rows = previous[url]
+                        content = pages.get(url)
+                        if content is None:
+                            if (
+                                (incremental or url in resumed)
+                                and old_entry
+                                and len(old_rows) == old_entry["matches"]
+                            ):
+                                print(
+                                    f"  Keeping {len(old_rows)} previously scraped matches."
+                                )
+                                writer.write_season(old_rows)
+                                written[key] = old_rows
+                                index.update(old_rows)
+                                seasons[key] = old_entry
+                                metrics.count("seasons_total", outcome="kept")
+                                save_manifest(partial_manifest, {"seasons": seasons})
+                            else:
+                                metrics.count("seasons_total", outcome="failed")
+                            continue
+                        if pages_dir:
+                            save_page(content, url, pages_dir)
+
+                        entry = season_entry(url, content)
+                        if reusable(url, entry):
+                            since = (
+                                "the interrupted run" if url in resumed else "last run"
+                            )
+                            print(
+                                f"  Unchanged since {since}, reusing {len(old_rows)} matches."
+                            )
+                            writer.write_season(old_rows)
+                            written[key] = old_rows
+                            index.update(old_rows)
+                            seasons[key] = entry
+                            metrics.count("seasons_total", outcome="reused")
+                            save_manifest(partial_manifest, {"seasons": seasons})
+                            continue
+
+                        records = cached(url, entry)
+                        job = parse_jobs.get(url)
+                        if records is not None:
+                            print("  Page parsed before, reusing its cached matches.")
+                            metrics.count("parse_cache_total", outcome="hit")
+                        else:
+                            if job is None:
+                                with metrics.timer("parse_season", year=year):
+                                    records = parse_records(
+                                        content, year, *parser_options(tournament)
+                                    )
+                            else:
+                                try:
+                                    records, worker_metrics = job.result()
+                                except BrokenProcessPool as e:
+                                    print(
+                                        f"  [Error] Parse worker failed: {e}",
+                                        file=sys.stderr,
+                                    )
+                                    metrics.count("seasons_total", outcome="failed")
+                                    continue
+                                metrics.merge(worker_metrics)
+                            if records is None:
+                                metrics.count("seasons_total", outcome="failed")
+                                continue
+                            if parse_cache is not None:
+                                parse_cache.put(cache_key(url, entry), records)
+                                metrics.count("parse_cache_total", outcome="miss")
+                        group_matches, knockout_matches = (
+                            records_to_matches(normalize_records(part, normalizer))
+                            for part in records
+                        )
+                        if parser_options(tournament)[2] == "single-pass":
+                            knockout_matches = pair_matches(knockout_matches)
+
+                        print(f"  Found {len(group_matches)} group stage matches.")
+                        print(f"  Found {len(knockout_matches)} knockout matches.")
+
+                        found = group_matches + knockout_matches
+                        written[key] = index.dedupe(found)
+                        duplicates = len(found) - len(written[key])
+                        if duplicates:
+                            print(f"  Dropped {duplicates} duplicate matches.")
+                            metrics.count("duplicate_matches_total", duplicates)
+                        writer.write_season(written[key])
+                        entry["matches"] = len(written[key])
+                        seasons[key] = entry
+                        metrics.count("seasons_total", outcome="parsed")
+                        save_manifest(partial_manifest, {"seasons": seasons})
+
+            save_manifest(manifest_file, {"seasons": seasons})
+            try:
+                os.remove(partial_manifest)
+            except FileNotFoundError:
+                pass
+            metrics.count(
+                "matches_scraped_total", writer.count, tournament=tournament_name
+            )
+            changes = change_set(previous_indexes[tournament_name], index)
+            save_change_set(change_set_path(output_path), changes)
+            for kind, value in changes["summary"].items():
+                metrics.count(
+                    "match_changes_total",
+                    value,
+                    tournament=tournament_name,
+                    change=kind,
+                )
+            print(
+                "  Changes since the last run: {added} added, {removed} removed, "
+                "{modified} modified.".format(**changes["summary"])
+            )
+            if not writer.count:
+                print(f"\nNo matches were scraped for {tournament_name}.")
+                continue
+            print(f"\n--- Scraping Finished ({tournament_name}) ---")
+            print(f"Total matches found: {writer.count}")
+            print(f"Raw data saved to {output_path}")
+        if parse_cache is not None:
+            parse_cache.evict()
+            print(
+                "\nParse cache: {hit} pages reused, {stored} parsed and stored.".format(
+                    **parse_cache.stats
+                )
+            )
+    finally:
+        if parse_pool is not None:
+            parse_pool.shutdown(cancel_futures=True)
+    return scraped
+
+
+def print_fetch_summary(seconds: float):
+    """Prints the pages fetched per second and the fetch latency quantiles of the run."""
+    pages = metrics.total("pages_fetched_total")
+    if not pages:
         return
+    latency = ", ".join(
+        f"p{round(q * 100)} {value * 1000:.0f}ms"
+        for q, value in metrics.quantiles("fetch_page").items()
+    )
+    print(
+        f"Fetched {pages:g} pages in {seconds:.2f}s "
+        f"({pages / seconds:.1f} pages/s); latency {latency}."
+    )
 
-    output_path = os.path.join(DATA_DIR, output_file)
-    try:
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(all_matches, f, ensure_ascii=False, indent=2)
 
-        print(f"\n--- Scraping Finished ({tournament_name}) ---")
-        print(f"Total matches found: {len(all_matches)}")
-        print(f"Raw data saved to {output_path}")
-    except IOError as e:
-        print(f"Error writing JSON to {output_path}: {e}", file=sys.stderr)
+def run_scraper(
+    tournament_name: str,
+    base_url: str = WIKI_URL,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    per_host: int = DEFAULT_PER_HOST,
+) -> dict:
+    """
+    Main function to scrape all years for a given tournament.
+    """
+    return scrape_tournaments(
+        [get_tournament(tournament_name)],
+        base_url,
+        max_workers=max_workers,
+        per_host=per_host,
+    )
 
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Error: Missing tournament name argument.", file=sys.stderr)
-        print("Usage: python3 scrape.py [sudamericana|libertadores]", file=sys.stderr)
-        sys.exit(1)
-
-    tournament_name = sys.argv[1].lower()
-
-    if tournament_name == "sudamericana":
-        BASE_URL = "https://es.wikipedia.org/wiki/Copa_Sudamericana_"
-        OUTPUT_FILE = "sudamericana_matches.json"
-    elif tournament_name == "libertadores":
-        BASE_URL = "https://es.wikipedia.org/wiki/Copa_Libertadores_"
-        OUTPUT_FILE = "libertadores_matches.json"
-    else:
-        print(f"Error: Unknown tournament '{tournament_name}'.", file=sys.stderr)
-        print("Usage: python3 scrape.py [sudamericana|libertadores]", file=sys.stderr)
-        sys.exit(1)
-
-    run_scraper(tournament_name, BASE_URL, OUTPUT_FILE)
+    parser = argparse.ArgumentParser(
+        description="Scrapes Copa Libertadores / Sudamericana matches from Wikipedia."
+    )
+    parser.add_argument(
+        "tournaments",
+        nargs="+",
+        metavar="tournament",
+        help="One or more of: " + ", ".join(REGISTRY),
+    )
+    parser.add_argument(
+        "--years",
+        type=parse_years,
+        metavar="FIRST-LAST",
+        help="Seasons to scrape instead of each tournament's registered range.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_MAX_WORKERS,
+        help=f"Maximum concurrent page downloads (default: {DEFAULT_MAX_WORKERS}).",
+    )
+    parser.add_argument(
+        "--per-host",
+        type=int,
+        default=DEFAULT_PER_HOST,
+        help=f"Maximum concurrent requests per host (default: {DEFAULT_PER_HOST}).",
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=DEFAULT_RATE,
+        help="Requests per second per host, halved on every 429 and recovered "
+        f"on success; 0 disables the limit (default: {DEFAULT_RATE:g}).",
+    )
+    parser.add_argument(
+        "--burst",
+        type=int,
+        default=DEFAULT_BURST,
+        help=f"Requests per host that may be sent back to back (default: {DEFAULT_BURST}).",
+    )
+    parser.add_argument(
+        "--max-retries",
+        type=int,
+        default=DEFAULT_MAX_RETRIES,
+        help="Retries of a page after a 429/5xx answer or a dropped connection "
+        f"(default: {DEFAULT_MAX_RETRIES}).",
+    )
+    parser.add_argument(
+        "--retry-queue",
+        default=RETRY_QUEUE_PATH,
+        help="File listing the pages that still failed, fetched first next run "
+        f"(default: {RETRY_QUEUE_PATH}).",
+    )
+    parser.add_argument(
+        "--parse-workers",
+        type=int,
+        default=DEFAULT_PARSE_WORKERS,
+        help="Processes parsing pages while the rest download; 1 parses inline "
+        f"(default: number of CPUs, {DEFAULT_PARSE_WORKERS}).",
+    )
+    parser.add_argument(
+        "--base-url",
+        default=WIKI_URL,
+        help=f"Wiki root to fetch season pages from (default: {WIKI_URL}).",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=CACHE_DIR,
+        help="Directory of the on-disk page cache, holding the downloaded pages "
+        f"only (default: {CACHE_DIR}).",
+    )
+    parser.add_argument(
+        "--parse-cache-dir",
+        default=PARSE_CACHE_DIR,
+        help="Directory of the on-disk cache of parsed pages "
+        f"(default: {PARSE_CACHE_DIR}).",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Download and parse every page, bypassing the page and parse caches.",
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Revalidate every cached page with the server (conditional GET).",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        help="HTML parsing backend (default: the tournament's parser profile, "
+        "lxml for all of them; pyquery is the reference).",
+    )
+    parser.add_argument(
+        "--group-parser",
+        choices=GROUP_PARSERS,
+        help="Group stage parser engine of the pyquery backend; the lxml backend "
+        "only has single-pass (default: the tournament's parser profile).",
+    )
+    parser.add_argument(
+        "--knockout-parser",
+        choices=KNOCKOUT_PARSERS,
+        help="Knockout stage parser: sibling-scan takes each table's phase from "
+        "the first heading among its preceding siblings; single-pass walks the "
+        "page once, takes it from the closest heading and pairs the legs of "
+        "every tie (default: the tournament's parser profile, sibling-scan).",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only re-parse seasons whose page or parser changed since the last run.",
+    )
+    parser.add_argument(
+        "--save-pages",
+        metavar="DIR",
+        help="Also store every fetched season page as DIR/<title>.html.",
+    )
+    add_replay_arguments(parser)
+    metrics.add_arguments(parser)
+    args = parser.parse_args()
+    if args.group_parser not in (None, LXML_GROUP_PARSER) and args.backend != "pyquery":
+        parser.error(
+            f"--group-parser {args.group_parser} needs --backend pyquery "
+            f"(the lxml backend only has {LXML_GROUP_PARSER})."
+        )
+
+    tournaments = with_years([get_tournament(t) for t in args.tournaments], args.years)
+
+    base_url = args.base_url
+    server = None
+    if args.replay:
+        server, base_url = start_replay(args)
+        print(f"--- Replaying {args.replay} at {base_url} ---")
+    fetcher = Fetcher(
+        create_session(args.workers),
+        rate=args.rate,
+        burst=args.burst,
+        max_retries=args.max_retries,
+        queue=None if server else RetryQueue(args.retry_queue),
+    )
+    start = time.perf_counter()
+    with metrics.instrumented("scraper", args):
+        scrape_tournaments(
+            tournaments,
+            base_url,
+            max_workers=args.workers,
+            per_host=args.per_host,
+            pages_dir=args.save_pages,
+            cache=None if args.no_cache or server else PageCache(args.cache_dir),
+            parse_cache=(
+                None if args.no_cache or server else ParseCache(args.parse_cache_dir)
+            ),
+            refresh=args.refresh,
+            incremental=args.incremental,
+            group_parser=args.group_parser,
+            backend=args.backend,
+            knockout_parser=args.knockout_parser,
+            parse_workers=args.parse_workers,
+            fetcher=fetcher,
+        )
+        print_fetch_summary(time.perf_counter() - start)
+    if server is not None:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,181 @@
+"""
+Team-name normalization driven by the alias table in data/mappings/.
+
+Names are resolved, in order, by an exact index (canonical names and their
+aliases), an accent-, case- and punctuation-insensitive index, and a memoized fuzzy match
+against the same names. The scraper, generate_teams.py and process_altitude.py
+all share these rules, so a name resolves the same way in every stage.
+"""
+
+import argparse
+import difflib
+import json
+import os
+import sys
+import unicodedata
+from functools import lru_cache
+from manifest import sha256_json
+
+ALIASES_PATH = os.path.join("data", "mappings", "team_aliases.json")
+CITY_MAP_PATH = os.path.join("data", "mappings", "city_mappings.json")
+FUZZY_CUTOFF = 0.9
+FUZZY_CACHE_SIZE = 4096
+
+# Hyphens separate words; apostrophes and periods are dropped.
+PUNCTUATION = str.maketrans({"-": " ", "'": None, "’": None, ".": None})
+
+# Rules, from the most to the least certain one.
+EXACT, ALIAS, FOLDED, FUZZY, UNRESOLVED = "exact", "alias", "folded", "fuzzy", None
+
+
+def fold(name: str) -> str:
+    """Lower-cased name without accents or punctuation, with single spaces."""
+    decomposed = unicodedata.normalize("NFKD", name.translate(PUNCTUATION))
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.casefold().split())
+
+
+def load_aliases(path: str = ALIASES_PATH) -> dict[str, list[str]]:
+    """Alias table as {canonical name: [variants]}; a missing file has none."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        print(f"[Warning] Alias table not found at: {path}", file=sys.stderr)
+    except json.JSONDecodeError as e:
+        print(f"[Warning] Ignoring unreadable alias table {path}: {e}", file=sys.stderr)
+    return {}
+
+
+def mapping_teams(city_mappings: dict) -> list[str]:
+    """Team names listed in a city mapping, skipping malformed cities."""
+    teams = []
+    for data in city_mappings.values():
+        if isinstance(data, dict) and isinstance(data.get("teams"), list):
+            teams.extend(data["teams"])
+    return teams
+
+
+class TeamNormalizer:
+    """
+    Resolves raw team names to canonical ones. `aliases` maps each canonical
+    name to its variants; `known_names` (e.g. the teams of the city mapping)
+    resolve to themselves unless the alias table says otherwise. `sha256`
+    identifies these rules: names resolve the same under equal hashes.
+    """
+
+    def __init__(self, aliases: dict[str, list[str]], known_names=()):
+        known_names = list(known_names)
+        self.sha256 = sha256_json({"aliases": aliases, "known_names": known_names})
+        self.exact = {name: name for name in known_names}
+        self.exact.update(
+            (variant, canonical)
+            for canonical, variants in aliases.items()
+            for variant in variants
+        )
+        for canonical in aliases:
+            self.exact.setdefault(canonical, canonical)
+
+        candidates = {}
+        for variant, canonical in self.exact.items():
+            candidates.setdefault(fold(variant), set()).add(canonical)
+        # Keys shared by different teams are left to the exact index.
+        self.folded = {
+            key: canonical
+            for key, (canonical, *others) in candidates.items()
+            if not others
+        }
+        self._folded_keys = sorted(self.folded)
+        self._resolve_unknown = lru_cache(maxsize=FUZZY_CACHE_SIZE)(
+            self._resolve_uncached
+        )
+        # Names resolved by the folded or fuzzy rule: {name: (canonical, rule)}.
+        self.approximate = {}
+
+    def _resolve_uncached(self, name: str) -> tuple[str, str | None]:
+        key = fold(name)
+        if key in self.folded:
+            return self.folded[key], FOLDED
+        close = difflib.get_close_matches(
+            key, self._folded_keys, n=1, cutoff=FUZZY_CUTOFF
+        )
+        if close:
+            return self.folded[close[0]], FUZZY
+        return name, UNRESOLVED
+
+    def resolve(self, name: str) -> tuple[str, str | None]:
+        """
+        Returns (canonical name, rule): the rule is one of EXACT, ALIAS,
+        FOLDED or FUZZY, or UNRESOLVED (None) with the stripped name when
+        nothing matched.
+        """
+        name = name.strip()
+        canonical = self.exact.get(name)
+        if canonical is not None:
+            return canonical, EXACT if canonical == name else ALIAS
+        canonical, rule = self._resolve_unknown(name)
+        if rule is not UNRESOLVED:
+            self.approximate[name] = (canonical, rule)
+        return canonical, rule
+
+    def normalize(self, name: str) -> str:
+        """Canonical name of `name`, or the stripped name if unresolved."""
+        canonical = self.exact.get(name)
+        if canonical is not None:
+            return canonical
+        return self.resolve(name)[0]
+
+
+def load_normalizer(
+    city_mappings: dict | None = None,
+    aliases_path: str = ALIASES_PATH,
+    city_map_path: str = CITY_MAP_PATH,
+) -> TeamNormalizer:
+    """
+    Builds a normalizer from the alias table and the teams of `city_mappings`
+    (read from `city_map_path` when not given).
+    """
+    if city_mappings is None:
+        try:
+            with open(city_map_path, "r", encoding="utf-8") as f:
+                city_mappings = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError) as e:
+            print(
+                f"[Warning] Team names resolved from aliases only ({city_map_path}: {e})",
+                file=sys.stderr,
+            )
+            city_mappings = {}
+    return TeamNormalizer(load_aliases(aliases_path), mapping_teams(city_mappings))
+
+
+@lru_cache(maxsize=None)
+def default_normalizer() -> TeamNormalizer:
+    """Normalizer over the default alias table and city mapping, built once."""
+    return load_normalizer()
+
+
+def print_approximate(normalizer: TeamNormalizer):
+    """Lists the names that only matched by the folded or fuzzy rule."""
+    if not normalizer.approximate:
+        return
+    print(
+        f"\n[Warning] {len(normalizer.approximate)} team names matched approximately "
+        f"(add them to '{ALIASES_PATH}' if they are right):"
+    )
+    for name, (canonical, rule) in sorted(normalizer.approximate.items()):
+        print(f"  - {name} -> {canonical} ({rule})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Shows how team names resolve against the alias table."
+    )
+    parser.add_argument("names", nargs="+")
+    parser.add_argument("--aliases", default=ALIASES_PATH)
+    parser.add_argument("--city-map", default=CITY_MAP_PATH)
+    args = parser.parse_args()
+
+    normalizer = load_normalizer(aliases_path=args.aliases, city_map_path=args.city_map)
+    for name in args.names:
+        canonical, rule = normalizer.resolve(name)
+        print(f"{name} -> {canonical} ({rule or 'unresolved'})")
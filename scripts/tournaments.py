@@ -0,0 +1,114 @@
+"""
+Registry of the tournaments the scripts know how to handle. Each entry
+declares where its season pages are (a title pattern under the wiki root),
+which seasons to scrape, the parser profile that reads them and the names
+of its output files; scraper.py, generate_teams.py, process_altitude.py,
+aggregates.py and pipeline.py all take their tournaments from here, so
+covering a new tournament or more seasons is a matter of editing REGISTRY.
+
+`schedule` turns a set of tournaments into one queue of season jobs, so
+the pages of every tournament are fetched and parsed together.
+Only uses the standard library, so importing it is cheap.
+"""
+
+import os
+import sys
+from typing import NamedTuple
+
+RAW_DIR = os.path.join("data", "raw")
+PROCESSED_DIR = os.path.join("data", "processed")
+
+# Parser profile -> (backend, group-stage parser, knockout parser) options of
+# scraper.parse_season.
+PARSER_PROFILES = {
+    "modern": ("lxml", "single-pass", "sibling-scan"),
+    "heuristic": ("pyquery", "heuristic", "sibling-scan"),
+}
+
+
+class Tournament(NamedTuple):
+    name: str
+    page: str  # season page title, with {year}
+    first_year: int
+    last_year: int
+    parser: str = "modern"
+
+    @property
+    def years(self) -> range:
+        """Seasons to scrape, newest first (the order of the raw file)."""
+        return range(self.last_year, self.first_year - 1, -1)
+
+    def season_url(self, base_url: str, year: int) -> str:
+        return f"{base_url}{self.page.format(year=year)}"
+
+    @property
+    def raw_path(self) -> str:
+        return os.path.join(RAW_DIR, f"{self.name}_matches.jsonl")
+
+    @property
+    def teams_path(self) -> str:
+        return os.path.join(RAW_DIR, f"unique_teams_{self.name}.txt")
+
+    @property
+    def analysis_path(self) -> str:
+        return os.path.join(PROCESSED_DIR, f"{self.name}_analysis.csv")
+
+
+REGISTRY = {
+    tournament.name: tournament
+    for tournament in (
+        Tournament("sudamericana", "Copa_Sudamericana_{year}", 2014, 2024),
+        Tournament("libertadores", "Copa_Libertadores_{year}", 2014, 2024),
+    )
+}
+
+
+class SeasonJob(NamedTuple):
+    tournament: Tournament
+    year: int
+    url: str
+
+
+def get_tournament(name: str) -> Tournament:
+    """The registry entry of `name`; exits with an error if there is none."""
+    tournament = REGISTRY.get(name.lower())
+    if tournament is None:
+        print(f"Error: Unknown tournament '{name}'.", file=sys.stderr)
+        print(f"Known tournaments: {', '.join(REGISTRY)}", file=sys.stderr)
+        sys.exit(1)
+    return tournament
+
+
+def with_years(
+    tournaments: list[Tournament], years: tuple[int, int] | None
+) -> list[Tournament]:
+    """`tournaments` restricted (or extended) to the (first, last) seasons given."""
+    if years is None:
+        return list(tournaments)
+    first, last = sorted(years)
+    return [t._replace(first_year=first, last_year=last) for t in tournaments]
+
+
+def parse_years(value: str) -> tuple[int, int]:
+    """A "FIRST-LAST" (or single "YEAR") season range from the command line."""
+    first, _, last = value.partition("-")
+    try:
+        return int(first), int(last or first)
+    except ValueError:
+        raise ValueError(f"invalid season range '{value}' (expected FIRST-LAST)")
+
+
+def schedule(tournaments: list[Tournament], base_url: str) -> list[SeasonJob]:
+    """
+    One work queue with every (tournament, year) season of `tournaments`,
+    newest seasons first and interleaved across tournaments: those are the
+    pages most likely to have changed, and the parse workers get pages of
+    every tournament from the start.
+    """
+    jobs = [
+        SeasonJob(tournament, year, tournament.season_url(base_url, year))
+        for tournament in tournaments
+        for year in tournament.years
+    ]
+    jobs.sort(key=lambda job: -job.year)
+    return jobs
@@ -0,0 +1,436 @@
+"""
+SQLite copy of the analysis datasets, for analytical queries that should not
+load and scan every CSV: a normalized schema (tournaments, seasons, cities,
+teams, matches) with indexes on team, year and altitude difference, and an
+`analysis` view with the CSV columns plus the tournament.
+
+Loading a tournament upserts its matches on (tournament, year, phase, home
+team, away team, date), so unchanged matches keep their row, and removes the
+matches of that tournament that are no longer in the data.
+Only needs the standard library (sqlite3).
+"""
+
+import argparse
+import csv
+import os
+import sqlite3
+import sys
+import time
+from collections.abc import Iterable
+
+WAREHOUSE_PATH = os.path.join("data", "processed", "matches.sqlite")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tournaments (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS seasons (
+    id INTEGER PRIMARY KEY,
+    tournament_id INTEGER NOT NULL REFERENCES tournaments (id),
+    year INTEGER NOT NULL,
+    UNIQUE (tournament_id, year)
+);
+CREATE TABLE IF NOT EXISTS cities (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    altitude_meters INTEGER
+);
+CREATE TABLE IF NOT EXISTS teams (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    city_id INTEGER REFERENCES cities (id)
+);
+-- Missing phases and dates are stored as '' so that they take part in the
+-- upsert key (NULLs never conflict); the analysis view turns them back into NULL.
+CREATE TABLE IF NOT EXISTS matches (
+    id INTEGER PRIMARY KEY,
+    season_id INTEGER NOT NULL REFERENCES seasons (id),
+    phase TEXT NOT NULL DEFAULT '',
+    date TEXT NOT NULL DEFAULT '',
+    home_team_id INTEGER NOT NULL REFERENCES teams (id),
+    away_team_id INTEGER NOT NULL REFERENCES teams (id),
+    altitude_difference INTEGER,
+    travel_distance_km INTEGER,
+    home_goals INTEGER,
+    away_goals INTEGER,
+    score_raw TEXT,
+    stadium TEXT,
+    load_id INTEGER NOT NULL,
+    UNIQUE (season_id, phase, home_team_id, away_team_id, date)
+);
+CREATE INDEX IF NOT EXISTS seasons_year ON seasons (year);
+CREATE INDEX IF NOT EXISTS matches_home_team ON matches (home_team_id);
+CREATE INDEX IF NOT EXISTS matches_away_team ON matches (away_team_id);
+CREATE INDEX IF NOT EXISTS matches_altitude_difference
+    ON matches (altitude_difference);
+CREATE VIEW IF NOT EXISTS analysis AS
+SELECT
+    m.id,
+    t.name AS tournament,
+    s.year,
+    NULLIF(m.phase, '') AS phase,
+    NULLIF(m.date, '') AS date,
+    m.home_team_id,
+    ht.name AS home_team,
+    hc.name AS home_city,
+    hc.altitude_meters AS home_altitude_meters,
+    m.away_team_id,
+    at.name AS away_team,
+    ac.name AS away_city,
+    ac.altitude_meters AS away_altitude_meters,
+    m.altitude_difference,
+    m.travel_distance_km,
+    m.home_goals,
+    m.away_goals,
+    m.score_raw,
+    m.stadium
+FROM matches m
+JOIN seasons s ON s.id = m.season_id
+JOIN tournaments t ON t.id = s.tournament_id
+JOIN teams ht ON ht.id = m.home_team_id
+JOIN teams at ON at.id = m.away_team_id
+LEFT JOIN cities hc ON hc.id = ht.city_id
+LEFT JOIN cities ac ON ac.id = at.city_id;
+"""
+
+UPSERT_MATCH = """
+INSERT INTO matches (
+    season_id, phase, date, home_team_id, away_team_id, altitude_difference,
+    travel_distance_km, home_goals, away_goals, score_raw, stadium, load_id
+)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (season_id, phase, home_team_id, away_team_id, date) DO UPDATE SET
+    altitude_difference = excluded.altitude_difference,
+    travel_distance_km = excluded.travel_distance_km,
+    home_goals = excluded.home_goals,
+    away_goals = excluded.away_goals,
+    score_raw = excluded.score_raw,
+    stadium = excluded.stadium,
+    load_id = excluded.load_id
+"""
+
+
+def connect(db_path: str = WAREHOUSE_PATH) -> sqlite3.Connection:
+    """Opens (creating it if needed) the warehouse; rows come back as sqlite3.Row."""
+    directory = os.path.dirname(db_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(SCHEMA)
+    migrate(conn)
+    return conn
+
+
+def migrate(conn: sqlite3.Connection):
+    """Adds the columns of later versions to a warehouse created before them."""
+    columns = {row["name"] for row in conn.execute("PRAGMA table_info(matches)")}
+    if "travel_distance_km" not in columns:
+        with conn:
+            conn.execute("ALTER TABLE matches ADD COLUMN travel_distance_km INTEGER")
+            conn.execute("DROP VIEW analysis")
+        conn.executescript(SCHEMA)
+
+
+def frame_rows(df) -> Iterable[dict]:
+    """The rows of an analysis DataFrame as dicts, with None for missing values."""
+    columns = {
+        column: df[column].astype(object).where(df[column].notna(), None).tolist()
+        for column in df.columns
+    }
+    for values in zip(*columns.values()):
+        yield dict(zip(columns, values))
+
+
+def csv_rows(csv_path: str) -> Iterable[dict]:
+    """The rows of an analysis CSV as dicts, with None for empty cells."""
+    with open(csv_path, "r", encoding="utf-8-sig", newline="") as f:
+        for row in csv.DictReader(f):
+            yield {column: value or None for column, value in row.items()}
+
+
+class IdCache:
+    """Row ids of the lookup tables, inserted or updated on first use."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self.ids: dict[tuple, int] = {}
+
+    def get(self, insert: str, select: str, key: tuple, values: tuple = ()) -> int:
+        """Id of the row with `key`, upserted with `values` on the first call."""
+        row_id = self.ids.get((select, key))
+        if row_id is None:
+            self.conn.execute(insert, key + values)
+            row_id = self.conn.execute(select, key).fetchone()[0]
+            self.ids[select, key] = row_id
+        return row_id
+
+    def tournament(self, name: str) -> int:
+        return self.get(
+            "INSERT INTO tournaments (name) VALUES (?) ON CONFLICT (name) DO NOTHING",
+            "SELECT id FROM tournaments WHERE name = ?",
+            (name,),
+        )
+
+    def season(self, tournament_id: int, year: int) -> int:
+        return self.get(
+            "INSERT INTO seasons (tournament_id, year) VALUES (?, ?) "
+            "ON CONFLICT (tournament_id, year) DO NOTHING",
+            "SELECT id FROM seasons WHERE tournament_id = ? AND year = ?",
+            (tournament_id, year),
+        )
+
+    def city(self, name: str | None, altitude) -> int | None:
+        if name is None:
+            return None
+        return self.get(
+            "INSERT INTO cities (name, altitude_meters) VALUES (?, ?) "
+            "ON CONFLICT (name) DO UPDATE SET altitude_meters = excluded.altitude_meters",
+            "SELECT id FROM cities WHERE name = ?",
+            (name,),
+            (altitude,),
+        )
+
+    def team(self, name: str, city_id: int | None) -> int:
+        return self.get(
+            "INSERT INTO teams (name, city_id) VALUES (?, ?) "
+            "ON CONFLICT (name) DO UPDATE SET city_id = excluded.city_id",
+            "SELECT id FROM teams WHERE name = ?",
+            (name,),
+            (city_id,),
+        )
+
+
+def load_rows(conn: sqlite3.Connection, rows: Iterable[dict], tournament: str) -> int:
+    """
+    Upserts the analysis `rows` of `tournament` in one transaction and deletes
+    its matches that were not among them. Returns the number of rows loaded.
+    """
+    with conn:
+        load_id = conn.execute(
+            "SELECT COALESCE(MAX(load_id), 0) + 1 FROM matches"
+        ).fetchone()[0]
+        ids = IdCache(conn)
+        tournament_id = ids.tournament(tournament)
+
+        def match_params():
+            for row in rows:
+                home = ids.team(
+                    row["home_team"],
+                    ids.city(row["home_city"], row["home_altitude_meters"]),
+                )
+                away = ids.team(
+                    row["away_team"],
+                    ids.city(row["away_city"], row["away_altitude_meters"]),
+                )
+                yield (
+                    ids.season(tournament_id, int(row["year"])),
+                    row["phase"] or "",
+                    row["date"] or "",
+                    home,
+                    away,
+                    row["altitude_difference"],
+                    row.get("travel_distance_km"),
+                    row["home_goals"],
+                    row["away_goals"],
+                    row["score_raw"],
+                    row["stadium"],
+                    load_id,
+                )
+
+        params = list(match_params())
+        conn.executemany(UPSERT_MATCH, params)
+        conn.execute(
+            "DELETE FROM matches WHERE load_id != ? AND season_id IN "
+            "(SELECT id FROM seasons WHERE tournament_id = ?)",
+            (load_id, tournament_id),
+        )
+    return len(params)
+
+
+def write_warehouse(
+    rows: Iterable[dict], tournament: str, db_path: str = WAREHOUSE_PATH
+) -> bool:
+    """
+    Loads the analysis `rows` (see frame_rows / csv_rows) of `tournament`
+    into the warehouse at `db_path`. Returns False if they could not be written.
+    """
+    try:
+        conn = connect(db_path)
+    except (OSError, sqlite3.Error) as e:
+        print(f"Error opening SQLite warehouse {db_path}: {e}", file=sys.stderr)
+        return False
+    try:
+        load_rows(conn, rows, tournament)
+    except (KeyError, ValueError, sqlite3.Error) as e:
+        print(f"Error writing SQLite warehouse {db_path}: {e}", file=sys.stderr)
+        return False
+    finally:
+        conn.close()
+    return True
+
+
+def match_filters(
+    tournament: str | None = None,
+    team: str | None = None,
+    years: tuple[int, int] | None = None,
+    altitude_difference: tuple[int | None, int | None] | None = None,
+) -> tuple[str, list]:
+    """WHERE clause (over the analysis view) and parameters for the given filters."""
+    conditions, params = [], []
+    if tournament is not None:
+        conditions.append("tournament = ?")
+        params.append(tournament)
+    if team is not None:
+        # Team ids rather than names, so each side can use its index.
+        team_id = "(SELECT id FROM teams WHERE name = ?)"
+        conditions.append(f"(home_team_id = {team_id} OR away_team_id = {team_id})")
+        params += [team, team]
+    if years is not None:
+        conditions.append("year BETWEEN ? AND ?")
+        params += list(years)
+    if altitude_difference is not None:
+        low, high = altitude_difference
+        if low is not None:
+            conditions.append("altitude_difference >= ?")
+            params.append(low)
+        if high is not None:
+            conditions.append("altitude_difference <= ?")
+            params.append(high)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    return where, params
+
+
+def find_matches(
+    conn: sqlite3.Connection,
+    tournament: str | None = None,
+    team: str | None = None,
+    years: tuple[int, int] | None = None,
+    altitude_difference: tuple[int | None, int | None] | None = None,
+    limit: int | None = None,
+) -> list[sqlite3.Row]:
+    """
+    Matches of the analysis view, optionally restricted to a tournament, the
+    matches of one team, an inclusive (first, last) year range and an
+    inclusive (min, max) altitude difference (either end may be None).
+    """
+    where, params = match_filters(tournament, team, years, altitude_difference)
+    sql = f"SELECT * FROM analysis {where} ORDER BY tournament, year, id"
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(limit)
+    return conn.execute(sql, params).fetchall()
+
+
+def results_by_altitude_band(
+    conn: sqlite3.Connection,
+    band: int = 500,
+    max_away_altitude: int | None = None,
+    **filters,
+) -> list[sqlite3.Row]:
+    """
+    Home wins, draws and away wins per altitude-difference band of `band`
+    meters (named by its lower bound), for the matches selected by
+    `filters` (see find_matches) whose visitor plays at most at
+    `max_away_altitude` meters.
+    """
+    where, params = match_filters(**filters)
+    conditions = ["home_goals IS NOT NULL", "away_goals IS NOT NULL"]
+    if max_away_altitude is not None:
+        conditions.append("away_altitude_meters <= ?")
+        params.append(max_away_altitude)
+    where = f"{where} AND " if where else "WHERE "
+    where += " AND ".join(conditions)
+    sql = f"""
+        SELECT
+            altitude_difference - ((altitude_difference % ? + ?) % ?) AS band,
+            COUNT(*) AS matches,
+            SUM(home_goals > away_goals) AS home_wins,
+            SUM(home_goals = away_goals) AS draws,
+            SUM(home_goals < away_goals) AS away_wins,
+            ROUND(AVG(home_goals > away_goals), 3) AS home_win_rate
+        FROM analysis {where}
+        GROUP BY band
+        ORDER BY band
+    """
+    return conn.execute(sql, [band, band, band, *params]).fetchall()
+
+
+def print_rows(rows: list[sqlite3.Row]):
+    if not rows:
+        return
+    writer = csv.writer(sys.stdout)
+    writer.writerow(rows[0].keys())
+    writer.writerows(tuple(row) for row in rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Loads analysis CSVs into the SQLite warehouse and queries it."
+    )
+    parser.add_argument("--db", default=WAREHOUSE_PATH)
+    parser.add_argument(
+        "--load",
+        nargs="+",
+        metavar="CSV",
+        help="Analysis CSVs to load first; the tournament is the file name prefix.",
+    )
+    parser.add_argument("--tournament")
+    parser.add_argument("--team", help="Matches of this (canonical) team.")
+    parser.add_argument("--years", nargs=2, type=int, metavar=("FIRST", "LAST"))
+    parser.add_argument(
+        "--min-difference", type=int, help="Minimum altitude difference."
+    )
+    parser.add_argument(
+        "--max-difference", type=int, help="Maximum altitude difference."
+    )
+    parser.add_argument(
+        "--bands",
+        type=int,
+        metavar="METERS",
+        help="Print home/draw/away results per altitude-difference band instead.",
+    )
+    parser.add_argument(
+        "--max-away-altitude",
+        type=int,
+        help="With --bands: only visitors from at most this altitude.",
+    )
+    parser.add_argument("--limit", type=int)
+    args = parser.parse_args()
+
+    for csv_path in args.load or []:
+        tournament = os.path.basename(csv_path).split("_")[0]
+        try:
+            loaded = write_warehouse(csv_rows(csv_path), tournament, args.db)
+        except FileNotFoundError:
+            print(f"[Error] CSV not found: {csv_path}", file=sys.stderr)
+            sys.exit(1)
+        if not loaded:
+            sys.exit(1)
+        print(f"Loaded {csv_path} as '{tournament}' into {args.db}.", file=sys.stderr)
+
+    if not os.path.exists(args.db):
+        print(f"[Error] Warehouse not found: {args.db}", file=sys.stderr)
+        sys.exit(1)
+    filters = {
+        "tournament": args.tournament,
+        "team": args.team,
+        "years": tuple(args.years) if args.years else None,
+        "altitude_difference": (
+            (args.min_difference, args.max_difference)
+            if args.min_difference is not None or args.max_difference is not None
+            else None
+        ),
+    }
+    conn = connect(args.db)
+    start = time.perf_counter()
+    if args.bands:
+        rows = results_by_altitude_band(
+            conn, args.bands, args.max_away_altitude, **filters
+        )
+    else:
+        rows = find_matches(conn, limit=args.limit, **filters)
+    elapsed = time.perf_counter() - start
+    print_rows(rows)
+    print(f"\n{len(rows)} rows in {elapsed * 1000:.2f} ms.", file=sys.stderr)